@@ -0,0 +1,101 @@
+"""
+Сравнение прежней (b, a + filtfilt по каждому каналу) и текущей
+(кэшированные SOS + sosfiltfilt по двумерному массиву) реализаций фильтрации.
+
+Пример запуска:
+    python -m benchmarks.filters_benchmark --sizes 10000 100000 1000000 --repeat 5
+"""
+import argparse
+import timeit
+
+import numpy as np
+from scipy.signal import butter, cheby1, filtfilt, iirnotch
+
+from benchmarks.synthetic import synthetic_signals
+from services.dsp.filters import (
+    CHEBYSHEV_PARAMS,
+    DEFAULT_FS,
+    HIGHPASS_CUTOFF,
+    NOTCH_FREQUENCY,
+    FilterConfig,
+    apply_filters,
+    design_filter,
+)
+
+
+# Конфигурации фильтров для сравнения
+CONFIGS = {
+    "ФНЧ 0.5 Гц": FilterConfig(lowpass=0.5),
+    "Чебышев 0.4 Гц + ФВЧ": FilterConfig(chebyshev_params=CHEBYSHEV_PARAMS[0], highpass=True),
+    "ФНЧ 50 Гц + ФВЧ + режекторный": FilterConfig(lowpass=50, highpass=True, notch=True),
+}
+
+
+def legacy_apply_filters(rr_times, amplitudes, config: FilterConfig, fs=DEFAULT_FS):
+    """Прежняя реализация: расчет фильтров при каждом вызове и filtfilt в форме (b, a)."""
+    nyquist = 0.5 * fs
+    channels = [np.asarray(rr_times, dtype=np.float64), np.asarray(amplitudes, dtype=np.float64)]
+
+    coefficients = []
+    if config.lowpass is not None:
+        coefficients.append(butter(1, config.lowpass / nyquist, btype='low'))
+    elif config.chebyshev_params is not None:
+        params = config.chebyshev_params
+        coefficients.append(cheby1(params["order"], params["ripple"], params["cutoff"] / nyquist, btype='low'))
+    if config.highpass:
+        coefficients.append(butter(4, HIGHPASS_CUTOFF / nyquist, btype='high'))
+    if config.notch:
+        coefficients.append(iirnotch(NOTCH_FREQUENCY / nyquist, 30))
+
+    for b, a in coefficients:
+        channels = [filtfilt(b, a, channel) for channel in channels]
+    return channels[0], channels[1]
+
+
+def best_time(func, repeat):
+    """Минимальное время выполнения из repeat запусков, с."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(sizes, repeat):
+    results = []
+    for size in sizes:
+        rr_times, amplitudes = synthetic_signals(size)
+        for name, config in CONFIGS.items():
+            design_filter.cache_clear()
+            apply_filters(rr_times, amplitudes, config)  # Прогрев кэша фильтров
+
+            legacy = best_time(lambda: legacy_apply_filters(rr_times, amplitudes, config), repeat)
+            current = best_time(lambda: apply_filters(rr_times, amplitudes, config), repeat)
+
+            legacy_rr, legacy_amp = legacy_apply_filters(rr_times, amplitudes, config)
+            current_rr, current_amp = apply_filters(rr_times, amplitudes, config)
+            difference = max(np.max(np.abs(legacy_rr - current_rr)), np.max(np.abs(legacy_amp - current_amp)))
+
+            results.append({
+                "size": size,
+                "config": name,
+                "legacy": legacy,
+                "current": current,
+                "speedup": legacy / current if current > 0 else float("inf"),
+                "max_difference": float(difference),
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сравнение реализаций фильтрации сигналов")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'Отсчетов':>10}  {'Фильтры':<32} {'(b, a), с':>10} {'SOS, с':>10} {'Ускорение':>10} {'Макс. разница':>14}")
+    for row in run(args.sizes, args.repeat):
+        print(
+            f"{row['size']:>10}  {row['config']:<32} {row['legacy']:>10.4f} {row['current']:>10.4f} "
+            f"{row['speedup']:>10.2f} {row['max_difference']:>14.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
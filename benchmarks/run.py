@@ -0,0 +1,215 @@
+"""
+Запуск набора замеров (benchmarks/suite.py) и сравнение с базовыми результатами.
+Базовые результаты зависят от машины, поэтому хранятся в отдельном файле
+для каждой машины (по умолчанию benchmarks/baseline.json).
+
+Примеры запуска:
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000 10000000 --bench "dsp\\."
+
+Код возврата 1 означает, что хотя бы один замер медленнее базового более чем в threshold раз.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import timeit
+from datetime import datetime
+
+import numpy as np
+import scipy
+
+from benchmarks.suite import BENCHMARKS, release_databases
+
+
+# Размеры данных по умолчанию (отсчетов); 1e7 задается явно через --sizes
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Допустимое замедление относительно базового результата
+DEFAULT_THRESHOLD = 1.5
+
+# Минимальная длительность одной серии вызовов, с (короткие замеры повторяются в серии)
+MIN_SAMPLE_TIME = 0.05
+
+
+def calibrate(timer, min_time=MIN_SAMPLE_TIME):
+    """
+    Количество вызовов в серии, при котором серия длится не меньше min_time
+    (первые серии одновременно служат прогревом).
+    """
+    number = 1
+    while timer.timeit(number) < min_time and number < 10 ** 7:
+        number *= 10
+    return number
+
+
+def time_benchmark(bench, size, repeat=5, min_time=MIN_SAMPLE_TIME):
+    """Время одного вызова замера для данных размера size: минимум и медиана по repeat сериям, с."""
+    state = bench.setup(size)
+    try:
+        timer = timeit.Timer(lambda: bench.func(state))
+        number = calibrate(timer, min_time)
+        times = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    finally:
+        if bench.teardown is not None:
+            bench.teardown(state)
+    return {"min": min(times), "median": statistics.median(times), "number": number, "repeat": repeat}
+
+
+def run_suite(sizes=DEFAULT_SIZES, pattern=None, repeat=5, min_time=MIN_SAMPLE_TIME, progress=None):
+    """
+    Выполнение замеров, имена которых содержат совпадение с регулярным выражением pattern.
+    Возвращает {имя замера: {размер (строкой): результат}}.
+    progress(имя, размер, результат или None) вызывается после каждого замера.
+    """
+    results = {}
+    try:
+        for size in sorted(sizes):
+            for name, bench in BENCHMARKS.items():
+                if pattern is not None and not re.search(pattern, name):
+                    continue
+                if bench.max_size is not None and size > bench.max_size:
+                    if progress is not None:
+                        progress(name, size, None)
+                    continue
+
+                result = time_benchmark(bench, size, repeat, min_time)
+                results.setdefault(name, {})[str(size)] = result
+                if progress is not None:
+                    progress(name, size, result)
+    finally:
+        release_databases()
+    return results
+
+
+def machine_info():
+    """Описание машины и версий библиотек (сохраняется вместе с базовыми результатами)."""
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+    }
+
+
+def load_baseline(path):
+    """Базовые результаты из файла или None, если файла нет."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(path, results):
+    """
+    Сохранение результатов как базовых. Результаты замеров, не выполнявшихся
+    в этом запуске, сохраняются из прежнего файла.
+    """
+    baseline = load_baseline(path) or {"results": {}}
+    for name, by_size in results.items():
+        baseline["results"].setdefault(name, {}).update(by_size)
+    baseline["machine"] = machine_info()
+    baseline["saved"] = datetime.now().isoformat(timespec="seconds")
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def compare(results, baseline_results, threshold=DEFAULT_THRESHOLD):
+    """
+    Сравнение с базовыми результатами по минимальному времени.
+    Возвращает строки (имя, размер, базовое время, текущее время, отношение, статус),
+    статус: "regression", "faster", "ok" или "new" (нет базового результата).
+    """
+    rows = []
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            base = baseline_results.get(name, {}).get(size)
+            if base is None:
+                rows.append((name, int(size), None, result["min"], None, "new"))
+                continue
+
+            ratio = result["min"] / base["min"] if base["min"] > 0 else float("inf")
+            if ratio > threshold:
+                status = "regression"
+            elif ratio < 1 / threshold:
+                status = "faster"
+            else:
+                status = "ok"
+            rows.append((name, int(size), base["min"], result["min"], ratio, status))
+    return rows
+
+
+def format_seconds(value):
+    if value is None:
+        return "-"
+    for unit, scale in (("с", 1), ("мс", 1e-3), ("мкс", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.3f} {unit}"
+    return f"{value / 1e-9:.1f} нс"
+
+
+STATUS_LABELS = {"regression": "ЗАМЕДЛЕНИЕ", "faster": "ускорение", "ok": "", "new": "новый"}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности обработки сигналов и сервисов")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Размеры данных, отсчетов")
+    parser.add_argument("--bench", help="Регулярное выражение для имен замеров (например, 'dsp\\.')")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество серий вызовов")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Файл базовых результатов")
+    parser.add_argument("--save-baseline", action="store_true", help="Сохранить результаты как базовые")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Допустимое замедление относительно базового результата, раз",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    def report(name, size, result):
+        timing = "пропущен (размер больше допустимого)" if result is None else format_seconds(result["min"])
+        print(f"{name:<24} {size:>10}  {timing}")
+
+    results = run_suite(args.sizes, args.bench, args.repeat, progress=report)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Базовые результаты сохранены в {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"Файл базовых результатов {args.baseline} не найден; сохраните его с --save-baseline")
+        return 0
+
+    rows = compare(results, baseline["results"], args.threshold)
+    print()
+    print(f"{'Замер':<24} {'Отсчетов':>10} {'Базовое':>12} {'Текущее':>12} {'Отношение':>10}  Статус")
+    for name, size, base, current, ratio, status in rows:
+        ratio_text = "-" if ratio is None else f"{ratio:.2f}"
+        print(
+            f"{name:<24} {size:>10} {format_seconds(base):>12} {format_seconds(current):>12} "
+            f"{ratio_text:>10}  {STATUS_LABELS[status]}"
+        )
+
+    regressions = [row for row in rows if row[5] == "regression"]
+    if regressions:
+        print(f"\nЗамедлений больше чем в {args.threshold} раз: {len(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
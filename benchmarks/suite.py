@@ -0,0 +1,192 @@
+"""
+Набор замеров производительности (в духе asv): этапы обработки сигналов
+и сервисный слой поверх базы SQLite, заменяющей PostgreSQL.
+Каждый замер параметризован размером данных (количеством отсчетов);
+состояние готовится в setup и в измеряемое время не входит.
+"""
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from benchmarks.synthetic import create_database, synthetic_signals, write_signal_file
+from services.analysis_service import save_analysis_series
+from services.dsp import (
+    DEFAULT_FS,
+    MIN_EPOCH_CYCLES,
+    FilterConfig,
+    MinMaxPyramid,
+    apply_filters,
+    compute_spectrum,
+    interpolate_series,
+    multitaper_psd,
+    rank_epochs,
+    welch_psd,
+)
+from services.dsp.statistics import calculate_correlation_ratio
+from services.ecs_service import get_ecs_data_page
+from services.import_service import import_signal_file
+from services.signal_service import load_session_signals
+
+
+# Ограничение размера для замеров, которым на 1e7 отсчетов не хватает памяти или времени
+LARGE_SIZE_LIMIT = 1_000_000
+
+# Конфигурация фильтров для замера (самая дорогая из доступных в интерфейсе)
+FILTER_CONFIG = FilterConfig(lowpass=50, highpass=True, notch=True)
+
+
+@dataclass
+class Benchmark:
+    """Замер: setup(size) готовит состояние, func(state) измеряется, teardown(state) освобождает ресурсы."""
+    name: str
+    func: Callable
+    setup: Callable
+    teardown: Optional[Callable] = None
+    max_size: Optional[int] = None  # Наибольший размер данных, для которого выполняется замер
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name, setup, teardown=None, max_size=None):
+    """Регистрация функции как замера с именем name."""
+    def decorator(func):
+        BENCHMARKS[name] = Benchmark(name, func, setup, teardown, max_size)
+        return func
+    return decorator
+
+
+@dataclass
+class DatabaseState:
+    """Состояние замеров сервисного слоя."""
+    engine: object
+    db: Session
+    size: int
+    rr_times: object = None
+    amplitudes: object = None
+    directory: Optional[str] = None  # Временный каталог с файлом сигналов
+
+
+_read_database = {}  # Размер → движок базы для замеров чтения (одна база на размер)
+
+
+def read_database(size):
+    """
+    База для замеров чтения: два сеанса по size отсчетов.
+    Заполнение занимает больше времени, чем сами замеры, поэтому база
+    одного размера используется всеми замерами чтения; прежняя освобождается.
+    """
+    if size not in _read_database:
+        release_databases()
+        _read_database[size] = create_database(size)
+    engine = _read_database[size]
+    return DatabaseState(engine=engine, db=Session(bind=engine), size=size)
+
+
+def release_databases():
+    """Освобождение баз замеров чтения (после выполнения набора)."""
+    for engine in _read_database.values():
+        engine.dispose()
+    _read_database.clear()
+
+
+def write_database(size):
+    """Пустая база (сеансы без сигналов) и обработанные сигналы для записи."""
+    engine = create_database(0)
+    rr_times, amplitudes = synthetic_signals(size)
+    return DatabaseState(engine=engine, db=Session(bind=engine), size=size, rr_times=rr_times, amplitudes=amplitudes)
+
+
+def import_database(size):
+    """Пустая база и файл сигналов из size отсчетов во временном каталоге."""
+    state = write_database(0)
+    state.size = size
+    state.directory = tempfile.mkdtemp(prefix="biosignals-bench-")
+    write_signal_file(f"{state.directory}/signals.txt", size)
+    return state
+
+
+def close_database(state):
+    state.db.close()
+    if state.engine not in _read_database.values():
+        state.engine.dispose()
+    if state.directory is not None:
+        shutil.rmtree(state.directory, ignore_errors=True)
+
+
+def warm_spectrum_cache(size):
+    signals = synthetic_signals(size)
+    compute_spectrum(signals[1], fs=DEFAULT_FS)
+    return signals
+
+
+# Этапы обработки сигналов
+
+@benchmark("dsp.filters", setup=synthetic_signals)
+def time_filters(signals):
+    apply_filters(*signals, FILTER_CONFIG)
+
+
+@benchmark("dsp.spectrum", setup=synthetic_signals)
+def time_spectrum(signals):
+    compute_spectrum.__wrapped__(signals[1], fs=DEFAULT_FS)  # Без кэша
+
+
+@benchmark("dsp.spectrum_cached", setup=warm_spectrum_cache)
+def time_spectrum_cached(signals):
+    compute_spectrum(signals[1], fs=DEFAULT_FS)  # Хэширование данных и поиск в кэше
+
+
+@benchmark("dsp.welch", setup=synthetic_signals)
+def time_welch(signals):
+    welch_psd.__wrapped__(signals[1], fs=DEFAULT_FS)
+
+
+@benchmark("dsp.multitaper", setup=synthetic_signals, max_size=LARGE_SIZE_LIMIT)
+def time_multitaper(signals):
+    multitaper_psd.__wrapped__(signals[1], fs=DEFAULT_FS)
+
+
+@benchmark("dsp.correlation_ratio", setup=synthetic_signals)
+def time_correlation_ratio(signals):
+    calculate_correlation_ratio(*signals)
+
+
+@benchmark("dsp.epoch_search", setup=synthetic_signals)
+def time_epoch_search(signals):
+    rank_epochs(signals[0], MIN_EPOCH_CYCLES, top_k=3)
+
+
+@benchmark("dsp.interpolation", setup=synthetic_signals, max_size=LARGE_SIZE_LIMIT)
+def time_interpolation(signals):
+    interpolate_series(*signals)
+
+
+@benchmark("dsp.decimation", setup=synthetic_signals)
+def time_decimation(signals):
+    MinMaxPyramid(signals[1])
+
+
+# Сервисный слой
+
+@benchmark("db.load_signals", setup=read_database, teardown=close_database, max_size=LARGE_SIZE_LIMIT)
+def time_load_signals(state):
+    load_session_signals(state.db, 1)
+
+
+@benchmark("db.paged_fetch", setup=read_database, teardown=close_database, max_size=LARGE_SIZE_LIMIT)
+def time_paged_fetch(state):
+    get_ecs_data_page(state.db, after_id=state.size // 2, limit=500)
+
+
+@benchmark("db.save_series", setup=write_database, teardown=close_database, max_size=LARGE_SIZE_LIMIT)
+def time_save_series(state):
+    save_analysis_series(state.db, 1, state.rr_times, state.amplitudes)
+
+
+@benchmark("db.import_file", setup=import_database, teardown=close_database, max_size=LARGE_SIZE_LIMIT)
+def time_import_file(state):
+    import_signal_file(state.db, 1, f"{state.directory}/signals.txt", replace=True)
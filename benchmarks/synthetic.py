@@ -0,0 +1,85 @@
+"""
+Детерминированные синтетические данные для замеров: сигналы ЭКС и дыхания,
+файлы сигналов в формате импорта и база SQLite вместо PostgreSQL.
+Одинаковые size и seed всегда дают одинаковые данные.
+"""
+from datetime import date, time
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.models import Base, Doctor, ECS_data, Laboratory, Patient, PG_data, Polyclinic, Sessions
+from services.dsp.filters import DEFAULT_FS, NOTCH_FREQUENCY
+from services.import_service import compute_amplitude, compute_rr_time
+
+
+def synthetic_signals(size, seed=0):
+    """RR-интервалы около 0.8 с и дыхательная кривая с шумом и сетевой наводкой."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(size) / DEFAULT_FS
+    rr_times = 0.8 + 0.05 * np.sin(2 * np.pi * 0.1 * t) + 0.01 * rng.standard_normal(size)
+    amplitudes = (
+        np.sin(2 * np.pi * 0.25 * t)
+        + 0.05 * np.sin(2 * np.pi * NOTCH_FREQUENCY * t)
+        + 0.1 * rng.standard_normal(size)
+    )
+    return rr_times, amplitudes
+
+
+def synthetic_samples(size, seed=0):
+    """Исходные отсчеты (d1, d2, rr_length), как в файлах сигналов."""
+    rng = np.random.default_rng(seed)
+    d1 = rng.integers(0, 4, size)
+    d2 = rng.integers(0, 256, size)
+    rr_length = 160 + rng.integers(-10, 11, size)
+    return d1, d2, rr_length
+
+
+def write_signal_file(path, size, seed=0):
+    """Файл сигналов из size троек строк D1, D2, RR_Length."""
+    triples = np.column_stack(synthetic_samples(size, seed))
+    np.savetxt(path, triples.ravel(), fmt="%d")
+
+
+def create_database(samples, sessions=2, seed=0):
+    """
+    База SQLite в памяти со справочниками и sessions сеансами по samples отсчетов
+    ЭКС и ПГ в каждом. Возвращает движок; сеансы имеют ID 1..sessions.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(bind=engine) as db:
+        db.add(Polyclinic(polyclinicid=1, polyclinic_name="Поликлиника №1", polyclinic_address="ул. Ленина, 1"))
+        db.add(Laboratory(labid=1, lab_name="Лаборатория №1", lab_address="ул. Ленина, 1", polyclinicid=1))
+        for i in range(1, sessions + 1):
+            db.add(Patient(
+                patientid=i, patient_fio=f"Пациент {i}", patient_birthdate=date(1990, 1, 1), polyclinicid=1
+            ))
+            db.add(Doctor(
+                doctorid=i, doctor_fio=f"Врач {i}", doctor_birthdate=date(1980, 1, 1),
+                doctor_specialization="Кардиолог", polyclinicid=1,
+            ))
+            db.add(Sessions(
+                sessionid=i, session_date=date(2025, 5, 5), session_starttime=time(9, 0),
+                session_endtime=time(10, 0), patientid=i, doctorid=i, labid=1,
+            ))
+        db.flush()
+
+        # Сигналы вставляются напрямую через DBAPI: построчные вставки ORM для миллионов строк слишком медленны
+        cursor = db.connection().connection.cursor()
+        for i in range(1, sessions + 1):
+            d1, d2, rr_length = synthetic_samples(samples, seed + i)
+            rr_time, amplitude = compute_rr_time(rr_length), compute_amplitude(d1, d2)
+            session_ids = [i] * samples
+            cursor.executemany(
+                f"INSERT INTO {ECS_data.__tablename__} (sessionid, rr_length, rr_time) VALUES (?, ?, ?)",
+                zip(session_ids, rr_length.tolist(), rr_time.tolist()),
+            )
+            cursor.executemany(
+                f"INSERT INTO {PG_data.__tablename__} (sessionid, d1, d2, amplitude) VALUES (?, ?, ?, ?)",
+                zip(session_ids, d1.tolist(), d2.tolist(), amplitude.tolist()),
+            )
+        db.commit()
+    return engine
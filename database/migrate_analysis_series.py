@@ -0,0 +1,45 @@
+"""
+Перенос результатов анализа в компактный формат analysis_series.
+
+Переносит строки analysis_result (по одной строке на отсчет) в записи
+analysis_series с двоичными массивами — по одной записи на сеанс.
+Таблица analysis_series создается миграцией (alembic upgrade head).
+
+Пример запуска:
+    python -m database.migrate_analysis_series --user postgres --dtype float64
+"""
+import argparse
+
+from database.session import add_credentials_arguments, authenticate_user, dispose_all_engines, get_cli_password
+from services.analysis_service import SERIES_DTYPES, migrate_legacy_analysis_results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Перенос результатов анализа в формат analysis_series")
+    add_credentials_arguments(parser)
+    parser.add_argument("--dtype", choices=SERIES_DTYPES, default="float64", help="Тип элементов рядов")
+    parser.add_argument("--session", type=int, action="append", help="ID сеанса (можно указать несколько раз)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    password = get_cli_password(args)
+
+    db = authenticate_user(args.user, password)
+    if db is None:
+        raise SystemExit("Не удалось подключиться к базе данных")
+    try:
+        summary = migrate_legacy_analysis_results(db, session_ids=args.session, dtype=args.dtype)
+    finally:
+        db.close()
+        dispose_all_engines()
+
+    print(
+        f"Перенесено сеансов: {summary['migrated']}, пропущено: {summary['skipped']}, "
+        f"удалено строк analysis_result: {summary['rows']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
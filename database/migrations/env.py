@@ -0,0 +1,65 @@
+"""
+Окружение Alembic: метаданные моделей database/models.py и URL базы данных.
+URL берется из BIOSIGNALS_DATABASE_URL или из alembic.ini, пароль —
+из BIOSIGNALS_DB_PASSWORD (если не указан в URL).
+"""
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import make_url
+
+from database.models import Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url():
+    """URL базы данных с паролем из переменной окружения."""
+    url = make_url(os.environ.get("BIOSIGNALS_DATABASE_URL") or config.get_main_option("sqlalchemy.url"))
+    password = os.environ.get("BIOSIGNALS_DB_PASSWORD")
+    if url.password is None and password:
+        url = url.set(password=password)
+    return url
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Объекты, созданные только для одной СУБД (info["dialect"]), не сравниваются в других."""
+    dialect = obj.info.get("dialect") if hasattr(obj, "info") else None
+    return dialect is None or dialect == context.get_context().dialect.name
+
+
+def run_migrations_offline():
+    """Вывод SQL миграций без подключения к базе (alembic upgrade --sql)."""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_engine(database_url(), poolclass=pool.NullPool)
+    try:
+        with engine.connect() as connection:
+            context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,22 @@
+"""Исходная схема базы данных
+
+Таблицы созданы до перехода на Alembic, поэтому миграция пустая:
+существующая база отмечается командой alembic stamp 0001_baseline.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+"""
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass
+
+
+def downgrade():
+    pass
@@ -0,0 +1,66 @@
+"""Индексы внешних ключей сеансов и сигналов, триграммные индексы ФИО
+
+Отсчеты ЭКС, ПГ и результаты анализа читаются по сеансу в порядке ID,
+поэтому индексы составные: (sessionid, ID записи). В PostgreSQL индексы
+строятся с CONCURRENTLY, чтобы не блокировать запись в большие таблицы;
+триграммные индексы (pg_trgm) ускоряют поиск ilike('%фио%').
+
+Revision ID: 0002_signal_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002_signal_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+# (имя индекса, таблица, столбцы)
+INDEXES = [
+    ("ix_ecs_data_sessionid_ecsdataid", "ecs_data", ["sessionid", "ecsdataid"]),
+    ("ix_pg_data_sessionid_pgdataid", "pg_data", ["sessionid", "pgdataid"]),
+    ("ix_analysis_result_sessionid_analysisresultid", "analysis_result", ["sessionid", "analysisresultid"]),
+    ("ix_session_patientid", "session", ["patientid"]),
+    ("ix_session_doctorid", "session", ["doctorid"]),
+    ("ix_session_labid", "session", ["labid"]),
+    ("ix_doctor_schedule_doctorid_workdate", "doctor_schedule", ["doctorid", "workdate"]),
+]
+
+# (имя индекса, таблица, столбец) — только PostgreSQL
+TRIGRAM_INDEXES = [
+    ("ix_patient_patient_fio_trgm", "patient", "patient_fio"),
+    ("ix_doctor_doctor_fio_trgm", "doctor", "doctor_fio"),
+]
+
+
+def upgrade():
+    postgresql = op.get_bind().dialect.name == "postgresql"
+    if postgresql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+        if postgresql:
+            for name, table, column in TRIGRAM_INDEXES:
+                op.create_index(
+                    name, table, [column], if_not_exists=True, postgresql_concurrently=True,
+                    postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+                )
+
+    if postgresql:
+        for _, table, _ in INDEXES:
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade():
+    postgresql = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        if postgresql:
+            for name, table, _ in TRIGRAM_INDEXES:
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,81 @@
+"""Таблица analysis_series
+
+Обработанные ряды сеанса хранятся одной записью с двоичными массивами
+(по одной записи на сеанс). В базах, где таблица уже создана прежней
+версией database/migrate_analysis_series.py, создание пропускается.
+Перенос строк analysis_result выполняется отдельно:
+python -m database.migrate_analysis_series.
+
+DDL на сервере разрешен только пользователю postgres, а роли получают
+доступ к таблицам явными GRANT. Поэтому в PostgreSQL новой таблице
+выдаются те же права, что и у analysis_result, а ролям с правом INSERT —
+USAGE на последовательность ее ключа.
+
+Revision ID: 0003_analysis_series
+Revises: 0002_signal_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_analysis_series"
+down_revision = "0002_signal_indexes"
+branch_labels = None
+depends_on = None
+
+# Права ролей на analysis_result (кроме владельца) по ACL таблицы выдаются и на analysis_series.
+# Блок DO выполняется на сервере, поэтому работает и при выводе SQL (alembic upgrade --sql).
+COPY_GRANTS = """
+DO $$
+DECLARE
+    acl record;
+BEGIN
+    FOR acl IN
+        SELECT CASE WHEN item.grantee = 0 THEN 'PUBLIC' ELSE quote_ident(role.rolname) END AS grantee,
+               item.privilege_type
+        FROM pg_class AS relation
+        CROSS JOIN LATERAL aclexplode(relation.relacl) AS item
+        LEFT JOIN pg_roles AS role ON role.oid = item.grantee
+        WHERE relation.oid = 'public.analysis_result'::regclass
+          AND item.grantee <> relation.relowner
+    LOOP
+        EXECUTE format('GRANT %s ON TABLE analysis_series TO %s', acl.privilege_type, acl.grantee);
+        IF acl.privilege_type = 'INSERT' THEN
+            EXECUTE format('GRANT USAGE ON SEQUENCE analysis_series_analysisseriesid_seq TO %s', acl.grantee);
+        END IF;
+    END LOOP;
+END
+$$
+"""
+
+
+def upgrade():
+    op.create_table(
+        "analysis_series",
+        sa.Column("analysisseriesid", sa.Integer(), primary_key=True),
+        sa.Column(
+            "sessionid",
+            sa.Integer(),
+            sa.ForeignKey("session.sessionid", ondelete="CASCADE", onupdate="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("dtype", sa.String(16), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("sample_rate", sa.Float()),
+        sa.Column("processing_params", sa.Text()),
+        sa.Column("processed_ecs_data", sa.LargeBinary(), nullable=False),
+        sa.Column("processed_pg_data", sa.LargeBinary(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_analysis_series_analysisseriesid", "analysis_series", ["analysisseriesid"], if_not_exists=True
+    )
+
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(COPY_GRANTS)
+
+
+def downgrade():
+    op.drop_index("ix_analysis_series_analysisseriesid", table_name="analysis_series", if_exists=True)
+    op.drop_table("analysis_series")
@@ -0,0 +1,96 @@
+"""Расчет rr_time и amplitude построчными триггерами BEFORE
+
+Прежние триггеры trg_calculate_* после каждой вставленной строки вызывали
+calculate_rr_duration_for_session / calculate_amplitude_for_session, которые
+пересчитывают весь сеанс, поэтому загрузка файла занимала время O(n²).
+Новые триггеры вычисляют значения только для изменяемой строки и не
+трогают уже заполненные столбцы: import_signal_file передает rr_time и
+amplitude, рассчитанные на клиенте по тем же формулам.
+
+Прежние триггеры отключаются, а не удаляются; downgrade включает их обратно.
+
+Revision ID: 0004_signal_triggers
+Revises: 0003_analysis_series
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0004_signal_triggers"
+down_revision = "0003_analysis_series"
+branch_labels = None
+depends_on = None
+
+# RR_Time = RR_Length * 5 / 1000 с; при изменении rr_length пересчитывается, если rr_time не задан явно
+FILL_RR_TIME = """
+CREATE OR REPLACE FUNCTION fill_rr_time() RETURNS trigger AS $$
+BEGIN
+    IF NEW.rr_time IS NULL
+       OR (TG_OP = 'UPDATE' AND NEW.rr_length IS DISTINCT FROM OLD.rr_length
+           AND NEW.rr_time IS NOT DISTINCT FROM OLD.rr_time) THEN
+        NEW.rr_time := NEW.rr_length * 5.0 / 1000;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Amplitude = ROUND((D1 * 256 + D2) * 2.45 / 2^10, 3), как в calculate_amplitude_for_session
+FILL_AMPLITUDE = """
+CREATE OR REPLACE FUNCTION fill_amplitude() RETURNS trigger AS $$
+BEGIN
+    IF NEW.amplitude IS NULL
+       OR (TG_OP = 'UPDATE' AND (NEW.d1, NEW.d2) IS DISTINCT FROM (OLD.d1, OLD.d2)
+           AND NEW.amplitude IS NOT DISTINCT FROM OLD.amplitude) THEN
+        NEW.amplitude := ROUND((NEW.d1 * 256 + NEW.d2) * 2.45 / 1024, 3);
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Включение или отключение прежних триггеров trg_calculate_* (имена берутся из каталога)
+SET_LEGACY_TRIGGERS = """
+DO $$
+DECLARE
+    item record;
+BEGIN
+    FOR item IN
+        SELECT legacy.tgrelid::regclass AS relation, quote_ident(legacy.tgname) AS name
+        FROM pg_trigger AS legacy
+        WHERE NOT legacy.tgisinternal
+          AND legacy.tgname LIKE 'trg\\_calculate\\_%'
+          AND legacy.tgrelid IN ('public.ecs_data'::regclass, 'public.pg_data'::regclass)
+    LOOP
+        EXECUTE format('ALTER TABLE %s {action} TRIGGER %s', item.relation, item.name);
+    END LOOP;
+END
+$$
+"""
+
+
+def upgrade():
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.execute(SET_LEGACY_TRIGGERS.format(action="DISABLE"))
+    op.execute(FILL_RR_TIME)
+    op.execute(FILL_AMPLITUDE)
+    op.execute(
+        "CREATE TRIGGER trg_fill_rr_time BEFORE INSERT OR UPDATE OF rr_length, rr_time ON ecs_data "
+        "FOR EACH ROW EXECUTE FUNCTION fill_rr_time()"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_fill_amplitude BEFORE INSERT OR UPDATE OF d1, d2, amplitude ON pg_data "
+        "FOR EACH ROW EXECUTE FUNCTION fill_amplitude()"
+    )
+
+
+def downgrade():
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS trg_fill_amplitude ON pg_data")
+    op.execute("DROP TRIGGER IF EXISTS trg_fill_rr_time ON ecs_data")
+    op.execute("DROP FUNCTION IF EXISTS fill_amplitude()")
+    op.execute("DROP FUNCTION IF EXISTS fill_rr_time()")
+    op.execute(SET_LEGACY_TRIGGERS.format(action="ENABLE"))
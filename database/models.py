@@ -1,10 +1,28 @@
-from sqlalchemy import Column, Integer, String, Date, Float, Time, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Float, Time, Text, ForeignKey, LargeBinary, Index, DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
 Base = declarative_base()
 
 
+def trigram_index(name, column):
+    """
+    Триграммный GIN-индекс (pg_trgm) для поиска по подстроке: ilike('%...%').
+    Создается только в PostgreSQL; в других СУБД индекс пропускается.
+    """
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+        info={"dialect": "postgresql"},  # Учитывается и автогенерацией миграций (database/migrations/env.py)
+    ).ddl_if(dialect="postgresql")
+
+
+# Расширение pg_trgm нужно триграммным индексам, поэтому создается до таблиц
+event.listen(
+    Base.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class Patient(Base):
     __tablename__ = "patient"
     patientid = Column(Integer, primary_key=True, index=True)
@@ -22,6 +40,8 @@ class Patient(Base):
     activities = relationship("Patient_activity", back_populates="patient")
     polyclinic = relationship("Polyclinic", back_populates="patients")
 
+    __table_args__ = (trigram_index("ix_patient_patient_fio_trgm", "patient_fio"),)
+
 
 class Doctor(Base):
     __tablename__ = "doctor"
@@ -38,6 +58,8 @@ class Doctor(Base):
     diagnosis = relationship("Diagnosis", back_populates="doctor")
     polyclinic = relationship("Polyclinic", back_populates="doctors")
 
+    __table_args__ = (trigram_index("ix_doctor_doctor_fio_trgm", "doctor_fio"),)
+
 
 class Sessions(Base):
     __tablename__ = "session"
@@ -45,9 +67,9 @@ class Sessions(Base):
     session_date = Column(Date, nullable=False)
     session_starttime = Column(Time, nullable=False)
     session_endtime = Column(Time, nullable=False)
-    patientid = Column(Integer, ForeignKey("patient.patientid"), nullable=False)
-    doctorid = Column(Integer, ForeignKey("doctor.doctorid"), nullable=False)
-    labid = Column(Integer, ForeignKey("laboratory.labid"), nullable=False)
+    patientid = Column(Integer, ForeignKey("patient.patientid"), nullable=False, index=True)
+    doctorid = Column(Integer, ForeignKey("doctor.doctorid"), nullable=False, index=True)
+    labid = Column(Integer, ForeignKey("laboratory.labid"), nullable=False, index=True)
 
     # Связи
     patient = relationship("Patient", back_populates="sessions")
@@ -56,6 +78,7 @@ class Sessions(Base):
     ecs_data = relationship("ECS_data", back_populates="session")
     pg_data = relationship("PG_data", back_populates="session")
     analysis_results = relationship("Analysis_result", back_populates="session")
+    analysis_series = relationship("Analysis_series", back_populates="session", uselist=False)
 
 
 class ECS_data(Base):
@@ -68,6 +91,9 @@ class ECS_data(Base):
     # Связи
     session = relationship("Sessions", back_populates="ecs_data")
 
+    # Отсчеты сеанса читаются по порядку ID: составной индекс служит и для фильтра, и для сортировки
+    __table_args__ = (Index("ix_ecs_data_sessionid_ecsdataid", "sessionid", "ecsdataid"),)
+
 
 class PG_data(Base):
     __tablename__ = "pg_data"
@@ -80,6 +106,8 @@ class PG_data(Base):
     # Связи
     session = relationship("Sessions", back_populates="pg_data")
 
+    __table_args__ = (Index("ix_pg_data_sessionid_pgdataid", "sessionid", "pgdataid"),)
+
 
 class Polyclinic(Base):
     __tablename__ = "polyclinic"
@@ -142,6 +170,25 @@ class Analysis_result(Base):
     # Связи
     session = relationship("Sessions", back_populates="analysis_results")
 
+    __table_args__ = (Index("ix_analysis_result_sessionid_analysisresultid", "sessionid", "analysisresultid"),)
+
+
+class Analysis_series(Base):
+    __tablename__ = "analysis_series"
+    analysisseriesid = Column(Integer, primary_key=True, index=True)
+    sessionid = Column(
+        Integer, ForeignKey("session.sessionid", ondelete="CASCADE", onupdate="CASCADE"), nullable=False, unique=True
+    )
+    dtype = Column(String(16), nullable=False)  # Тип элементов массивов NumPy, например "float64"
+    sample_count = Column(Integer, nullable=False)
+    sample_rate = Column(Float)  # Частота дискретизации ряда, Гц (None для ряда без интерполяции)
+    processing_params = Column(Text)  # Параметры обработки в формате JSON
+    processed_ecs_data = Column(LargeBinary, nullable=False)
+    processed_pg_data = Column(LargeBinary, nullable=False)
+
+    # Связи
+    session = relationship("Sessions", back_populates="analysis_series")
+
 
 class Doctor_schedule(Base):
     __tablename__ = "doctor_schedule"
@@ -154,6 +201,8 @@ class Doctor_schedule(Base):
     # Связи
     doctor = relationship("Doctor", back_populates="schedules")
 
+    __table_args__ = (Index("ix_doctor_schedule_doctorid_workdate", "doctorid", "workdate"),)
+
 
 class Diagnosis(Base):
     __tablename__ = "diagnosis"
@@ -1,8 +1,19 @@
+import atexit
+import os
 import sys
 from PyQt6.QtWidgets import QApplication
+from database.session import SLOW_QUERY_MS, enable_sql_profiler
+from services import instrumentation
 from ui.login_window import LoginWindow
 
 if __name__ == "__main__":
+    # Замеры времени сервисных функций (отключаются BIOSIGNALS_INSTRUMENTATION=0)
+    instrumentation.install()
+
+    # Профилирование SQL-запросов (BIOSIGNALS_SQL_PROFILE=1), отчет выводится при завершении
+    if os.environ.get("BIOSIGNALS_SQL_PROFILE") == "1":
+        profiler = enable_sql_profiler(float(os.environ.get("BIOSIGNALS_SLOW_QUERY_MS", SLOW_QUERY_MS)))
+        atexit.register(lambda: print(profiler.report()))
     app = QApplication(sys.argv)
     login_window = LoginWindow()
     login_window.show()
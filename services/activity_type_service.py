@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
 from database.models import Activity_type
+from services.instrumentation import instrumented
 
 
 # Создание нового типа активности
+@instrumented()
 def create_activity_type(db: Session, activityname: str, description: str = None):
     """
     Создание нового типа активности.
@@ -24,6 +26,7 @@ def create_activity_type(db: Session, activityname: str, description: str = None
 
 
 # Получение всех типов активностей
+@instrumented()
 def get_activity_types(db: Session, skip: int = 0, limit: int = 100):
     """
     Получение всех типов активностей с поддержкой пагинации.
@@ -32,6 +35,7 @@ def get_activity_types(db: Session, skip: int = 0, limit: int = 100):
 
 
 # Поиск типов активностей по названию (частичное совпадение)
+@instrumented()
 def search_activity_types_by_name(db: Session, name: str):
     """
     Поиск типов активностей по частичному совпадению названия.
@@ -40,6 +44,7 @@ def search_activity_types_by_name(db: Session, name: str):
 
 
 # Обновление данных типа активности
+@instrumented()
 def update_activity_type(db: Session, activitytypeid: int, **kwargs):
     """
     Обновление данных типа активности.
@@ -68,6 +73,7 @@ def update_activity_type(db: Session, activitytypeid: int, **kwargs):
 
 
 # Удаление типа активности
+@instrumented()
 def delete_activity_type(db: Session, activitytypeid: int):
     """
     Удаление типа активности.
@@ -81,6 +87,7 @@ def delete_activity_type(db: Session, activitytypeid: int):
     return {"message": f"Тип активности с ID {activitytypeid} успешно удален"}
 
 # Получение активности по ID
+@instrumented()
 def get_activity_type_by_id(db: Session, activitytypeid: int):
     """
     Получение активности по её ID.
@@ -1,9 +1,14 @@
+import json
 from datetime import date, time
-from sqlalchemy.orm import Session, joinedload
-from database.models import Analysis_result, Sessions, Patient, Doctor
+import numpy as np
+from sqlalchemy import exists, func, insert, literal, null, select, union_all
+from sqlalchemy.orm import Session
+from database.models import Analysis_result, Analysis_series, Sessions, Patient, Doctor
+from services.instrumentation import instrumented
 
 
 # Создание нового результата анализа
+@instrumented()
 def create_analysis_result(
     db: Session,
     sessionid: int,
@@ -23,32 +28,312 @@ def create_analysis_result(
     return new_result
 
 
+# Допустимые типы элементов сохраняемых рядов
+SERIES_DTYPES = ("float32", "float64")
+
+
+# Кодирование ряда в двоичный вид
+def _encode_series(values: np.ndarray, dtype: str) -> bytes:
+    """
+    Преобразование ряда в байты с явным порядком байтов (little-endian).
+    """
+    return np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+
+
+# Декодирование ряда из двоичного вида
+def _decode_series(blob, dtype: str) -> np.ndarray:
+    """
+    Декодирование ряда без копирования данных (np.frombuffer).
+    Возвращаемый массив доступен только для чтения.
+    """
+    return np.frombuffer(blob, dtype=np.dtype(dtype).newbyteorder("<"))
+
+
+# Сохранение всего обработанного ряда одной транзакцией
+@instrumented()
+def save_analysis_series(
+    db: Session,
+    session_id: int,
+    ecs_array,
+    pg_array,
+    sample_rate: float = None,
+    params: dict = None,
+    dtype: str = "float64",
+):
+    """
+    Сохранение обработанных рядов ЭКС и ПГ для сеанса одной записью analysis_series.
+    Ряды хранятся как двоичные массивы вместе с типом элементов, частотой
+    дискретизации и параметрами обработки. Прежняя запись сеанса и строки
+    старого формата (analysis_result) удаляются в той же транзакции.
+    """
+    if dtype not in SERIES_DTYPES:
+        raise ValueError(f"Недопустимый тип данных ряда: {dtype}")
+
+    # Значения округляются до 4 знаков, как при построчном сохранении
+    ecs_values = np.round(np.asarray(ecs_array, dtype=np.float64).ravel(), 4)
+    pg_values = np.round(np.asarray(pg_array, dtype=np.float64).ravel(), 4)
+    if ecs_values.shape != pg_values.shape:
+        raise ValueError(
+            f"Длины рядов не совпадают: ЭКС {ecs_values.size}, ПГ {pg_values.size}"
+        )
+
+    try:
+        deleted = (
+            db.query(Analysis_result)
+            .filter(Analysis_result.sessionid == session_id)
+            .delete(synchronize_session=False)
+        )
+        deleted += (
+            db.query(Analysis_series)
+            .filter(Analysis_series.sessionid == session_id)
+            .delete(synchronize_session=False)
+        )
+        db.execute(
+            insert(Analysis_series),
+            {
+                "sessionid": session_id,
+                "dtype": dtype,
+                "sample_count": int(ecs_values.size),
+                "sample_rate": sample_rate,
+                "processing_params": json.dumps(params, ensure_ascii=False) if params is not None else None,
+                "processed_ecs_data": _encode_series(ecs_values, dtype),
+                "processed_pg_data": _encode_series(pg_values, dtype),
+            },
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"deleted": deleted, "inserted": int(ecs_values.size)}
+
+
+# Чтение строк результатов анализа старого формата
+def _load_legacy_series(db: Session, session_id: int):
+    """
+    Чтение рядов из таблицы analysis_result (по одной строке на отсчет)
+    в массивы NumPy. Возвращает (ЭКС, ПГ) или None, если строк нет.
+    """
+    rows = db.execute(
+        select(Analysis_result.processed_ecs_data, Analysis_result.processed_pg_data)
+        .where(Analysis_result.sessionid == session_id)
+        .order_by(Analysis_result.analysisresultid)
+    ).all()
+    if not rows:
+        return None
+    values = np.array(rows, dtype=np.float64)
+    return values[:, 0], values[:, 1]
+
+
+# Загрузка обработанных рядов сеанса
+@instrumented()
+def load_analysis_series(db: Session, session_id: int):
+    """
+    Загрузка обработанных рядов сеанса в массивы NumPy.
+    Сначала читается запись analysis_series; если ее нет, используются
+    строки старого формата analysis_result. Возвращает None, если данных нет.
+    """
+    record = db.execute(
+        select(
+            Analysis_series.dtype,
+            Analysis_series.sample_rate,
+            Analysis_series.processing_params,
+            Analysis_series.processed_ecs_data,
+            Analysis_series.processed_pg_data,
+        ).where(Analysis_series.sessionid == session_id)
+    ).first()
+    if record is not None:
+        return {
+            "processed_ecs_data": _decode_series(record.processed_ecs_data, record.dtype),
+            "processed_pg_data": _decode_series(record.processed_pg_data, record.dtype),
+            "dtype": record.dtype,
+            "sample_rate": record.sample_rate,
+            "processing_params": json.loads(record.processing_params) if record.processing_params else None,
+            "legacy": False,
+        }
+
+    legacy = _load_legacy_series(db, session_id)
+    if legacy is None:
+        return None
+    return {
+        "processed_ecs_data": legacy[0],
+        "processed_pg_data": legacy[1],
+        "dtype": "float64",
+        "sample_rate": None,
+        "processing_params": None,
+        "legacy": True,
+    }
+
+
+# Перенос результатов анализа старого формата в analysis_series
+@instrumented()
+def migrate_legacy_analysis_results(db: Session, session_ids=None, dtype: str = "float64"):
+    """
+    Перенос строк analysis_result в записи analysis_series (по одной на сеанс).
+    Каждый сеанс переносится отдельной транзакцией; сеансы, для которых
+    запись нового формата уже есть, пропускаются.
+    """
+    query = db.query(Analysis_result.sessionid).distinct()
+    if session_ids is not None:
+        query = query.filter(Analysis_result.sessionid.in_(list(session_ids)))
+    legacy_session_ids = sorted(row.sessionid for row in query.all())
+
+    existing = {
+        row.sessionid
+        for row in db.query(Analysis_series.sessionid)
+        .filter(Analysis_series.sessionid.in_(legacy_session_ids))
+        .all()
+    }
+
+    migrated, skipped, rows = 0, 0, 0
+    for session_id in legacy_session_ids:
+        if session_id in existing:
+            skipped += 1
+            continue
+        ecs_values, pg_values = _load_legacy_series(db, session_id)
+        result = save_analysis_series(
+            db,
+            session_id,
+            ecs_values,
+            pg_values,
+            params={"migrated_from": "analysis_result"},
+            dtype=dtype,
+        )
+        migrated += 1
+        rows += result["deleted"]
+
+    return {"migrated": migrated, "skipped": skipped, "rows": rows}
+
+
+# Постраничное получение обработанных рядов по сеансам
+@instrumented()
+def get_analysis_series_page(db: Session, after_id: int = None, limit: int = 500, patient_fio: str = None):
+    """
+    Получение очередной страницы обработанных рядов по ключу (sessionid > after_id)
+    без загрузки самих рядов. Кроме записей analysis_series, возвращает сеансы,
+    результаты которых еще хранятся в старом формате analysis_result (legacy=True).
+    Если указано ФИО, фильтрует по частичному совпадению.
+    """
+    series = select(
+        Analysis_series.sessionid,
+        Analysis_series.sample_count,
+        Analysis_series.sample_rate,
+        Analysis_series.dtype,
+        literal(False).label("legacy"),
+    )
+    legacy = (
+        select(
+            Analysis_result.sessionid,
+            func.count().label("sample_count"),
+            null().label("sample_rate"),
+            literal("float64").label("dtype"),
+            literal(True).label("legacy"),
+        )
+        .where(~exists().where(Analysis_series.sessionid == Analysis_result.sessionid))
+        .group_by(Analysis_result.sessionid)
+    )
+    results = union_all(series, legacy).subquery()
+
+    query = (
+        db.query(
+            results.c.sessionid,
+            Sessions.session_date,
+            Sessions.session_starttime,
+            Patient.patient_fio,
+            Doctor.doctor_fio,
+            results.c.sample_count,
+            results.c.sample_rate,
+            results.c.dtype,
+            results.c.legacy,
+        )
+        .join(Sessions, results.c.sessionid == Sessions.sessionid)
+        .join(Patient, Sessions.patientid == Patient.patientid)
+        .join(Doctor, Sessions.doctorid == Doctor.doctorid)
+    )
+    if after_id is not None:
+        query = query.filter(results.c.sessionid > after_id)
+    if patient_fio:
+        query = query.filter(Patient.patient_fio.ilike(f"%{patient_fio}%"))
+    rows = query.order_by(results.c.sessionid).limit(limit).all()
+    return [row._mapping for row in rows]
+
+
+# Запрос результатов анализа только с отображаемыми столбцами
+def _analysis_results_details_query(db: Session):
+    """
+    Один запрос с явным соединением вместо загрузки связанных объектов.
+    """
+    return (
+        db.query(
+            Analysis_result.analysisresultid,
+            Sessions.session_date,
+            Sessions.session_starttime,
+            Sessions.session_endtime,
+            Analysis_result.processed_ecs_data,
+            Analysis_result.processed_pg_data,
+        )
+        .outerjoin(Sessions, Analysis_result.sessionid == Sessions.sessionid)
+    )
+
+
 # Получение всех результатов анализа с заменой внешних ключей на читаемые значения
+@instrumented()
 def get_analysis_results_with_details(db: Session, skip: int = 0):
     """
     Получение всех результатов анализа с заменой внешних ключей на читаемые значения.
     """
-    results = (
-        db.query(Analysis_result)
-        .options(joinedload(Analysis_result.session))
+    rows = (
+        _analysis_results_details_query(db)
+        .order_by(Analysis_result.analysisresultid)
         .offset(skip)
         .all()
     )
+    return [row._mapping for row in rows]
+
+
+# Потоковое получение всех результатов анализа
+def iter_analysis_results_with_details(db: Session, chunk_size: int = 10000):
+    """
+    Генератор пакетов результатов анализа (по chunk_size строк).
+    Использует серверный курсор (yield_per), поэтому в памяти
+    находится только текущий пакет, а не вся таблица.
+    """
+    stmt = (
+        _analysis_results_details_query(db)
+        .order_by(Analysis_result.analysisresultid)
+        .statement.execution_options(yield_per=chunk_size)
+    )
+    for partition in db.execute(stmt).mappings().partitions():
+        yield partition
+
 
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "analysisresultid": result.analysisresultid,
-            "session_date": result.session.session_date if result.session else None,
-            "session_starttime": result.session.session_starttime if result.session else None,
-            "session_endtime": result.session.session_endtime if result.session else None,
-            "processed_ecs_data": result.processed_ecs_data,
-            "processed_pg_data": result.processed_pg_data,
+# Потоковое получение обработанных рядов всех сеансов
+def iter_analysis_series(db: Session, chunk_size: int = 100):
+    """
+    Генератор записей analysis_series с декодированными рядами (по одной на сеанс).
+    С сервера одновременно загружается не более chunk_size записей.
+    """
+    stmt = (
+        select(
+            Analysis_series.sessionid,
+            Analysis_series.dtype,
+            Analysis_series.sample_rate,
+            Analysis_series.processed_ecs_data,
+            Analysis_series.processed_pg_data,
+        )
+        .order_by(Analysis_series.sessionid)
+        .execution_options(yield_per=chunk_size)
+    )
+    for record in db.execute(stmt):
+        yield {
+            "sessionid": record.sessionid,
+            "dtype": record.dtype,
+            "sample_rate": record.sample_rate,
+            "processed_ecs_data": _decode_series(record.processed_ecs_data, record.dtype),
+            "processed_pg_data": _decode_series(record.processed_pg_data, record.dtype),
         }
-        for result in results
-    ]
-    return result
 
+@instrumented()
 def get_analysis_result_by_sessionid(db: Session, sessionid: int):
     """
     Получение результата анализа по ID сеанса.
@@ -56,6 +341,7 @@ def get_analysis_result_by_sessionid(db: Session, sessionid: int):
     result = db.query(Analysis_result).filter(Analysis_result.sessionid == sessionid).first()
     return result
 
+@instrumented()
 def get_analysis_results_by_sessionid(db: Session, session_id: int):
     """
     Получение всех результатов анализа для указанного сеанса.
@@ -65,33 +351,30 @@ def get_analysis_results_by_sessionid(db: Session, session_id: int):
 
 
 # Поиск результатов анализа по дате и времени сеанса
+@instrumented()
 def get_analysis_results_by_session_datetime(db: Session, session_date: date, session_time: time):
     """
     Поиск результатов анализа по дате и времени сеанса.
     """
-    results = (
-        db.query(Analysis_result)
+    rows = (
+        db.query(
+            Analysis_result.analysisresultid,
+            Sessions.session_date,
+            Sessions.session_starttime,
+            Sessions.session_endtime,
+            Analysis_result.processed_ecs_data,
+            Analysis_result.processed_pg_data,
+        )
         .join(Sessions, Analysis_result.sessionid == Sessions.sessionid)
         .filter(Sessions.session_date == session_date, Sessions.session_starttime == session_time)
+        .order_by(Analysis_result.analysisresultid)
         .all()
     )
-
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "analysisresultid": result.analysisresultid,
-            "session_date": result.session.session_date if result.session else None,
-            "session_starttime": result.session.session_starttime if result.session else None,
-            "session_endtime": result.session.session_endtime if result.session else None,
-            "processed_ecs_data": result.processed_ecs_data,
-            "processed_pg_data": result.processed_pg_data,
-        }
-        for result in results
-    ]
-    return result
+    return [row._mapping for row in rows]
 
 
 # Обновление данных результата анализа
+@instrumented()
 def update_analysis_result(
     db: Session,
     analysisresultid: int,
@@ -120,6 +403,7 @@ def update_analysis_result(
 
 
 # Удаление результата анализа
+@instrumented()
 def delete_analysis_result(db: Session, analysisresultid: int):
     """
     Удаление результата анализа.
@@ -130,42 +414,40 @@ def delete_analysis_result(db: Session, analysisresultid: int):
         db.commit()
     return result
 
+@instrumented()
 def delete_analysis_results_by_sessionid(db: Session, sessionid: int):
     """
-    Удаление всех записей результатов анализа для указанного sessionid.
+    Удаление всех записей результатов анализа для указанного sessionid
+    (в старом и новом формате).
     """
     db.query(Analysis_result).filter(Analysis_result.sessionid == sessionid).delete()
+    db.query(Analysis_series).filter(Analysis_series.sessionid == sessionid).delete()
     db.commit()
 
+@instrumented()
 def get_analysis_results_by_patient_fio(db: Session, patient_fio: str):
     """
     Получение результатов анализа по ФИО пациента.
     """
     try:
-        # Выполняем запрос с JOIN для получения данных о сессии, пациенте и враче
-        results = (
-            db.query(Analysis_result, Sessions, Patient, Doctor)
+        # Выполняем запрос с JOIN, выбирая только отображаемые столбцы
+        rows = (
+            db.query(
+                Analysis_result.analysisresultid,
+                Sessions.session_date,
+                Sessions.session_starttime,
+                Patient.patient_fio,
+                Doctor.doctor_fio,
+                Analysis_result.processed_ecs_data,
+                Analysis_result.processed_pg_data,
+            )
             .join(Sessions, Analysis_result.sessionid == Sessions.sessionid)
             .join(Patient, Sessions.patientid == Patient.patientid)
             .join(Doctor, Sessions.doctorid == Doctor.doctorid)
             .filter(Patient.patient_fio.ilike(f"%{patient_fio}%"))  # Частичное совпадение
+            .order_by(Analysis_result.analysisresultid)
             .all()
         )
-
-        # Формируем список результатов с дополнительной информацией
-        formatted_results = [
-            {
-                "analysisresultid": analysis_result.analysisresultid,
-                "session_date": session.session_date,
-                "session_starttime": session.session_starttime,
-                "patient_fio": patient.patient_fio,
-                "doctor_fio": doctor.doctor_fio,
-                "processed_ecs_data": analysis_result.processed_ecs_data,
-                "processed_pg_data": analysis_result.processed_pg_data,
-            }
-            for analysis_result, session, patient, doctor in results
-        ]
-
-        return formatted_results
+        return [row._mapping for row in rows]
     except Exception as e:
         raise ValueError(f"Ошибка при получении результатов анализа: {e}")
@@ -0,0 +1,117 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+
+# Задержка перед запуском расчета: серия быстрых изменений дает один расчет, мс
+DEFAULT_DEBOUNCE_MS = 250
+
+
+class ComputeTaskSignals(QObject):
+    """Сигналы расчета (первый аргумент — номер запроса); создаются в потоке интерфейса."""
+    succeeded = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class ComputeTask(QRunnable):
+    """Вызов func(*args) в потоке пула."""
+
+    def __init__(self, generation, func, args):
+        super().__init__()
+        self.signals = ComputeTaskSignals()
+        self.generation = generation
+        self.func = func
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+        else:
+            self.signals.succeeded.emit(self.generation, result)
+
+
+class LatestTaskRunner(QObject):
+    """
+    Фоновый расчет по последнему запросу.
+    Запросы, поступившие в течение delay_ms, объединяются в один; одновременно
+    выполняется не более одного расчета, следующий запускается с последними
+    аргументами. Результаты устаревших запросов отбрасываются, поэтому
+    result_ready получает только результат самого свежего запроса.
+    """
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, func, delay_ms=DEFAULT_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.func = func
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start_latest)
+        self._generation = 0
+        self._pending_args = None
+        self._running_generation = None  # Номер выполняющегося запроса
+        self._busy = False
+
+    def request(self, *args, immediate=False):
+        """
+        Запрос расчета func(*args); предыдущие запросы становятся устаревшими.
+        При immediate=True расчет запускается без задержки (если нет выполняющегося).
+        """
+        self._generation += 1
+        self._pending_args = args
+        if immediate:
+            self._timer.stop()
+            self._start_latest()
+        else:
+            self._timer.start()
+        self._update_busy()
+
+    def cancel(self):
+        """Отмена ожидающего запроса; результат выполняющегося расчета будет отброшен."""
+        self._generation += 1
+        self._pending_args = None
+        self._timer.stop()
+        self._update_busy()
+
+    def is_busy(self):
+        """Есть ли ожидающий или выполняющийся актуальный запрос."""
+        return self._busy
+
+    def _start_latest(self):
+        # Пока выполняется расчет, новый не запускается: он стартует по завершении текущего
+        if self._running_generation is not None or self._pending_args is None:
+            return
+        args, self._pending_args = self._pending_args, None
+        self._running_generation = self._generation
+
+        task = ComputeTask(self._generation, self.func, args)
+        task.signals.succeeded.connect(self._on_succeeded)
+        task.signals.failed.connect(self._on_failed)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_succeeded(self, generation, result):
+        fresh = generation == self._generation
+        self._task_finished()
+        if fresh:
+            self.result_ready.emit(result)
+
+    def _on_failed(self, generation, message):
+        fresh = generation == self._generation
+        self._task_finished()
+        if fresh:
+            print(f"Ошибка фонового расчета: {message}")
+            self.failed.emit(message)
+
+    def _task_finished(self):
+        self._running_generation = None
+        if not self._timer.isActive():
+            self._start_latest()
+        self._update_busy()
+
+    def _update_busy(self):
+        busy = self._pending_args is not None or self._running_generation == self._generation
+        if busy != self._busy:
+            self._busy = busy
+            self.busy_changed.emit(busy)
@@ -0,0 +1,171 @@
+import functools
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from sqlalchemy.orm import Session
+
+
+# Количество одновременных фоновых запросов (меньше пула соединений движка)
+MAX_DB_THREADS = 4
+
+# Общий пул потоков для фоновых запросов всех виджетов
+_thread_pool = None
+
+
+def _get_thread_pool():
+    """
+    Пул потоков создается один раз и не принадлежит виджетам: при удалении
+    виджета интерфейс не ждет завершения выполняющихся запросов.
+    """
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(MAX_DB_THREADS)
+    return _thread_pool
+
+
+class DbTaskSignals(QObject):
+    """Сигналы задачи (первый аргумент — сама задача); создаются в потоке интерфейса."""
+    succeeded = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+    finished = pyqtSignal(object)
+
+
+class DbTask(QRunnable):
+    """
+    Вызов функции сервиса func(db, *args, **kwargs) в потоке пула.
+    Задача открывает собственную сессию SQLAlchemy на общем движке
+    (сессия не потокобезопасна, поэтому сессия интерфейса не используется)
+    и закрывает ее по завершении, возвращая соединение в пул.
+    """
+
+    def __init__(self, bind, func, args=(), kwargs=None, on_result=None, on_error=None):
+        super().__init__()
+        self.signals = DbTaskSignals()
+        self.bind = bind
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.on_result = on_result
+        self.on_error = on_error
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._dbapi_connection = None
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """
+        Отмена задачи: результат не будет доставлен, а выполняющийся запрос
+        прерывается на сервере (для драйверов с поддержкой cancel, например psycopg2).
+        """
+        self._cancelled.set()
+        with self._lock:
+            if self._dbapi_connection is not None and hasattr(self._dbapi_connection, "cancel"):
+                try:
+                    self._dbapi_connection.cancel()
+                except Exception as e:
+                    print(f"Не удалось прервать запрос: {e}")
+
+    def run(self):
+        try:
+            if self.is_cancelled():
+                return
+            db = Session(bind=self.bind, autoflush=False)
+            try:
+                with self._lock:
+                    self._dbapi_connection = db.connection().connection.dbapi_connection
+                result = self.func(db, *self.args, **self.kwargs)
+            except Exception as e:
+                if not self.is_cancelled():
+                    print(f"Ошибка фонового запроса: {e}")
+                    self.signals.failed.emit(self, str(e))
+            else:
+                if not self.is_cancelled():
+                    self.signals.succeeded.emit(self, result)
+            finally:
+                with self._lock:
+                    self._dbapi_connection = None
+                db.close()
+        finally:
+            self.signals.finished.emit(self)
+
+
+def _cancel_tasks(tasks):
+    """Отмена задач; вызывается и после удаления объекта AsyncDb."""
+    for task in list(tasks.values()):
+        task.cancel()
+
+
+class AsyncDb(QObject):
+    """
+    Асинхронный доступ к базе данных для виджетов.
+    Функции сервисов выполняются в пуле потоков, результат передается
+    обработчикам в потоке интерфейса. Задача с тем же ключом отменяет
+    предыдущую (устаревший результат не доставляется), а при удалении
+    владельца отменяются все его задачи.
+    """
+
+    def __init__(self, bind, parent=None):
+        super().__init__(parent)
+        self.bind = bind
+        self._tasks = {}  # ключ -> задача
+        self._counter = 0
+        self.destroyed.connect(functools.partial(_cancel_tasks, self._tasks))
+
+    @classmethod
+    def for_session(cls, db_session, parent=None):
+        """Фасад, работающий через движок (пул соединений) сессии интерфейса."""
+        return cls(db_session.get_bind(), parent)
+
+    def submit(self, func, *args, on_result=None, on_error=None, key=None, **kwargs):
+        """
+        Запуск func(db, *args, **kwargs) в фоне.
+        on_result(результат) и on_error(сообщение) вызываются в потоке интерфейса.
+        Если key не задан, задача не отменяет другие задачи.
+        """
+        if key is None:
+            self._counter += 1
+            key = ("task", self._counter)
+        self.cancel(key)
+
+        task = DbTask(self.bind, func, args, kwargs, on_result=on_result, on_error=on_error)
+        task.key = key
+        # Обработчики — методы объекта потока интерфейса, поэтому вызовы ставятся в его очередь
+        task.signals.succeeded.connect(self._on_succeeded)
+        task.signals.failed.connect(self._on_failed)
+        task.signals.finished.connect(self._on_finished)
+        self._tasks[key] = task
+        _get_thread_pool().start(task)  # Пул удаляет задачу после выполнения
+        return task
+
+    def _on_succeeded(self, task, result):
+        # Результат отмененной задачи мог уже стоять в очереди, поэтому проверяем еще раз
+        if task.on_result is not None and not task.is_cancelled():
+            task.on_result(result)
+
+    def _on_failed(self, task, message):
+        if task.on_error is not None and not task.is_cancelled():
+            task.on_error(message)
+
+    def _on_finished(self, task):
+        if self._tasks.get(task.key) is task:
+            del self._tasks[task.key]
+
+    def cancel(self, key):
+        """Отмена задачи с указанным ключом."""
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self):
+        """Отмена всех задач (например, при закрытии окна или уходе со страницы)."""
+        _cancel_tasks(self._tasks)
+        self._tasks.clear()
+
+    def is_busy(self, key=None):
+        """Выполняется ли задача с ключом key (или любая задача)."""
+        if key is None:
+            return bool(self._tasks)
+        return key in self._tasks
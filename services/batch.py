@@ -0,0 +1,168 @@
+"""
+Пакетная обработка сеансов без графического интерфейса.
+
+Пример запуска:
+    python -m services.batch --user researcher --config pipeline.json \\
+        --date-from 2025-01-01 --date-to 2025-01-31 --workers 8
+
+Файл конфигурации — JSON в формате SignalPipeline.to_dict():
+    {
+        "filters": {"lowpass": 0.5, "chebyshev_params": null,
+                    "highpass": true, "notch": false, "center": true},
+        "crop": null,
+        "epoch": {"start": null, "end": null, "cycle_count": 60},
+        "interpolate": true,
+        "interpolation_step": 0.1,
+        "fs": 200
+    }
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+from database.session import (
+    add_credentials_arguments,
+    authenticate_user,
+    dispose_all_engines,
+    get_cli_password,
+    get_worker_session,
+    init_worker_session,
+)
+from services.analysis_service import save_analysis_series
+from services.dsp import SignalPipeline
+from services.instrumentation import instrumented
+from services.sessions_service import get_session_ids_for_processing
+from services.signal_service import load_session_signals
+
+
+@instrumented()
+def process_session(db, session_id, pipeline: SignalPipeline):
+    """
+    Обработка одного сеанса: загрузка сигналов, обработка и сохранение результатов.
+    Возвращает словарь с количеством исходных и сохраненных отсчетов.
+    """
+    rr_times, amplitudes = load_session_signals(db, session_id)
+    if rr_times.size == 0 or amplitudes.size == 0:
+        raise ValueError(f"Нет данных ЭКС или ПГ для сеанса с ID {session_id}")
+
+    result = pipeline.run(rr_times, amplitudes)
+    saved = save_analysis_series(
+        db,
+        session_id,
+        result.series_rr,
+        result.series_pg,
+        sample_rate=1 / pipeline.interpolation_step if pipeline.interpolate else None,
+        params=pipeline.to_dict(),
+    )
+    return {
+        "sessionid": session_id,
+        "samples": int(rr_times.size + amplitudes.size),
+        "saved": saved["inserted"],
+    }
+
+
+def _process_in_worker(session_id, config):
+    """Обработка сеанса в процессе пула с его собственной сессией базы данных."""
+    db = get_worker_session()
+    try:
+        return process_session(db, session_id, SignalPipeline.from_dict(config))
+    except Exception as e:
+        db.rollback()
+        return {"sessionid": session_id, "error": str(e)}
+
+
+def run_batch(username, password, session_ids, config, workers=None):
+    """
+    Параллельная обработка списка сеансов в пуле процессов.
+    Возвращает сводку с результатами и пропускной способностью.
+    """
+    started = time.perf_counter()
+    results = []
+    if session_ids:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker_session,
+            initargs=(username, password),
+        ) as executor:
+            futures = [executor.submit(_process_in_worker, session_id, config) for session_id in session_ids]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if "error" in result:
+                    print(f"Сеанс {result['sessionid']}: ошибка — {result['error']}")
+                else:
+                    print(f"Сеанс {result['sessionid']}: {result['samples']} отсчетов, сохранено {result['saved']}")
+
+    return summarize(results, time.perf_counter() - started)
+
+
+def summarize(results, elapsed):
+    """Сводка по результатам обработки: сеансы, ошибки и пропускная способность."""
+    processed = [result for result in results if "error" not in result]
+    samples = sum(result["samples"] for result in processed)
+    return {
+        "results": results,
+        "processed": len(processed),
+        "failed": len(results) - len(processed),
+        "elapsed": elapsed,
+        "sessions_per_second": len(processed) / elapsed if elapsed > 0 else 0.0,
+        "samples_per_second": samples / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетная обработка сеансов ЭКС и ПГ")
+    add_credentials_arguments(parser)
+    parser.add_argument("--config", required=True, help="JSON-файл с конфигурацией обработки")
+    parser.add_argument("--date-from", type=date.fromisoformat, help="Начальная дата сеансов (ГГГГ-ММ-ДД)")
+    parser.add_argument("--date-to", type=date.fromisoformat, help="Конечная дата сеансов (ГГГГ-ММ-ДД)")
+    parser.add_argument("--patient", help="ФИО пациента (частичное совпадение)")
+    parser.add_argument("--lab", help="Название лаборатории")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Количество процессов")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        raise SystemExit("Количество процессов должно быть не меньше 1")
+
+    password = get_cli_password(args)
+
+    with open(args.config, encoding="utf-8") as config_file:
+        config = json.load(config_file)
+    # Проверяем конфигурацию до запуска пула
+    config = SignalPipeline.from_dict(config).to_dict()
+
+    db = authenticate_user(args.user, password)
+    if db is None:
+        raise SystemExit("Не удалось подключиться к базе данных")
+    try:
+        session_ids = get_session_ids_for_processing(
+            db,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            patient_fio=args.patient,
+            lab_name=args.lab,
+        )
+    finally:
+        db.close()
+
+    print(f"Найдено сеансов: {len(session_ids)}")
+    try:
+        summary = run_batch(args.user, password, session_ids, config, workers=args.workers)
+    finally:
+        dispose_all_engines()
+    print(
+        f"Обработано: {summary['processed']}, с ошибками: {summary['failed']}, "
+        f"время: {summary['elapsed']:.2f} с, "
+        f"{summary['sessions_per_second']:.2f} сеансов/с, "
+        f"{summary['samples_per_second']:.0f} отсчетов/с"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Пакетный импорт файлов сигналов: по одному файлу на сеанс.
+
+Файлы задаются каталогами (берутся все *.txt) или шаблонами glob.
+Сеанс определяется по имени файла регулярным выражением с группой
+session (ID сеанса) или по CSV-файлу соответствий "файл,ID сеанса".
+Файлы импортируются параллельно в пуле процессов; каждый сеанс
+загружается отдельной транзакцией через пул соединений процесса.
+С флагом --replace прежние сигналы сеансов заменяются в той же транзакции.
+Тройки строк с некорректными значениями отбрасываются и учитываются в отчете
+как отклоненные строки; с флагом --strict такой файл не импортируется.
+
+Пример запуска:
+    python -m services.bulk_import --user researcher "recordings/2025-05-05" \\
+        --pattern "session_(?P<session>\\d+)\\.txt" --workers 8
+"""
+import argparse
+import csv
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from database.session import (
+    add_credentials_arguments,
+    dispose_all_engines,
+    get_cli_password,
+    get_worker_session,
+    init_worker_session,
+)
+from services.import_service import import_signal_file, replace_session_signals
+from services.instrumentation import instrumented
+from services.signal_service import session_has_signals
+
+
+# Правило по умолчанию: первое число в имени файла — ID сеанса
+DEFAULT_PATTERN = r"(?P<session>\d+)"
+
+
+def collect_files(inputs):
+    """
+    Список файлов по каталогам (все *.txt) и шаблонам glob без повторов,
+    в порядке сортировки путей.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "*.txt")))
+        else:
+            paths.update(path for path in glob.glob(item) if os.path.isfile(path))
+    return sorted(paths)
+
+
+def load_mapping(mapping_path):
+    """Чтение CSV-файла соответствий "имя файла,ID сеанса" (строки с # пропускаются)."""
+    mapping = {}
+    with open(mapping_path, newline="", encoding="utf-8") as mapping_file:
+        for number, row in enumerate(csv.reader(mapping_file), start=1):
+            if not row or row[0].startswith("#"):
+                continue
+            if len(row) != 2 or not row[1].strip().isdigit():
+                raise ValueError(f"Строка {number} файла соответствий: ожидалось 'имя файла,ID сеанса'")
+            mapping[row[0].strip()] = int(row[1])
+    return mapping
+
+
+def resolve_sessions(paths, pattern=DEFAULT_PATTERN, mapping=None):
+    """
+    Сопоставление файлов с сеансами.
+    Возвращает (задания [(путь, ID сеанса)], отклоненные [(путь, причина)]).
+    Файлы без сеанса и повторные файлы одного сеанса отклоняются.
+    """
+    regex = re.compile(pattern)
+    if "session" not in regex.groupindex:
+        raise ValueError("Регулярное выражение должно содержать группу (?P<session>...)")
+
+    jobs, rejected, seen = [], [], {}
+    for path in paths:
+        name = os.path.basename(path)
+        if mapping is not None:
+            session_id = mapping.get(name)
+        else:
+            match = regex.search(name)
+            session_id = int(match.group("session")) if match else None
+
+        if session_id is None:
+            rejected.append((path, "не удалось определить сеанс по имени файла"))
+        elif session_id in seen:
+            rejected.append((path, f"сеанс {session_id} уже импортируется из {seen[session_id]}"))
+        else:
+            seen[session_id] = path
+            jobs.append((path, session_id))
+    return jobs, rejected
+
+
+@instrumented()
+def import_file(db, path, session_id, replace=False, skip_invalid=True):
+    """
+    Импорт одного файла в сеанс отдельной транзакцией.
+    Без replace сеансы, для которых уже есть сигналы, не перезаписываются.
+    При skip_invalid тройки с некорректными строками отбрасываются,
+    иначе первая такая строка отменяет импорт файла.
+    """
+    if replace:
+        result = replace_session_signals(db, session_id, path, skip_invalid=skip_invalid)
+        return {"path": path, "sessionid": session_id, **result}
+
+    if session_has_signals(db, session_id):
+        raise ValueError(f"Для сеанса {session_id} уже есть данные ЭКС или ПГ")
+    result = import_signal_file(db, session_id, path, skip_invalid=skip_invalid)
+    return {"path": path, "sessionid": session_id, **result}
+
+
+def _import_in_worker(path, session_id, replace, skip_invalid):
+    """Импорт файла в процессе пула с его собственной сессией базы данных."""
+    db = get_worker_session()
+    try:
+        return import_file(db, path, session_id, replace=replace, skip_invalid=skip_invalid)
+    except Exception as e:
+        db.rollback()
+        return {"path": path, "sessionid": session_id, "error": str(e)}
+
+
+def run_bulk_import(username, password, jobs, workers=None, replace=False, skip_invalid=True):
+    """
+    Параллельный импорт файлов в пуле процессов.
+    Возвращает сводку с результатами и пропускной способностью.
+    """
+    started = time.perf_counter()
+    results = []
+    if jobs:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker_session,
+            initargs=(username, password),
+        ) as executor:
+            futures = [
+                executor.submit(_import_in_worker, path, session_id, replace, skip_invalid)
+                for path, session_id in jobs
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if "error" in result:
+                    print(f"{result['path']} → сеанс {result['sessionid']}: ошибка — {result['error']}")
+                else:
+                    print(
+                        f"{result['path']} → сеанс {result['sessionid']}: {result['rows']} отсчетов, "
+                        f"отклонено строк: {result['rejected_lines']}"
+                    )
+
+    return summarize(results, time.perf_counter() - started)
+
+
+def summarize(results, elapsed):
+    """
+    Сводка по результатам импорта: отсчеты, отклоненные строки загруженных файлов,
+    файлы с ошибками и скорость. Строки файлов с ошибками не учитываются:
+    такие файлы отклоняются целиком и считаются в failed.
+    """
+    loaded = [result for result in results if "error" not in result]
+    rows = sum(result["rows"] for result in loaded)
+    size = sum(result["bytes"] for result in loaded)
+    return {
+        "results": results,
+        "loaded": len(loaded),
+        "failed": len(results) - len(loaded),
+        "rows": rows,
+        "rejected_lines": sum(result["rejected_lines"] for result in loaded),
+        "elapsed": elapsed,
+        "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+        "megabytes_per_second": size / 2 ** 20 / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный импорт файлов сигналов ЭКС и ПГ")
+    parser.add_argument("inputs", nargs="+", help="Каталоги или шаблоны glob с файлами сигналов")
+    add_credentials_arguments(parser)
+    parser.add_argument(
+        "--pattern", default=DEFAULT_PATTERN,
+        help="Регулярное выражение для имени файла с группой (?P<session>...)",
+    )
+    parser.add_argument("--mapping", help="CSV-файл соответствий 'имя файла,ID сеанса' (вместо --pattern)")
+    parser.add_argument("--replace", action="store_true", help="Заменять уже загруженные сигналы сеансов")
+    parser.add_argument(
+        "--strict", action="store_true",
+        help="Не импортировать файл с некорректной строкой (по умолчанию такие тройки строк отклоняются)",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Количество процессов")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        raise SystemExit("Количество процессов должно быть не меньше 1")
+
+    try:
+        mapping = load_mapping(args.mapping) if args.mapping else None
+        jobs, rejected = resolve_sessions(collect_files(args.inputs), pattern=args.pattern, mapping=mapping)
+    except (OSError, ValueError, re.error) as e:
+        raise SystemExit(f"Ошибка в параметрах импорта: {e}")
+
+    for path, reason in rejected:
+        print(f"{path}: пропущен — {reason}")
+    print(f"Найдено файлов для импорта: {len(jobs)}")
+
+    password = get_cli_password(args)
+    try:
+        summary = run_bulk_import(
+            args.user, password, jobs, workers=args.workers, replace=args.replace, skip_invalid=not args.strict,
+        )
+    finally:
+        dispose_all_engines()
+
+    print(
+        f"Загружено файлов: {summary['loaded']}, с ошибками: {summary['failed']}, пропущено: {len(rejected)}\n"
+        f"Отсчетов: {summary['rows']}, отклонено строк в загруженных файлах: {summary['rejected_lines']}\n"
+        f"Время: {summary['elapsed']:.2f} с, {summary['rows_per_second']:.0f} отсчетов/с, "
+        f"{summary['megabytes_per_second']:.1f} МБ/с"
+    )
+
+
+if __name__ == "__main__":
+    main()
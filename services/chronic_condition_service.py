@@ -1,9 +1,11 @@
 from datetime import date
 from sqlalchemy.orm import Session, joinedload
 from database.models import Chronic_condition, Patient
+from services.instrumentation import instrumented
 
 
 # Создание новой хронической болезни
+@instrumented()
 def create_chronic_condition(
     db: Session,
     patient_fio: str,  # Вместо patientid
@@ -32,6 +34,7 @@ def create_chronic_condition(
 
 
 # Получение всех хронических заболеваний с заменой внешних ключей на читаемые значения
+@instrumented()
 def get_chronic_conditions_with_details(db: Session, skip: int = 0):
     """
     Получение всех хронических заболеваний с заменой patientid на ФИО пациента и дату рождения.
@@ -59,6 +62,7 @@ def get_chronic_conditions_with_details(db: Session, skip: int = 0):
 
 
 # Поиск хронических заболеваний по имени пациента
+@instrumented()
 def search_chronic_conditions_by_patient_fio(db: Session, fio: str):
     """
     Поиск хронических заболеваний по частичному совпадению ФИО пациента.
@@ -85,6 +89,7 @@ def search_chronic_conditions_by_patient_fio(db: Session, fio: str):
 
 
 # Обновление данных хронической болезни
+@instrumented()
 def update_chronic_condition(
     db: Session,
     chronicid: int,
@@ -122,6 +127,7 @@ def update_chronic_condition(
 
 
 # Удаление хронической болезни
+@instrumented()
 def delete_chronic_condition(db: Session, chronicid: int):
     """
     Удаление хронической болезни.
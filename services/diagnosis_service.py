@@ -2,9 +2,11 @@ from datetime import date
 
 from sqlalchemy.orm import Session, joinedload
 from database.models import Diagnosis, Patient, Doctor
+from services.instrumentation import instrumented
 
 
 # Создание нового диагноза
+@instrumented()
 def create_diagnosis(
     db: Session,
     patient_fio: str,  # Вместо patientid
@@ -40,6 +42,7 @@ def create_diagnosis(
 
 
 # Получение всех диагнозов с заменой внешних ключей на читаемые значения
+@instrumented()
 def get_diagnoses_with_details(db: Session, skip: int = 0, limit: int = 100):
     diagnoses = (
         db.query(Diagnosis)
@@ -66,6 +69,7 @@ def get_diagnoses_with_details(db: Session, skip: int = 0, limit: int = 100):
 
 
 # Поиск диагнозов по ФИО пациента
+@instrumented()
 def search_diagnoses_by_patient_fio(db: Session, fio: str):
     diagnoses = (
         db.query(Diagnosis)
@@ -91,6 +95,7 @@ def search_diagnoses_by_patient_fio(db: Session, fio: str):
 
 
 # Поиск диагнозов по названию
+@instrumented()
 def search_diagnoses_by_name(db: Session, name: str):
     """
     Поиск диагнозов по частичному совпадению названия.
@@ -113,6 +118,7 @@ def search_diagnoses_by_name(db: Session, name: str):
 
 
 # Обновление данных диагноза
+@instrumented()
 def update_diagnosis(
     db: Session,
     diagnosisid: int,
@@ -156,6 +162,7 @@ def update_diagnosis(
 
 
 # Удаление диагноза
+@instrumented()
 def delete_diagnosis(db: Session, diagnosisid: int):
     diagnosis = db.query(Diagnosis).filter(Diagnosis.diagnosisid == diagnosisid).first()
     if diagnosis:
@@ -4,9 +4,11 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from database.models import Doctor_schedule, Doctor
+from services.instrumentation import instrumented
 
 
 # Создание нового расписания врача
+@instrumented()
 def create_doctor_schedule(
     db: Session,
     doctor_fio: str,  # Вместо doctorid
@@ -43,6 +45,7 @@ def create_doctor_schedule(
 
 
 # Получение всех записей расписания врачей
+@instrumented()
 def get_all_doctor_schedules(db: Session, skip: int = 0, limit: int = 100):
     schedules = (
         db.query(Doctor_schedule)
@@ -64,6 +67,7 @@ def get_all_doctor_schedules(db: Session, skip: int = 0, limit: int = 100):
     ]
     return result
 
+@instrumented()
 def get_schedule_for_doctor(db: Session, doctor_fio: str):
     schedules = (
         db.query(Doctor_schedule)
@@ -85,6 +89,7 @@ def get_schedule_for_doctor(db: Session, doctor_fio: str):
     return result
 
 # Получение доступных слотов для записи к врачу
+@instrumented()
 def get_available_slots_for_doctor(db: Session, doctor_fio: str):
     """
     Получение доступных временных слотов для записи к врачу.
@@ -116,6 +121,7 @@ def get_available_slots_for_doctor(db: Session, doctor_fio: str):
 
 
 # Обновление расписания врача
+@instrumented()
 def update_doctor_schedule(
     db: Session,
     scheduleid: int,
@@ -157,6 +163,7 @@ def update_doctor_schedule(
 
 
 # Удаление расписания врача
+@instrumented()
 def delete_doctor_schedule(db: Session, scheduleid: int):
     """
     Удаление расписания врача.
@@ -1,9 +1,11 @@
 from datetime import date
 from sqlalchemy.orm import Session, joinedload
 from database.models import Doctor, Polyclinic
+from services.instrumentation import instrumented
 
 
 # Создание нового врача
+@instrumented()
 def create_doctor(
     db: Session,
     fio: str,
@@ -34,6 +36,7 @@ def create_doctor(
 
 
 # Получение всех врачей с заменой внешних ключей на читаемые значения
+@instrumented()
 def get_doctors_with_details(db: Session, skip: int = 0, limit: int = 100):
     """
     Получение всех врачей с заменой polyclinicid на название поликлиники.
@@ -62,6 +65,7 @@ def get_doctors_with_details(db: Session, skip: int = 0, limit: int = 100):
 
 
 # Поиск врачей по ФИО
+@instrumented()
 def search_doctors_by_fio(db: Session, fio: str):
     """
     Поиск врачей по частичному совпадению ФИО.
@@ -84,6 +88,7 @@ def search_doctors_by_fio(db: Session, fio: str):
 
 
 # Обновление данных врача
+@instrumented()
 def update_doctor(
     db: Session,
     doctor_id: int,
@@ -124,6 +129,7 @@ def update_doctor(
 
 
 # Удаление врача
+@instrumented()
 def delete_doctor(db: Session, doctor_id: int):
     """
     Удаление врача.
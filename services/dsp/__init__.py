@@ -0,0 +1,35 @@
+"""
+Обработка биомедицинских сигналов без графического интерфейса.
+Модули пакета используют только NumPy и SciPy (и замеры services.instrumentation,
+которым нужна только стандартная библиотека).
+"""
+from services.dsp.decimation import MinMaxPyramid, get_pyramid
+from services.dsp.epochs import (
+    MIN_EPOCH_CYCLES,
+    find_flattest_epoch,
+    rank_epochs,
+    rolling_window_stats,
+    validate_epoch,
+)
+from services.dsp.filters import (
+    CHEBYSHEV_PARAMS,
+    DEFAULT_FS,
+    LOWPASS_CUTOFFS,
+    FilterConfig,
+    apply_filters,
+    crop_signals,
+    design_filter,
+)
+from services.dsp.pipeline import EpochConfig, PipelineResult, SignalPipeline
+from services.dsp.resampling import DEFAULT_INTERPOLATION_STEP, beat_times, interpolate_series
+from services.dsp.spectrum import (
+    HRV_BANDS,
+    HrvBandPowers,
+    band_powers,
+    clear_spectrum_cache,
+    compute_spectrum,
+    hrv_band_powers,
+    multitaper_psd,
+    welch_psd,
+)
+from services.dsp.statistics import SignalStatistics, compute_statistics
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from services.instrumentation import instrumented
+
+
+# Коэффициент прореживания между соседними уровнями пирамиды
+PYRAMID_FACTOR = 4
+
+# Количество пирамид в кэше (последние отображенные сигналы)
+PYRAMID_CACHE_SIZE = 8
+
+
+class MinMaxPyramid:
+    """
+    Многоуровневая пирамида минимумов и максимумов сигнала для отображения.
+    Уровень k хранит индексы минимума и максимума в блоках по factor**k отсчетов,
+    поэтому прореживание любого участка занимает O(точек на экране), а не O(отсчетов).
+    Пирамида ссылается на исходный массив: изменять его на месте нельзя.
+    """
+
+    def __init__(self, y, x=None, factor=PYRAMID_FACTOR):
+        self.y = np.asarray(y, dtype=np.float64)
+        self.x = None if x is None else np.asarray(x, dtype=np.float64)
+        if self.x is not None and self.x.shape != self.y.shape:
+            raise ValueError("Длины массивов x и y не совпадают")
+        if factor < 2:
+            raise ValueError("Коэффициент прореживания должен быть не меньше 2")
+        self.factor = factor
+        self.levels = []  # (размер блока, индексы минимумов, индексы максимумов)
+
+        min_idx = max_idx = np.arange(self.y.size)
+        block = 1
+        while min_idx.size > 1:
+            min_idx, max_idx = self._reduce(min_idx, max_idx)
+            block *= factor
+            self.levels.append((block, min_idx, max_idx))
+
+    def _reduce(self, min_idx, max_idx):
+        """Следующий уровень: выбор минимума и максимума в каждой группе из factor блоков."""
+        remainder = -min_idx.size % self.factor
+        if remainder:
+            # Неполная последняя группа дополняется ее последним элементом
+            min_idx = np.concatenate([min_idx, np.repeat(min_idx[-1], remainder)])
+            max_idx = np.concatenate([max_idx, np.repeat(max_idx[-1], remainder)])
+        min_idx = min_idx.reshape(-1, self.factor)
+        max_idx = max_idx.reshape(-1, self.factor)
+        rows = np.arange(min_idx.shape[0])
+        return (
+            min_idx[rows, np.argmin(self.y[min_idx], axis=1)],
+            max_idx[rows, np.argmax(self.y[max_idx], axis=1)],
+        )
+
+    @property
+    def size(self):
+        return self.y.size
+
+    def data_range(self):
+        """Границы сигнала по оси x."""
+        if self.size == 0:
+            return 0.0, 0.0
+        if self.x is None:
+            return 0.0, float(self.size - 1)
+        return float(self.x[0]), float(self.x[-1])
+
+    def index_range(self, x0, x1):
+        """
+        Диапазон индексов [start, stop), покрывающий участок [x0, x1]
+        с одним отсчетом за каждой границей (линия доходит до краев графика).
+        """
+        if self.x is None:
+            start, stop = int(np.ceil(x0)) - 1, int(np.floor(x1)) + 2
+        else:
+            start = int(np.searchsorted(self.x, x0, side="left")) - 1
+            stop = int(np.searchsorted(self.x, x1, side="right")) + 1
+        return max(start, 0), min(max(stop, 0), self.size)
+
+    def select(self, start, stop, max_points):
+        """
+        Индексы отсчетов для отображения участка [start, stop): все отсчеты,
+        если их не больше max_points, иначе минимум и максимум каждого блока
+        самого подробного уровня, укладывающегося в max_points.
+        """
+        count = stop - start
+        if count <= max_points or not self.levels:
+            return np.arange(start, stop)
+
+        for block, min_idx, max_idx in self.levels:
+            first, last = start // block, min(-(-stop // block), min_idx.size)
+            if 2 * (last - first) + 2 <= max_points:
+                break
+
+        lows, highs = min_idx[first:last], max_idx[first:last]
+
+        # Минимум и максимум каждого блока и крайние отсчеты участка в порядке следования
+        indices = np.empty(2 * lows.size + 2, dtype=np.int64)
+        indices[0], indices[-1] = start, stop - 1
+        indices[1:-1:2] = lows
+        indices[2:-1:2] = highs
+        indices.sort()
+        return indices
+
+    def view(self, x0, x1, max_points):
+        """Координаты (x, y) прореженного участка [x0, x1] для отображения."""
+        indices = self.select(*self.index_range(x0, x1), max_points)
+        xs = indices.astype(np.float64) if self.x is None else self.x[indices]
+        return xs, self.y[indices]
+
+
+_pyramid_cache = OrderedDict()
+
+
+@instrumented()
+def get_pyramid(y, x=None):
+    """
+    Пирамида для массива из кэша (по идентичности объектов y и x)
+    или новая; повторная отрисовка того же сигнала не перестраивает пирамиду.
+    """
+    if not isinstance(y, np.ndarray) or (x is not None and not isinstance(x, np.ndarray)):
+        return MinMaxPyramid(y, x)
+
+    # Кэш хранит ссылки на массивы, поэтому их идентификаторы не переиспользуются
+    key = (id(y), None if x is None else id(x))
+    entry = _pyramid_cache.get(key)
+    if entry is not None:
+        _pyramid_cache.move_to_end(key)
+        return entry[2]
+
+    pyramid = MinMaxPyramid(y, x)
+    _pyramid_cache[key] = (y, x, pyramid)
+    if len(_pyramid_cache) > PYRAMID_CACHE_SIZE:
+        _pyramid_cache.popitem(last=False)
+    return pyramid
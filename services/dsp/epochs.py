@@ -0,0 +1,111 @@
+import numpy as np
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+from services.instrumentation import instrumented
+
+
+# Минимальное количество кардиоциклов в эпохе
+MIN_EPOCH_CYCLES = 30
+
+# Порог выброса в единицах СКО окна
+OUTLIER_SIGMA = 3
+
+
+def validate_epoch(start, end, signal_length, min_cycles=MIN_EPOCH_CYCLES):
+    """
+    Проверка границ эпохи, заданной вручную (конец включительно).
+    """
+    if start < 0 or end >= signal_length:
+        raise ValueError("Индексы выходят за границы сигнала.")
+    if end - start + 1 < min_cycles:
+        raise ValueError(f"Выбранный участок должен содержать не менее {min_cycles} кардиоциклов.")
+    return start, end
+
+
+def rolling_window_stats(rr_times, window):
+    """
+    Скользящие среднее и СКО для всех окон длины window за O(n)
+    (через накопленные суммы) и признак наличия выброса (> 3σ) в окне.
+    Элемент i массивов соответствует окну rr_times[i:i + window].
+    """
+    data = np.asarray(rr_times, dtype=np.float64)
+    # Смещение к нулю уменьшает потерю точности в накопленных суммах
+    offset = data.mean()
+    shifted = data - offset
+
+    cumsum = np.concatenate(([0.0], np.cumsum(shifted)))
+    cumsum_sq = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    sums = cumsum[window:] - cumsum[:-window]
+    sums_sq = cumsum_sq[window:] - cumsum_sq[:-window]
+
+    means = sums / window
+    variances = np.maximum(sums_sq / window - means * means, 0.0)
+    stds = np.sqrt(variances)
+
+    # Скользящие максимум и минимум за O(n); центр окна i находится в i + window // 2
+    center = window // 2
+    last = len(data) - window + 1
+    maxima = maximum_filter1d(shifted, size=window)[center:center + last]
+    minima = minimum_filter1d(shifted, size=window)[center:center + last]
+
+    # Постоянное окно: СКО строго равно нулю, выбросов нет
+    constant = maxima == minima
+    stds[constant] = 0.0
+    means[constant] = maxima[constant]
+
+    # Допуск на погрешность округления при сравнении с порогом
+    tolerance = 1e-9 * (np.abs(shifted).max() + 1.0)
+    deviation = np.maximum(maxima - means, means - minima)
+    has_outlier = deviation > OUTLIER_SIGMA * stds + tolerance
+    has_outlier[constant] = False
+
+    return means + offset, stds, has_outlier
+
+
+@instrumented()
+def rank_epochs(rr_times, cycle_count, top_k=5, non_overlapping=True, min_cycles=MIN_EPOCH_CYCLES):
+    """
+    Поиск top_k наиболее ровных эпох из cycle_count кардиоциклов без выбросов.
+    Эпохи упорядочены по возрастанию СКО. При non_overlapping=True
+    выбранные эпохи не пересекаются между собой.
+    Возвращает список кортежей (начало, конец включительно, СКО).
+    """
+    signal_length = len(rr_times)
+    if cycle_count < min_cycles or cycle_count > signal_length:
+        raise ValueError(
+            f"Количество кардиоциклов должно быть не менее {min_cycles} и не более длины сигнала."
+        )
+
+    _, stds, has_outlier = rolling_window_stats(rr_times, cycle_count)
+    candidates = np.flatnonzero(~has_outlier)
+    # Устойчивая сортировка: при равном СКО выигрывает более раннее окно
+    order = candidates[np.argsort(stds[candidates], kind="stable")]
+
+    if not non_overlapping:
+        selected = order[:top_k]
+    else:
+        taken = np.zeros(len(stds), dtype=bool)
+        selected = []
+        for start in order:
+            if len(selected) >= top_k:
+                break
+            if taken[start]:
+                continue
+            selected.append(start)
+            # Окна, пересекающиеся с выбранным, исключаются
+            taken[max(0, start - cycle_count + 1):start + cycle_count] = True
+
+    return [(int(start), int(start) + cycle_count - 1, float(stds[start])) for start in selected]
+
+
+@instrumented()
+def find_flattest_epoch(rr_times, cycle_count, min_cycles=MIN_EPOCH_CYCLES):
+    """
+    Автоматический выбор наиболее ровного участка сигнала:
+    окно из cycle_count кардиоциклов с минимальным СКО и без выбросов (> 3σ).
+    Если все окна содержат выбросы, выбирается начало сигнала.
+    Возвращает (начало, конец) эпохи, конец включительно.
+    """
+    epochs = rank_epochs(rr_times, cycle_count, top_k=1, non_overlapping=False, min_cycles=min_cycles)
+    best_start_index = epochs[0][0] if epochs else 0
+    return best_start_index, best_start_index + cycle_count - 1
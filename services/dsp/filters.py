@@ -0,0 +1,214 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from scipy.signal import butter, cheby1, iirnotch, sosfiltfilt, tf2sos
+
+from services.instrumentation import instrumented
+
+
+# Частота дискретизации по умолчанию
+DEFAULT_FS = 200
+
+# Возможные значения частоты среза для ФНЧ Баттерворта
+LOWPASS_CUTOFFS = [50, 55, 60, 0.5]
+
+# Параметры для ФНЧ Чебышева
+CHEBYSHEV_PARAMS = [
+    {"cutoff": 0.4, "order": 2, "ripple": 0.5},
+    {"cutoff": 50, "order": 2, "ripple": 0.3},
+    {"cutoff": 0.2, "order": 2, "ripple": 0.1},
+]
+
+# Параметры ФВЧ и режекторного фильтра
+HIGHPASS_CUTOFF = 0.05
+NOTCH_FREQUENCY = 50
+
+# Наибольшая длина сигналов, при которой оба канала фильтруются одним вызовом
+# по двумерному массиву; на более длинных сигналах быстрее фильтровать каналы
+# по отдельности (см. benchmarks/filters_benchmark.py)
+STACKED_FILTER_MAX_SIZE = 40_000
+
+
+@dataclass
+class FilterConfig:
+    """
+    Набор фильтров, применяемых к сигналам.
+    Повторяет состояние чекбоксов FilterSelectionWidget.
+    """
+    lowpass: Optional[float] = None  # Частота среза ФНЧ Баттерворта
+    chebyshev_params: Optional[dict] = None  # Параметры ФНЧ Чебышева
+    highpass: bool = False
+    notch: bool = False
+    center: bool = False
+
+    @classmethod
+    def from_state(cls, state):
+        """Создание конфигурации из словаря состояния фильтров."""
+        state = state or {}
+        return cls(
+            lowpass=state.get("lowpass"),
+            chebyshev_params=state.get("chebyshev_params"),
+            highpass=bool(state.get("highpass", False)),
+            notch=bool(state.get("notch", False)),
+            center=bool(state.get("center", False)),
+        )
+
+    def to_state(self):
+        """Преобразование конфигурации в словарь состояния фильтров."""
+        return {
+            "lowpass": self.lowpass,
+            "chebyshev_params": self.chebyshev_params,
+            "highpass": self.highpass,
+            "notch": self.notch,
+            "center": self.center,
+        }
+
+
+@lru_cache(maxsize=64)
+def design_filter(kind, order, cutoff, fs, ripple=None):
+    """
+    Расчет коэффициентов фильтра в виде секций второго порядка (SOS).
+    Результат кэшируется по (kind, order, cutoff, fs, ripple), поэтому
+    повторное применение тех же фильтров не пересчитывает их.
+    kind: "lowpass" (Баттерворт), "chebyshev", "highpass" (Баттерворт), "notch".
+    Для режекторного фильтра order задает добротность (quality factor).
+    """
+    nyquist = 0.5 * fs
+    normal_cutoff = cutoff / nyquist
+
+    if kind == "lowpass":
+        sos = butter(order, normal_cutoff, btype='low', analog=False, output='sos')
+    elif kind == "chebyshev":
+        sos = cheby1(order, ripple, normal_cutoff, btype='low', analog=False, output='sos')
+    elif kind == "highpass":
+        sos = butter(order, normal_cutoff, btype='high', analog=False, output='sos')
+    elif kind == "notch":
+        b, a = iirnotch(normal_cutoff, order)
+        sos = tf2sos(b, a)
+    else:
+        raise ValueError(f"Неизвестный тип фильтра: {kind}")
+
+    # Кэшированный массив общий для всех вызовов, поэтому запрещаем его изменение
+    sos.setflags(write=False)
+    return sos
+
+
+def _sosfiltfilt(sos, data):
+    """
+    Двунаправленная фильтрация по последней оси.
+    scipy требует записываемый массив коэффициентов, поэтому кэшированные
+    секции копируются (несколько десятков чисел).
+    """
+    return sosfiltfilt(np.array(sos), data, axis=-1)
+
+
+def apply_lowpass_filter(data, cutoff, fs, order=1):
+    """
+    Применение ФНЧ Баттерворта.
+    Формула: H(s) = 1 / (s^2 + s * (w_c / Q) + w_c^2),
+    где w_c = 2 * pi * cutoff — угловая частота среза.
+    Реализация через scipy.signal.butter.
+    """
+    return _sosfiltfilt(design_filter("lowpass", order, cutoff, fs), data)
+
+
+def chebyshev_lowpass_filter(data, cutoff, fs, order, ripple):
+    """
+    Реализация ФНЧ Чебышева.
+    """
+    return _sosfiltfilt(design_filter("chebyshev", order, cutoff, fs, ripple), data)
+
+
+def apply_highpass_filter(data, cutoff, fs, order=4):
+    """
+    Применение ФВЧ Баттерворта.
+    Формула: H(s) = s^2 / (s^2 + s * (w_c / Q) + w_c^2),
+    где w_c = 2 * pi * cutoff — угловая частота среза.
+    Реализация через scipy.signal.butter.
+    """
+    return _sosfiltfilt(design_filter("highpass", order, cutoff, fs), data)
+
+
+def apply_notch_filter(data, notch_freq, fs, quality_factor=30):
+    """
+    Применение режекторного фильтра.
+    Формула: H(s) = (s^2 + w_0^2) / (s^2 + s * (w_0 / Q) + w_0^2),
+    где w_0 = 2 * pi * notch_freq — угловая частота режекции.
+    Реализация через scipy.signal.iirnotch.
+    """
+    return _sosfiltfilt(design_filter("notch", quality_factor, notch_freq, fs), data)
+
+
+def center_signals(rr_times, amplitudes):
+    """
+    Центрирование данных: RR-интервалы нормируются (z-оценка),
+    из амплитуд дыхания вычитается среднее.
+    """
+    rr_times = (rr_times - np.mean(rr_times)) / np.std(rr_times)
+    amplitudes = amplitudes - np.mean(amplitudes)
+    return rr_times, amplitudes
+
+
+def filter_chain(config: FilterConfig, fs=DEFAULT_FS):
+    """
+    Список SOS-фильтров, соответствующих конфигурации, в порядке применения:
+    ФНЧ (Баттерворта или Чебышева) → ФВЧ → режекторный.
+    """
+    chain = []
+    if config.lowpass is not None:
+        chain.append(design_filter("lowpass", 1, config.lowpass, fs))
+    elif config.chebyshev_params is not None:
+        params = config.chebyshev_params
+        chain.append(design_filter("chebyshev", params["order"], params["cutoff"], fs, params["ripple"]))
+    if config.highpass:
+        chain.append(design_filter("highpass", 4, HIGHPASS_CUTOFF, fs))
+    if config.notch:
+        chain.append(design_filter("notch", 30, NOTCH_FREQUENCY, fs))
+    return chain
+
+
+@instrumented()
+def apply_filters(rr_times, amplitudes, config: FilterConfig, fs=DEFAULT_FS):
+    """
+    Применение набора фильтров к RR-интервалам и амплитудам дыхания.
+    Порядок: ФНЧ (Баттерворта или Чебышева) → ФВЧ → режекторный → центрирование.
+    Коэффициенты фильтров берутся из кэша design_filter. Сигналы одинаковой
+    длины (до STACKED_FILTER_MAX_SIZE отсчетов) фильтруются одним вызовом
+    sosfiltfilt по двумерному массиву (по строке на канал).
+    """
+    rr_times = np.asarray(rr_times, dtype=np.float64)
+    amplitudes = np.asarray(amplitudes, dtype=np.float64)
+
+    chain = filter_chain(config, fs)
+    if chain:
+        if rr_times.shape == amplitudes.shape and rr_times.size <= STACKED_FILTER_MAX_SIZE:
+            channels = np.stack([rr_times, amplitudes])
+            for sos in chain:
+                channels = _sosfiltfilt(sos, channels)
+            rr_times, amplitudes = channels[0], channels[1]
+        else:
+            for sos in chain:
+                rr_times = _sosfiltfilt(sos, rr_times)
+                amplitudes = _sosfiltfilt(sos, amplitudes)
+
+    if config.center:
+        rr_times, amplitudes = center_signals(rr_times, amplitudes)
+
+    return rr_times, amplitudes
+
+
+@instrumented()
+def crop_signals(rr_times, amplitudes, start_index, end_index):
+    """
+    Удаление артефактов: обрезка сигналов по индексам [start_index, end_index).
+    """
+    if start_index < 0 or end_index < 0:
+        raise ValueError("Индексы должны быть неотрицательными.")
+    if end_index <= start_index:
+        raise ValueError("Конечный индекс должен быть больше начального.")
+    if start_index >= len(rr_times) or end_index > len(rr_times):
+        raise ValueError("Индексы выходят за пределы длины сигнала.")
+
+    return rr_times[start_index:end_index], amplitudes[start_index:end_index]
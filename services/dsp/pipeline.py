@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
+
+from services.dsp.epochs import find_flattest_epoch, validate_epoch
+from services.dsp.filters import DEFAULT_FS, FilterConfig, apply_filters, crop_signals
+from services.dsp.resampling import DEFAULT_INTERPOLATION_STEP, beat_times, interpolate_series
+from services.dsp.statistics import SignalStatistics, compute_statistics
+from services.instrumentation import instrumented
+
+
+@dataclass
+class EpochConfig:
+    """
+    Выбор эпохи: вручную по индексам (start, end включительно)
+    или автоматически по количеству кардиоциклов (cycle_count).
+    """
+    start: Optional[int] = None
+    end: Optional[int] = None
+    cycle_count: Optional[int] = None
+
+    def select(self, rr_times):
+        """Возвращает границы эпохи (начало, конец включительно)."""
+        if self.start is not None and self.end is not None:
+            return validate_epoch(self.start, self.end, len(rr_times))
+        if self.cycle_count is not None:
+            return find_flattest_epoch(rr_times, self.cycle_count)
+        raise ValueError("Не заданы ни границы эпохи, ни количество кардиоциклов.")
+
+
+@dataclass
+class PipelineResult:
+    """Результаты всех этапов обработки."""
+    rr_times: np.ndarray  # Обработанные RR-интервалы (после обрезки и фильтров)
+    amplitudes: np.ndarray  # Обработанные амплитуды дыхания
+    statistics: Optional[SignalStatistics] = None
+    epoch: Optional[Tuple[int, int]] = None  # Границы эпохи, конец включительно
+    time_grid: Optional[np.ndarray] = None  # Временная сетка итоговых рядов
+    series_rr: Optional[np.ndarray] = None  # Итоговый ряд RRi
+    series_pg: Optional[np.ndarray] = None  # Итоговый ряд dUi
+
+
+@dataclass
+class SignalPipeline:
+    """
+    Декларативное описание обработки сигналов сеанса.
+    Этапы: удаление артефактов → фильтры → статистики → выбор эпохи → временные ряды.
+    Работает только с массивами NumPy и не зависит от Qt и matplotlib.
+    """
+    filters: FilterConfig = field(default_factory=FilterConfig)
+    crop: Optional[Tuple[int, int]] = None  # Удаление артефактов: [start, end)
+    epoch: Optional[EpochConfig] = None
+    interpolate: bool = False
+    interpolation_step: float = DEFAULT_INTERPOLATION_STEP
+    fs: float = DEFAULT_FS
+    compute_stats: bool = True
+
+    @instrumented()
+    def run(self, rr_times, amplitudes):
+        """Выполнение всех этапов обработки."""
+        raw_rr_times = np.asarray(rr_times, dtype=np.float64)
+        raw_amplitudes = np.asarray(amplitudes, dtype=np.float64)
+
+        rr, amp = raw_rr_times, raw_amplitudes
+        if self.crop is not None:
+            rr, amp = crop_signals(rr, amp, *self.crop)
+
+        rr, amp = apply_filters(rr, amp, self.filters, fs=self.fs)
+        result = PipelineResult(rr_times=rr, amplitudes=amp)
+
+        if self.compute_stats:
+            result.statistics = compute_statistics(raw_rr_times, raw_amplitudes, rr, amp)
+
+        # Без эпохи временные ряды формируются по всему обработанному сигналу
+        if self.epoch is not None:
+            start, end = self.epoch.select(rr)
+            result.epoch = (start, end)
+            rr, amp = rr[start:end], amp[start:end]
+
+        if self.interpolate:
+            result.time_grid, result.series_rr, result.series_pg = interpolate_series(
+                rr, amp, step=self.interpolation_step
+            )
+        else:
+            result.time_grid = beat_times(rr)
+            result.series_rr, result.series_pg = rr, amp
+        return result
+
+    def to_dict(self):
+        """Преобразование конфигурации в словарь (например, для сохранения в JSON)."""
+        return {
+            "filters": self.filters.to_state(),
+            "crop": list(self.crop) if self.crop is not None else None,
+            "epoch": {
+                "start": self.epoch.start,
+                "end": self.epoch.end,
+                "cycle_count": self.epoch.cycle_count,
+            } if self.epoch is not None else None,
+            "interpolate": self.interpolate,
+            "interpolation_step": self.interpolation_step,
+            "fs": self.fs,
+        }
+
+    @classmethod
+    def from_dict(cls, config):
+        """Создание конфигурации из словаря."""
+        crop = config.get("crop")
+        epoch = config.get("epoch")
+        return cls(
+            filters=FilterConfig.from_state(config.get("filters")),
+            crop=tuple(crop) if crop is not None else None,
+            epoch=EpochConfig(**epoch) if epoch is not None else None,
+            interpolate=bool(config.get("interpolate", False)),
+            interpolation_step=config.get("interpolation_step", DEFAULT_INTERPOLATION_STEP),
+            fs=config.get("fs", DEFAULT_FS),
+        )
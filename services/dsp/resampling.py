@@ -0,0 +1,29 @@
+import numpy as np
+from scipy.interpolate import interp1d
+
+from services.instrumentation import instrumented
+
+
+# Шаг интерполяции по умолчанию, с
+DEFAULT_INTERPOLATION_STEP = 0.1
+
+
+def beat_times(rr_times):
+    """Моменты времени R-зубцов (накопленная сумма RR-интервалов)."""
+    return np.cumsum(np.asarray(rr_times, dtype=np.float64))
+
+
+@instrumented()
+def interpolate_series(rr_times, amplitudes, step=DEFAULT_INTERPOLATION_STEP):
+    """
+    Линейная интерполяция RR-интервалов и амплитуд дыхания
+    на равномерную временную сетку с шагом step.
+    Возвращает (сетка, RR-интервалы, амплитуды).
+    """
+    time_series_raw = beat_times(rr_times)
+    new_time = np.arange(time_series_raw[0], time_series_raw[-1], step)
+
+    interp_func_rr = interp1d(time_series_raw, rr_times, kind='linear', fill_value="extrapolate")
+    interp_func_pg = interp1d(time_series_raw, amplitudes, kind='linear', fill_value="extrapolate")
+
+    return new_time, interp_func_rr(new_time), interp_func_pg(new_time)
@@ -0,0 +1,197 @@
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+
+import numpy as np
+from scipy.fft import next_fast_len, rfft, rfftfreq
+from scipy.integrate import trapezoid
+from scipy.signal import welch
+from scipy.signal.windows import dpss
+
+from services.dsp.resampling import DEFAULT_INTERPOLATION_STEP, beat_times
+from services.instrumentation import instrumented
+
+
+# Количество спектров в кэше
+SPECTRUM_CACHE_SIZE = 32
+
+# Длина сегмента метода Уэлча по умолчанию, отсчетов
+WELCH_SEGMENT = 256
+
+# Полуширина полосы (NW) многооконного метода по умолчанию
+MULTITAPER_NW = 4.0
+
+# Частотные диапазоны вариабельности сердечного ритма, Гц: [начало, конец)
+HRV_BANDS = {
+    "vlf": (0.0033, 0.04),
+    "lf": (0.04, 0.15),
+    "hf": (0.15, 0.4),
+}
+
+# Длина сегмента Уэлча для ВСР, с (период нижней границы диапазона VLF)
+HRV_SEGMENT_SECONDS = 300
+
+
+_spectrum_cache = OrderedDict()
+_spectrum_cache_lock = threading.Lock()
+
+
+def _data_key(data):
+    """Массив float64 и ключ его содержимого (форма и хэш байтов)."""
+    data = np.ascontiguousarray(data, dtype=np.float64)
+    digest = hashlib.blake2b(data.view(np.uint8), digest_size=16).digest()
+    return data, (data.shape, digest)
+
+
+def cached_spectrum(func):
+    """
+    Кэширование результата оценки спектра по содержимому массива и параметрам.
+    Одинаковые данные (в том числе в другом массиве) не пересчитываются;
+    возвращаемые массивы доступны только для чтения, так как разделяются между вызовами.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(data, *args, **kwargs):
+        data, data_key = _data_key(data)
+        bound = signature.bind(data, *args, **kwargs)
+        bound.apply_defaults()
+        params = tuple((name, value) for name, value in bound.arguments.items() if name != "data")
+        key = (func.__name__, data_key, params)
+
+        with _spectrum_cache_lock:
+            result = _spectrum_cache.get(key)
+            if result is not None:
+                _spectrum_cache.move_to_end(key)
+                return result
+
+        # Расчет вне блокировки: параллельные расчеты разных сигналов не ждут друг друга
+        result = func(*bound.args, **bound.kwargs)
+        for array in result:
+            array.setflags(write=False)
+
+        with _spectrum_cache_lock:
+            _spectrum_cache[key] = result
+            if len(_spectrum_cache) > SPECTRUM_CACHE_SIZE:
+                _spectrum_cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+def clear_spectrum_cache():
+    """Очистка кэша спектров."""
+    with _spectrum_cache_lock:
+        _spectrum_cache.clear()
+
+
+@instrumented()
+@cached_spectrum
+def compute_spectrum(data, fs=1.0):
+    """
+    Амплитудный спектр сигнала (положительные частоты, Гц).
+    БПФ действительного сигнала выполняется по длине, дополненной нулями
+    до ближайшей быстрой (next_fast_len).
+    """
+    n = len(data)  # Длина сигнала
+    nfft = next_fast_len(n, real=True)
+    spectrum = np.abs(rfft(data, nfft)) / n  # Нормализованный спектр
+    freqs = rfftfreq(nfft, d=1 / fs)  # Частоты
+    return freqs, spectrum
+
+
+@instrumented()
+@cached_spectrum
+def welch_psd(data, fs=1.0, nperseg=WELCH_SEGMENT):
+    """
+    Спектральная плотность мощности методом Уэлча
+    (окно Ханна, перекрытие сегментов 50%, удаление среднего).
+    """
+    nperseg = min(nperseg, len(data))
+    return welch(data, fs=fs, nperseg=nperseg, nfft=next_fast_len(nperseg, real=True), detrend="constant")
+
+
+@lru_cache(maxsize=8)
+def _dpss_tapers(n, nw, n_tapers):
+    """Окна Слепяна (DPSS) единичной энергии; повторно не рассчитываются."""
+    tapers = dpss(n, nw, Kmax=n_tapers, norm=2)
+    tapers.setflags(write=False)
+    return tapers
+
+
+@instrumented()
+@cached_spectrum
+def multitaper_psd(data, fs=1.0, nw=MULTITAPER_NW, n_tapers=None):
+    """
+    Спектральная плотность мощности многооконным методом (Томсона):
+    среднее периодограмм сигнала с n_tapers окнами Слепяна (по умолчанию 2*NW - 1).
+    """
+    n = len(data)
+    if n_tapers is None:
+        n_tapers = max(int(2 * nw) - 1, 1)
+    nfft = next_fast_len(n, real=True)
+    centered = data - data.mean()
+
+    # Окна обрабатываются по одному: память O(n) при любом количестве окон
+    psd = np.zeros(nfft // 2 + 1)
+    for taper in _dpss_tapers(n, nw, n_tapers):
+        psd += np.abs(rfft(centered * taper, nfft)) ** 2
+    psd /= n_tapers * fs
+
+    # Односторонний спектр: мощность отрицательных частот добавляется к положительным
+    psd[1:(nfft + 1) // 2] *= 2
+    return rfftfreq(nfft, d=1 / fs), psd
+
+
+def band_powers(freqs, psd, bands=HRV_BANDS):
+    """Мощность сигнала в частотных диапазонах (интеграл СПМ по диапазону)."""
+    powers = {}
+    for name, (low, high) in bands.items():
+        mask = (freqs >= low) & (freqs < high)
+        powers[name] = float(trapezoid(psd[mask], freqs[mask])) if mask.sum() > 1 else 0.0
+    return powers
+
+
+@dataclass
+class HrvBandPowers:
+    """Спектральные показатели вариабельности сердечного ритма, с²."""
+    vlf: float  # Очень низкие частоты
+    lf: float  # Низкие частоты
+    hf: float  # Высокие частоты
+
+    @property
+    def total(self):
+        return self.vlf + self.lf + self.hf
+
+    @property
+    def lf_hf(self):
+        """Отношение LF/HF (nan при нулевой мощности HF)."""
+        return self.lf / self.hf if self.hf > 0 else float("nan")
+
+
+@instrumented()
+def hrv_band_powers(rr_times, step=DEFAULT_INTERPOLATION_STEP, method="welch"):
+    """
+    Мощности диапазонов VLF/LF/HF по RR-интервалам (с).
+    Ряд RR-интервалов интерполируется на равномерную сетку с шагом step,
+    СПМ оценивается методом Уэлча ("welch") или многооконным ("multitaper").
+    """
+    rr_times = np.asarray(rr_times, dtype=np.float64)
+    if rr_times.size < 2:
+        raise ValueError("Для спектрального анализа ВСР нужно не менее двух RR-интервалов.")
+
+    times = beat_times(rr_times)
+    grid = np.arange(times[0], times[-1], step)
+    tachogram = np.interp(grid, times, rr_times)
+    fs = 1 / step
+
+    if method == "welch":
+        freqs, psd = welch_psd(tachogram, fs=fs, nperseg=int(HRV_SEGMENT_SECONDS * fs))
+    elif method == "multitaper":
+        freqs, psd = multitaper_psd(tachogram, fs=fs)
+    else:
+        raise ValueError(f"Неизвестный метод оценки спектра: {method}")
+    return HrvBandPowers(**band_powers(freqs, psd))
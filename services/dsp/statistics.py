@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.stats import f
+
+from services.instrumentation import instrumented
+
+
+@dataclass
+class SignalStatistics:
+    """Статистики связи RR-интервалов и амплитуд дыхания."""
+    corr_raw: float  # Корреляция исходных данных
+    corr_processed: float  # Корреляция обработанных данных
+    correlation_ratio: float  # Корреляционное отношение
+    linearity_value: float  # Расчетное значение критерия Блекмана
+    is_linear: bool  # Признак линейной связи
+    fisher: float  # Критерий Фишера
+
+
+def correlation(x, y):
+    """Коэффициент корреляции Пирсона."""
+    return np.corrcoef(x, y)[0, 1]
+
+
+def calculate_correlation_ratio(rr_times, amplitudes, bins=16):
+    """Вычисление корреляционного отношения."""
+    J = len(rr_times)
+    Rcpv = np.mean(rr_times)  # Общее среднее RR-интервалов
+
+    # Разделение данных на группы (классы)
+    NKL, bin_edges = np.histogram(amplitudes, bins=bins)
+    cpR = np.histogram(amplitudes, bins=bins, weights=rr_times)[0] / NKL
+
+    # Вычисление межгрупповой дисперсии
+    DRmgr = np.sum(NKL * (cpR - Rcpv) ** 2) / J
+
+    # Вычисление общей дисперсии
+    DR = np.var(rr_times)
+
+    # Корреляционное отношение
+    return np.sqrt(DRmgr / DR)
+
+
+def check_linearity(rr_times, amplitudes, alpha=0.05):
+    """
+    Проверка линейности связи по критерию Блекмана.
+    Возвращает расчетное значение и признак линейной связи.
+    """
+    J = len(rr_times)
+    r = correlation(rr_times, amplitudes)
+    Vrasch = J * (r ** 2)
+
+    # Критическое значение F-распределения
+    critical_value = f.ppf(1 - alpha, 1, J - 2)
+    return Vrasch, bool(Vrasch >= critical_value)
+
+
+def fisher_test(rr_times, amplitudes):
+    """Критерий Фишера для проверки значимости корреляции."""
+    J = len(rr_times)
+    r = correlation(rr_times, amplitudes)
+    return (J - 2) * (r ** 2) / (1 - r ** 2)
+
+
+@instrumented()
+def compute_statistics(raw_rr_times, raw_amplitudes, rr_times, amplitudes):
+    """Расчет всех статистик для исходных и обработанных сигналов."""
+    linearity_value, is_linear = check_linearity(rr_times, amplitudes)
+    return SignalStatistics(
+        corr_raw=correlation(raw_rr_times, raw_amplitudes),
+        corr_processed=correlation(rr_times, amplitudes),
+        correlation_ratio=calculate_correlation_ratio(rr_times, amplitudes),
+        linearity_value=linearity_value,
+        is_linear=is_linear,
+        fisher=fisher_test(rr_times, amplitudes),
+    )
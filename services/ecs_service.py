@@ -1,9 +1,11 @@
 from sqlalchemy import text
-from sqlalchemy.orm import Session, joinedload
-from database.models import ECS_data, Sessions
+from sqlalchemy.orm import Session
+from database.models import ECS_data, Sessions, Patient, Doctor
+from services.instrumentation import instrumented
 
 
 # Создание новой записи ECS_data
+@instrumented()
 def create_ecs_data(db: Session, session_id: int, rr_length: int, rr_time: float = None):
     """
     Создание новой записи ECS_data.
@@ -26,65 +28,87 @@ def create_ecs_data(db: Session, session_id: int, rr_length: int, rr_time: float
     return new_ecs_data
 
 
+# Запрос записей ECS_data только с отображаемыми столбцами
+def _ecs_data_details_query(db: Session):
+    """
+    Один запрос с явными соединениями вместо загрузки связанных объектов.
+    """
+    return (
+        db.query(
+            ECS_data.ecsdataid,
+            Sessions.session_date,
+            Sessions.session_starttime,
+            Sessions.session_endtime,
+            Patient.patient_fio,
+            Doctor.doctor_fio,
+            ECS_data.rr_length,
+            ECS_data.rr_time,
+        )
+        .outerjoin(Sessions, ECS_data.sessionid == Sessions.sessionid)
+        .outerjoin(Patient, Sessions.patientid == Patient.patientid)
+        .outerjoin(Doctor, Sessions.doctorid == Doctor.doctorid)
+    )
+
+
 # Получение всех записей ECS_data с заменой внешних ключей на читаемые значения
+@instrumented()
 def get_ecs_data_with_details(db: Session, skip: int = 0):
     """
     Получение всех записей ECS_data с заменой sessionid на детали сессии.
     """
-    ecs_data_list = (
-        db.query(ECS_data)
-        .options(joinedload(ECS_data.session))
-        .offset(skip)
-        .all()
+    rows = _ecs_data_details_query(db).order_by(ECS_data.ecsdataid).offset(skip).all()
+    return [row._mapping for row in rows]
+
+
+# Потоковое получение всех записей ECS_data
+def iter_ecs_data_with_details(db: Session, chunk_size: int = 10000):
+    """
+    Генератор пакетов записей ECS_data с деталями сессии (по chunk_size строк).
+    Использует серверный курсор (yield_per), поэтому в памяти
+    находится только текущий пакет, а не вся таблица.
+    """
+    stmt = (
+        _ecs_data_details_query(db)
+        .order_by(ECS_data.ecsdataid)
+        .statement.execution_options(yield_per=chunk_size)
     )
+    for partition in db.execute(stmt).mappings().partitions():
+        yield partition
 
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "ecsdataid": ecs_data.ecsdataid,
-            "session_date": ecs_data.session.session_date if ecs_data.session else None,
-            "session_starttime": ecs_data.session.session_starttime if ecs_data.session else None,
-            "session_endtime": ecs_data.session.session_endtime if ecs_data.session else None,
-            "patient_fio": ecs_data.session.patient.patient_fio if ecs_data.session and ecs_data.session.patient else None,
-            "doctor_fio": ecs_data.session.doctor.doctor_fio if ecs_data.session and ecs_data.session.doctor else None,
-            "rr_length": ecs_data.rr_length,
-            "rr_time": ecs_data.rr_time,
-        }
-        for ecs_data in ecs_data_list
-    ]
-    return result
+
+# Постраничное получение записей ECS_data
+@instrumented()
+def get_ecs_data_page(db: Session, after_id: int = None, limit: int = 500, patient_fio: str = None):
+    """
+    Получение очередной страницы записей ECS_data по ключу (ecsdataid > after_id).
+    Фильтрация по ФИО пациента выполняется на стороне сервера.
+    """
+    query = _ecs_data_details_query(db)
+    if after_id is not None:
+        query = query.filter(ECS_data.ecsdataid > after_id)
+    if patient_fio:
+        query = query.filter(Patient.patient_fio == patient_fio)
+    rows = query.order_by(ECS_data.ecsdataid).limit(limit).all()
+    return [row._mapping for row in rows]
 
 
 # Получение данных ECS_data по ID сессии
+@instrumented()
 def get_ecs_data_by_session_id(db: Session, session_id: int):
     """
     Получение данных ECS_data по ID сессии с заменой sessionid на детали сессии.
     """
-    ecs_data_list = (
-        db.query(ECS_data)
-        .options(joinedload(ECS_data.session))
+    rows = (
+        _ecs_data_details_query(db)
         .filter(ECS_data.sessionid == session_id)
+        .order_by(ECS_data.ecsdataid)
         .all()
     )
-
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "ecsdataid": ecs_data.ecsdataid,
-            "session_date": ecs_data.session.session_date if ecs_data.session else None,
-            "session_starttime": ecs_data.session.session_starttime if ecs_data.session else None,
-            "session_endtime": ecs_data.session.session_endtime if ecs_data.session else None,
-            "patient_fio": ecs_data.session.patient.patient_fio if ecs_data.session and ecs_data.session.patient else None,
-            "doctor_fio": ecs_data.session.doctor.doctor_fio if ecs_data.session and ecs_data.session.doctor else None,
-            "rr_length": ecs_data.rr_length,
-            "rr_time": ecs_data.rr_time,
-        }
-        for ecs_data in ecs_data_list
-    ]
-    return result
+    return [row._mapping for row in rows]
 
 
 # Обновление данных ECS_data
+@instrumented()
 def update_ecs_data(db: Session, ecsdataid: int, rr_length: int = None, rr_time: float = None):
     """
     Обновление данных ECS_data.
@@ -105,6 +129,7 @@ def update_ecs_data(db: Session, ecsdataid: int, rr_length: int = None, rr_time:
 
 
 # Удаление данных ECS_data
+@instrumented()
 def delete_ecs_data(db: Session, ecsdataid: int):
     """
     Удаление данных ECS_data.
@@ -118,15 +143,20 @@ def delete_ecs_data(db: Session, ecsdataid: int):
     return {"message": f"Запись ECS_data с ID {ecsdataid} успешно удалена"}
 
 
+@instrumented()
 def delete_ecs_data_by_session_id(db: Session, session_id: int):
     """
-    Удаление всех данных ECS_data для указанного сеанса.
+    Удаление всех данных ECS_data для указанного сеанса одной командой DELETE
+    (записи не загружаются в сессию).
     """
-    ecs_data = db.query(ECS_data).filter(ECS_data.sessionid == session_id).all()
-    if not ecs_data:
+    deleted = (
+        db.query(ECS_data)
+        .filter(ECS_data.sessionid == session_id)
+        .delete(synchronize_session=False)
+    )
+    if not deleted:
+        db.rollback()
         raise ValueError(f"Нет данных ECS_data для сеанса с ID {session_id}")
 
-    for data in ecs_data:
-        db.delete(data)
     db.commit()
-    return {"message": f"Все данные ECS_data для сеанса с ID {session_id} успешно удалены"}
+    return {"message": f"Все данные ECS_data для сеанса с ID {session_id} успешно удалены", "deleted": deleted}
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from database.models import Equipment, Laboratory
+from services.instrumentation import instrumented
 
 
 # Создание нового оборудования
+@instrumented()
 def create_equipment(
     db: Session,
     equipment_name: str,
@@ -35,6 +37,7 @@ def create_equipment(
 
 
 # Получение всех записей оборудования с деталями
+@instrumented()
 def get_all_equipment_with_details(db: Session, skip: int = 0, limit: int = 100):
     """
     Получение всех записей оборудования с заменой labid на название лаборатории.
@@ -61,6 +64,7 @@ def get_all_equipment_with_details(db: Session, skip: int = 0, limit: int = 100)
 
 
 # Получение информации о конкретном оборудовании
+@instrumented()
 def get_equipment_by_id(db: Session, equipment_id: int):
     """
     Получение информации о конкретном оборудовании с заменой labid на название лаборатории.
@@ -83,6 +87,7 @@ def get_equipment_by_id(db: Session, equipment_id: int):
 
 
 # Обновление данных оборудования
+@instrumented()
 def update_equipment(
     db: Session,
     equipment_id: int,
@@ -114,6 +119,7 @@ def update_equipment(
 
 
 # Удаление оборудования
+@instrumented()
 def delete_equipment(db: Session, equipment_id: int):
     """
     Удаление оборудования.
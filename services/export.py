@@ -0,0 +1,206 @@
+"""
+Потоковая выгрузка архива сигналов в файлы CSV или Parquet.
+
+Данные читаются через серверный курсор пакетами по --chunk-size строк
+и сразу записываются в файл, поэтому потребление памяти не зависит
+от размера архива.
+
+Пример запуска:
+    python -m services.export --user researcher --output-dir export \\
+        --source ecs --source pg --source analysis_series --format parquet
+
+Для формата parquet требуется пакет pyarrow.
+"""
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+
+from database.session import add_credentials_arguments, authenticate_user, dispose_all_engines, get_cli_password
+from services.analysis_service import iter_analysis_results_with_details, iter_analysis_series
+from services.ecs_service import iter_ecs_data_with_details
+from services.instrumentation import instrumented
+from services.pg_service import iter_pg_data_with_details
+from services.signal_service import iter_ecs_chunks, iter_pg_chunks
+
+
+def _rows_to_columns(batches):
+    """Преобразование пакетов строк в словари {столбец: список значений}."""
+    for batch in batches:
+        if batch:
+            yield {key: [row[key] for row in batch] for key in batch[0].keys()}
+
+
+def _series_to_columns(records):
+    """Преобразование записей analysis_series в длинный формат (строка на отсчет)."""
+    for record in records:
+        size = record["processed_ecs_data"].size
+        yield {
+            "sessionid": np.full(size, record["sessionid"], dtype=np.int64),
+            "sample_index": np.arange(size, dtype=np.int64),
+            # Записи могут храниться в float32 и float64; в файле столбец всегда float64
+            "processed_ecs_data": record["processed_ecs_data"].astype(np.float64),
+            "processed_pg_data": record["processed_pg_data"].astype(np.float64),
+        }
+
+
+# Источники выгрузки: функция (db, chunk_size) -> генератор словарей столбцов
+SOURCES = {
+    "ecs": lambda db, chunk_size: iter_ecs_chunks(db, chunk_size),
+    "pg": lambda db, chunk_size: iter_pg_chunks(db, chunk_size),
+    "ecs_details": lambda db, chunk_size: _rows_to_columns(iter_ecs_data_with_details(db, chunk_size)),
+    "pg_details": lambda db, chunk_size: _rows_to_columns(iter_pg_data_with_details(db, chunk_size)),
+    "analysis_results": lambda db, chunk_size: _rows_to_columns(iter_analysis_results_with_details(db, chunk_size)),
+    "analysis_series": lambda db, chunk_size: _series_to_columns(iter_analysis_series(db)),
+}
+
+FORMATS = ("csv", "parquet")
+
+# Наибольшее количество строк, накапливаемых до открытия файла Parquet,
+# пока тип части столбцов не определен (во всех строках None)
+PARQUET_SCHEMA_ROWS = 1_000_000
+
+
+def _write_csv(chunks, path):
+    """Запись пакетов в CSV; заголовок берется из первого пакета."""
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as output:
+        writer = csv.writer(output)
+        header = None
+        for chunk in chunks:
+            if header is None:
+                header = list(chunk.keys())
+                writer.writerow(header)
+            columns = [
+                chunk[key].tolist() if isinstance(chunk[key], np.ndarray) else chunk[key]
+                for key in header
+            ]
+            writer.writerows(zip(*columns))
+            rows += len(columns[0])
+    return rows
+
+
+def _parquet_schema(pa, schemas, final=False):
+    """
+    Общая схема пакетов: столбцы типа null принимают тип из других пакетов,
+    целые и float32 расширяются (pa.unify_schemas). Если final и тип столбца так и
+    не определен, столбец записывается строками: в них приводится любой тип.
+    """
+    schema = pa.unify_schemas(schemas, promote_options="permissive")
+    if final:
+        for index, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                schema = schema.set(index, field.with_type(pa.string()))
+    return schema
+
+
+def _write_parquet(chunks, path):
+    """
+    Запись пакетов в Parquet: каждый пакет становится отдельной группой строк.
+    Схема файла строится по пакетам, а не только по первому: пока у части столбцов
+    нет ни одного значения, пакеты накапливаются (не более PARQUET_SCHEMA_ROWS строк).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Для выгрузки в Parquet установите пакет pyarrow")
+
+    rows = 0
+    writer = None
+    pending = []  # Пакеты, прочитанные до открытия файла
+
+    def write(table):
+        schema = pa.unify_schemas([writer.schema, table.schema], promote_options="permissive")
+        if not schema.equals(writer.schema):
+            raise ValueError(f"Типы столбцов пакета не совпадают со схемой файла: {table.schema}")
+        writer.write_table(table.cast(writer.schema))
+
+    try:
+        for chunk in chunks:
+            table = pa.table(chunk)
+            rows += table.num_rows
+            if writer is not None:
+                write(table)
+                continue
+
+            pending.append(table)
+            schema = _parquet_schema(pa, [table.schema for table in pending])
+            if any(pa.types.is_null(field.type) for field in schema) and rows < PARQUET_SCHEMA_ROWS:
+                continue
+            writer = pq.ParquetWriter(path, _parquet_schema(pa, [schema], final=True))
+            for table in pending:
+                write(table)
+            pending = []
+
+        if pending:
+            writer = pq.ParquetWriter(path, _parquet_schema(pa, [table.schema for table in pending], final=True))
+            for table in pending:
+                write(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+@instrumented()
+def export_source(db, source, path, fmt="csv", chunk_size=100000):
+    """
+    Потоковая выгрузка одного источника в файл.
+    Возвращает количество записанных строк.
+    """
+    if source not in SOURCES:
+        raise ValueError(f"Неизвестный источник выгрузки: {source}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат выгрузки: {fmt}")
+
+    chunks = SOURCES[source](db, chunk_size)
+    if fmt == "csv":
+        return _write_csv(chunks, path)
+    return _write_parquet(chunks, path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Потоковая выгрузка архива сигналов")
+    add_credentials_arguments(parser)
+    parser.add_argument("--output-dir", required=True, help="Каталог для файлов выгрузки")
+    parser.add_argument(
+        "--source", choices=sorted(SOURCES), action="append",
+        help="Что выгружать (можно указать несколько раз; по умолчанию ecs, pg и analysis_series)",
+    )
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="Формат файлов")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="Размер пакета, строк")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.chunk_size < 1:
+        raise SystemExit("Размер пакета должен быть не меньше 1")
+    sources = args.source or ["ecs", "pg", "analysis_series"]
+
+    password = get_cli_password(args)
+    db = authenticate_user(args.user, password)
+    if db is None:
+        raise SystemExit("Не удалось подключиться к базе данных")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    try:
+        for source in sources:
+            path = os.path.join(args.output_dir, f"{source}.{args.format}")
+            started = time.perf_counter()
+            try:
+                rows = export_source(db, source, path, fmt=args.format, chunk_size=args.chunk_size)
+            except ValueError as e:
+                raise SystemExit(str(e))
+            elapsed = time.perf_counter() - started
+            print(f"{source}: {rows} строк → {path} ({elapsed:.2f} с)")
+    finally:
+        db.close()
+        dispose_all_engines()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+import io
+import mmap
+import os
+import time
+import warnings
+
+import numpy as np
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+from database.models import ECS_data, PG_data, Sessions
+from services.instrumentation import instrumented
+
+
+# Размер фрагмента файла, читаемого за один раз, байт
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Длительность одного отсчета RR-интервала, с (как в calculate_rr_duration_for_session)
+RR_TIME_STEP = 5.0 / 1000
+
+# Амплитуда = round((D1 * 256 + D2) * 2.45 / 2^10, 3) (как в calculate_amplitude_for_session)
+AMPLITUDE_NUMERATOR = 245
+AMPLITUDE_DENOMINATOR = 100 * 2 ** 10
+
+
+# Расчет длительности RR-интервалов
+def compute_rr_time(rr_length):
+    """
+    Длительность RR-интервалов в секундах по их длине в отсчетах.
+    """
+    return np.asarray(rr_length, dtype=np.float64) * RR_TIME_STEP
+
+
+# Расчет амплитуды сигнала дыхания
+def compute_amplitude(d1, d2):
+    """
+    Амплитуда сигнала дыхания по старшему и младшему байтам отсчета.
+    Округление до 3 знаков выполняется в целых числах (половина — от нуля),
+    поэтому результат совпадает с ROUND(NUMERIC, 3) на сервере.
+    """
+    code = np.asarray(d1, dtype=np.int64) * 256 + np.asarray(d2, dtype=np.int64)
+    scaled = np.abs(code) * AMPLITUDE_NUMERATOR * 1000
+    thousandths = (2 * scaled + AMPLITUDE_DENOMINATOR) // (2 * AMPLITUDE_DENOMINATOR)
+    return np.sign(code) * thousandths / 1000
+
+
+# Поиск первой некорректной строки фрагмента
+def _find_invalid_line(text: str, first_line: int):
+    """
+    Медленный построчный разбор фрагмента, используется только для сообщения об ошибке.
+    """
+    for number, line in enumerate(text.split("\n"), start=first_line):
+        try:
+            int(line)
+        except ValueError:
+            return number, line.strip()
+    return None, None
+
+
+# Векторный разбор текста фрагмента
+def _parse_text(text: str):
+    """
+    Разбор текста по одному целому числу на строку одним вызовом NumPy.
+    Возвращает None, если количество чисел не совпадает с количеством строк
+    (пустые строки, строки с несколькими числами или нечисловые данные).
+    """
+    try:
+        with warnings.catch_warnings():
+            # При нечисловых данных NumPy выдает предупреждение и обрезает результат
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(text, dtype=np.int64, sep="\n")
+    except (ValueError, DeprecationWarning):
+        return None
+    return values if values.size == text.count("\n") + 1 else None
+
+
+# Разбор фрагмента файла в массив целых чисел
+def _parse_chunk(chunk: bytes, first_line: int) -> np.ndarray:
+    """
+    Векторный разбор фрагмента (по одному целому числу на строку).
+    Количество разобранных чисел сверяется с количеством строк,
+    поэтому пустые строки и строки с несколькими числами считаются ошибкой.
+    """
+    try:
+        text = chunk.decode("ascii")
+    except UnicodeDecodeError:
+        raise ValueError(f"Файл содержит недопустимые символы (строки начиная с {first_line})")
+
+    values = _parse_text(text)
+    if values is None:
+        number, line = _find_invalid_line(text, first_line)
+        raise ValueError(f"Строка {number}: ожидалось целое число, получено '{line}'")
+    return values
+
+
+# Разбор фрагмента файла с пропуском некорректных строк
+def _parse_chunk_lenient(chunk: bytes):
+    """
+    Разбор фрагмента без исключений: возвращает (значения, маска корректных строк).
+    Некорректные строки (не целое число, пустые, недопустимые символы) получают
+    значение 0 и False в маске, поэтому нумерация строк не сдвигается.
+    Построчный разбор выполняется только для фрагментов с ошибками.
+    """
+    text = chunk.decode("ascii", errors="replace")
+    values = _parse_text(text)
+    if values is not None:
+        return values, np.ones(values.size, dtype=bool)
+
+    lines = text.split("\n")
+    values = np.zeros(len(lines), dtype=np.int64)
+    valid = np.zeros(len(lines), dtype=bool)
+    for index, line in enumerate(lines):
+        try:
+            values[index] = int(line)
+            valid[index] = True
+        except ValueError:
+            pass
+    return values, valid
+
+
+# Потоковое чтение файла сигналов
+def iter_signal_file(
+    path: str,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    progress=None,
+    stats=None,
+    skip_invalid: bool = False,
+):
+    """
+    Генератор пакетов (d1, d2, rr_length) из файла сигналов.
+    Формат файла: тройки строк D1, D2, RR_Length (как в import_data_from_file);
+    неполная последняя тройка отбрасывается.
+    Файл отображается в память и разбирается фрагментами по chunk_bytes,
+    поэтому его размер не ограничен объемом оперативной памяти.
+    progress(обработано байт, всего байт) вызывается после каждого фрагмента.
+    Некорректная строка вызывает ValueError; при skip_invalid=True вместо этого
+    отбрасывается вся тройка, в которую она входит (выравнивание троек сохраняется).
+    Если передан словарь stats, в него записываются количество строк (lines),
+    отброшенных строк неполной тройки (skipped_lines) и всех отброшенных строк,
+    включая неполную тройку (rejected_lines).
+    """
+    if stats is not None:
+        stats.update(lines=0, skipped_lines=0, rejected_lines=0)
+    total = os.path.getsize(path)
+    if total == 0:
+        return
+
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # Завершающие пустые строки не образуют отсчетов (как и на сервере)
+        end = total
+        while end > 0 and data[end - 1:end] in (b"\n", b"\r", b" ", b"\t"):
+            end -= 1
+        position, line_number, rejected = 0, 1, 0
+        carry = np.empty(0, dtype=np.int64)
+        carry_valid = np.empty(0, dtype=bool)
+
+        while position < end:
+            # Фрагмент заканчивается на границе строки
+            stop = min(position + chunk_bytes, end)
+            if stop < end:
+                newline = data.find(b"\n", stop, end)
+                stop = end if newline == -1 else newline
+            chunk = data[position:stop]
+
+            if skip_invalid:
+                values, valid = _parse_chunk_lenient(chunk)
+            else:
+                values = _parse_chunk(chunk, line_number)
+                valid = None
+            line_number += values.size
+            position = stop + 1
+
+            values = np.concatenate([carry, values]) if carry.size else values
+            if valid is not None:
+                valid = np.concatenate([carry_valid, valid]) if carry_valid.size else valid
+            complete = values.size - values.size % 3
+            carry = values[complete:]
+            if valid is not None:
+                carry_valid = valid[complete:]
+            if complete:
+                triples = values[:complete].reshape(-1, 3)
+                if valid is not None:
+                    keep = valid[:complete].reshape(-1, 3).all(axis=1)
+                    rejected += 3 * int(keep.size - np.count_nonzero(keep))
+                    triples = triples[keep]
+                if len(triples):
+                    yield triples[:, 0], triples[:, 1], triples[:, 2]
+
+            if progress is not None:
+                progress(min(position, total), total)
+
+        if stats is not None:
+            stats.update(
+                lines=line_number - 1,
+                skipped_lines=int(carry.size),
+                rejected_lines=rejected + int(carry.size),
+            )
+
+
+# Проверка значений пакета
+def _range_checks(d1, d2, rr_length):
+    """
+    Проверки диапазонов значений: байты отсчета ПГ 0..255, длина RR-интервала больше нуля.
+    Возвращает список (маска некорректных отсчетов, сообщение).
+    """
+    return [
+        ((d1 < 0) | (d1 > 255), "D1 должно быть в диапазоне 0..255"),
+        ((d2 < 0) | (d2 > 255), "D2 должно быть в диапазоне 0..255"),
+        (rr_length <= 0, "длина RR-интервала должна быть больше нуля"),
+    ]
+
+
+def _validate_batch(d1, d2, rr_length, first_triple: int):
+    """
+    Проверка диапазонов значений пакета; первая ошибка вызывает ValueError.
+    """
+    for invalid, message in _range_checks(d1, d2, rr_length):
+        if invalid.any():
+            index = int(np.argmax(invalid))
+            raise ValueError(f"Отсчет {first_triple + index}: {message}")
+
+
+def _valid_triples(d1, d2, rr_length):
+    """Маска отсчетов пакета, прошедших проверку диапазонов."""
+    valid = np.ones(d1.size, dtype=bool)
+    for invalid, _ in _range_checks(d1, d2, rr_length):
+        valid &= ~invalid
+    return valid
+
+
+# Запись пакета командой COPY
+def _copy_rows(cursor, table: str, columns, rows: np.ndarray, fmt):
+    """
+    Передача пакета на сервер одной командой COPY FROM STDIN (формат CSV).
+    """
+    buffer = io.StringIO()
+    np.savetxt(buffer, rows, fmt=fmt, delimiter=",")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+# Запись пакета многострочной вставкой
+def _insert_rows(db: Session, session_id: int, d1, d2, rr_length, rr_time, amplitude):
+    """
+    Запасной вариант для драйверов без COPY: многострочная вставка (executemany).
+    """
+    db.execute(insert(PG_data), [
+        {"sessionid": session_id, "d1": a, "d2": b, "amplitude": amp}
+        for a, b, amp in zip(d1.tolist(), d2.tolist(), amplitude.tolist())
+    ])
+    db.execute(insert(ECS_data), [
+        {"sessionid": session_id, "rr_length": length, "rr_time": duration}
+        for length, duration in zip(rr_length.tolist(), rr_time.tolist())
+    ])
+
+
+# Импорт файла сигналов в таблицы ECS_data и PG_data
+@instrumented()
+def import_signal_file(
+    db: Session,
+    session_id: int,
+    path: str,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    progress=None,
+    replace: bool = False,
+    skip_invalid: bool = False,
+):
+    """
+    Клиентский импорт файла сигналов для сеанса одной транзакцией.
+    Файл разбирается по частям, RR_Time и Amplitude рассчитываются на клиенте,
+    пакеты передаются командой COPY (psycopg2) или многострочной вставкой.
+    При replace=True прежние сигналы сеанса удаляются в той же транзакции,
+    поэтому при ошибке импорта они сохраняются.
+    По умолчанию первая некорректная строка или значение вне диапазона
+    отменяет импорт файла; при skip_invalid=True такие тройки отбрасываются.
+    Возвращает словарь с количеством отсчетов, удаленных записей ЭКС и ПГ,
+    отброшенных строк неполной тройки (skipped_lines), всех отброшенных строк
+    (rejected_lines), размером файла и временем выполнения.
+    """
+    if not db.query(Sessions.sessionid).filter(Sessions.sessionid == session_id).first():
+        raise ValueError(f"Сессия с ID {session_id} не найдена")
+    if not os.path.exists(path):
+        raise ValueError(f"Файл {path} не найден")
+
+    started = time.perf_counter()
+    dbapi_connection = db.connection().connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    use_copy = hasattr(cursor, "copy_expert")
+
+    rows = 0
+    deleted_ecs = deleted_pg = 0
+    out_of_range = 0
+    stats = {}
+    try:
+        if replace:
+            # Удаление одной командой на таблицу, без загрузки записей в сессию
+            deleted_ecs = db.execute(delete(ECS_data).where(ECS_data.sessionid == session_id)).rowcount
+            deleted_pg = db.execute(delete(PG_data).where(PG_data.sessionid == session_id)).rowcount
+
+        for d1, d2, rr_length in iter_signal_file(path, chunk_bytes, progress, stats, skip_invalid):
+            if skip_invalid:
+                valid = _valid_triples(d1, d2, rr_length)
+                if not valid.all():
+                    out_of_range += int(valid.size - np.count_nonzero(valid))
+                    d1, d2, rr_length = d1[valid], d2[valid], rr_length[valid]
+                    if not d1.size:
+                        continue
+            else:
+                _validate_batch(d1, d2, rr_length, rows + 1)
+            rr_time = compute_rr_time(rr_length)
+            amplitude = compute_amplitude(d1, d2)
+
+            if use_copy:
+                session_ids = np.full(d1.size, session_id, dtype=np.int64)
+                _copy_rows(
+                    cursor, PG_data.__tablename__, ("sessionid", "d1", "d2", "amplitude"),
+                    np.column_stack([session_ids, d1, d2, amplitude]), ("%d", "%d", "%d", "%.3f"),
+                )
+                _copy_rows(
+                    cursor, ECS_data.__tablename__, ("sessionid", "rr_length", "rr_time"),
+                    np.column_stack([session_ids, rr_length, rr_time]), ("%d", "%d", "%.17g"),
+                )
+            else:
+                _insert_rows(db, session_id, d1, d2, rr_length, rr_time, amplitude)
+            rows += d1.size
+
+        if replace and not rows:
+            raise ValueError("Файл не содержит отсчетов, прежние данные сеанса сохранены")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return {
+        "rows": rows,
+        "deleted_ecs": deleted_ecs,
+        "deleted_pg": deleted_pg,
+        "skipped_lines": stats["skipped_lines"],
+        "rejected_lines": stats["rejected_lines"] + 3 * out_of_range,
+        "bytes": os.path.getsize(path),
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+# Перезапись сигналов сеанса данными из файла
+@instrumented()
+def replace_session_signals(
+    db: Session,
+    session_id: int,
+    path: str,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    progress=None,
+    skip_invalid: bool = False,
+):
+    """
+    Замена сигналов сеанса: удаление прежних записей ECS_data и PG_data
+    и загрузка файла выполняются одной транзакцией.
+    """
+    return import_signal_file(db, session_id, path, chunk_bytes, progress, replace=True, skip_invalid=skip_invalid)
@@ -0,0 +1,257 @@
+"""
+Замеры времени выполнения сервисных функций и этапов обработки сигналов.
+Для каждой функции накапливаются количество вызовов, время, количество
+возвращенных строк и SQL-запросов; по последним WINDOW_SIZE вызовам строятся
+процентили и гистограмма длительностей.
+
+Замеряемые функции отмечаются декоратором @instrumented() в месте определения:
+точки входа сервисов и этапы обработки сигналов (services.dsp). Внутренние
+поэлементные функции и main утилит командной строки не замеряются.
+install() включает запись замеров и подсчет SQL-запросов; до этого обертки
+сразу вызывают исходную функцию. Модуль использует только стандартную
+библиотеку, SQLAlchemy подключается в install().
+Замеры доступны через snapshot() и dump_json(), в интерфейсе — на вкладке
+"Диагностика" главного окна.
+Переменные окружения:
+    BIOSIGNALS_INSTRUMENTATION=0 — не устанавливать замеры;
+    BIOSIGNALS_METRICS_FILE=<путь> — сохранить замеры в JSON при завершении программы.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import wraps
+
+
+# Количество последних вызовов, по которым считаются процентили и гистограмма
+WINDOW_SIZE = 1000
+
+# Верхние границы интервалов гистограммы длительностей, мс (последний интервал не ограничен)
+HISTOGRAM_BOUNDS_MS = [1, 3, 10, 30, 100, 300, 1000, 3000, 10000]
+
+# Ключи словарей-результатов, содержащие количество обработанных строк
+ROW_COUNT_KEYS = ("rows", "inserted", "deleted")
+
+
+class Metric:
+    """Накопленные замеры одной функции."""
+
+    def __init__(self, name, window=WINDOW_SIZE):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.total_rows = 0
+        self.total_statements = 0
+        self.samples = deque(maxlen=window)  # Последние вызовы: (время, строки, SQL-запросы)
+
+    def record(self, duration, rows, statements, failed=False):
+        self.calls += 1
+        self.errors += failed
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.total_rows += rows or 0
+        self.total_statements += statements
+        self.samples.append((duration, rows, statements))
+
+    def snapshot(self):
+        """Сводка замеров (время в миллисекундах)."""
+        durations = sorted(sample[0] * 1000 for sample in self.samples)
+        histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        bound_index = 0
+        for duration in durations:
+            while bound_index < len(HISTOGRAM_BOUNDS_MS) and duration > HISTOGRAM_BOUNDS_MS[bound_index]:
+                bound_index += 1
+            histogram[bound_index] += 1
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": self.total_time * 1000,
+            "mean_ms": self.total_time * 1000 / self.calls if self.calls else 0.0,
+            "max_ms": self.max_time * 1000,
+            "p50_ms": _percentile(durations, 50),
+            "p95_ms": _percentile(durations, 95),
+            "p99_ms": _percentile(durations, 99),
+            "rows": self.total_rows,
+            "statements": self.total_statements,
+            "statements_per_call": self.total_statements / self.calls if self.calls else 0.0,
+            "histogram": dict(zip([f"<={bound}" for bound in HISTOGRAM_BOUNDS_MS] + ["inf"], histogram)),
+        }
+
+
+def _percentile(sorted_values, percent):
+    """Процентиль упорядоченной выборки (ближайший ранг)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[rank]
+
+
+_metrics = {}
+_lock = threading.Lock()
+_local = threading.local()  # Счетчик SQL-запросов текущего потока
+_enabled = False  # Записывают ли обертки @instrumented замеры
+_action_context = None  # profile_action профилировщика SQL (после install)
+
+
+def _count_statement(*args):
+    _local.statements = getattr(_local, "statements", 0) + 1
+
+
+def statement_count():
+    """Количество SQL-запросов, выполненных текущим потоком после установки замеров."""
+    return getattr(_local, "statements", 0)
+
+
+def count_rows(result):
+    """
+    Количество строк в результате функции: длина списка или массива;
+    для кортежа — длина первого элемента, имеющего длину (например, (rr_times, amplitudes));
+    для словаря — значение ключа rows, inserted или deleted. None, если определить нельзя.
+    """
+    if isinstance(result, dict):
+        for key in ROW_COUNT_KEYS:
+            if isinstance(result.get(key), int):
+                return result[key]
+        return None
+    if isinstance(result, tuple):
+        result = next((item for item in result if _sized(item)), None)
+    return len(result) if _sized(result) else None
+
+
+def _sized(value):
+    if isinstance(value, (str, bytes, dict)) or not hasattr(value, "__len__"):
+        return False
+    try:
+        len(value)  # У нульмерных массивов NumPy длины нет
+    except TypeError:
+        return False
+    return True
+
+
+def record(name, duration, rows=None, statements=0, failed=False):
+    """Запись одного замера функции name."""
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = Metric(name)
+        metric.record(duration, rows, statements, failed)
+
+
+class Measurement:
+    """Текущий замер; rows можно задать внутри блока measure."""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+
+
+@contextmanager
+def measure(name):
+    """
+    Замер времени и количества SQL-запросов блока кода.
+    При включенном профилировщике SQL запросы блока относятся к действию name.
+    """
+    measurement = Measurement(name)
+    statements = statement_count()
+    start = time.perf_counter()
+    failed = False
+    try:
+        with _action_context(name) if _action_context is not None else nullcontext():
+            yield measurement
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        record(name, time.perf_counter() - start, measurement.rows, statement_count() - statements, failed)
+
+
+def instrumented(name=None):
+    """
+    Декоратор замера функции; количество строк определяется по результату (count_rows).
+    Пока замеры не установлены (install), обертка сразу вызывает функцию.
+    """
+    def decorator(func):
+        metric_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with measure(metric_name) as measurement:
+                result = func(*args, **kwargs)
+                measurement.rows = count_rows(result)
+                return result
+
+        wrapper.instrumented = True
+        return wrapper
+    return decorator
+
+
+def is_installed():
+    return _enabled
+
+
+def install():
+    """
+    Установка замеров: включение записи в обертках @instrumented
+    и подсчета SQL-запросов. Повторный вызов ничего не делает.
+    """
+    global _enabled, _action_context
+    if _enabled or os.environ.get("BIOSIGNALS_INSTRUMENTATION") == "0":
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from database.session import profile_action
+
+    event.listen(Engine, "before_cursor_execute", _count_statement)
+    _action_context = profile_action
+    _enabled = True
+
+    metrics_file = os.environ.get("BIOSIGNALS_METRICS_FILE")
+    if metrics_file:
+        atexit.register(dump_json, metrics_file)
+
+
+def uninstall():
+    """Отключение замеров (накопленные замеры сохраняются)."""
+    global _enabled, _action_context
+    if not _enabled:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    _enabled = False
+    _action_context = None
+    if event.contains(Engine, "before_cursor_execute", _count_statement):
+        event.remove(Engine, "before_cursor_execute", _count_statement)
+
+
+def snapshot():
+    """Сводка всех замеров: {имя функции: сводка Metric.snapshot()}."""
+    with _lock:
+        return {name: metric.snapshot() for name, metric in sorted(_metrics.items())}
+
+
+def reset():
+    """Сброс накопленных замеров."""
+    with _lock:
+        _metrics.clear()
+
+
+def dump_json(path):
+    """Сохранение сводки замеров в JSON-файл."""
+    data = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "pid": os.getpid(),
+        "metrics": snapshot(),
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from database.models import Laboratory, Polyclinic
+from services.instrumentation import instrumented
 
 
 # Создание новой лаборатории
+@instrumented()
 def create_laboratory(
     db: Session,
     lab_name: str,
@@ -34,6 +36,7 @@ def create_laboratory(
 
 
 # Получение всех записей лабораторий с деталями
+@instrumented()
 def get_all_laboratories_with_details(db: Session, skip: int = 0, limit: int = 100):
     """
     Получение всех записей лабораторий с заменой polyclinicid на название поликлиники.
@@ -60,6 +63,7 @@ def get_all_laboratories_with_details(db: Session, skip: int = 0, limit: int = 1
 
 
 # Получение информации о конкретной лаборатории
+@instrumented()
 def get_laboratory_by_id(db: Session, lab_id: int):
     """
     Получение информации о конкретной лаборатории с заменой polyclinicid на название поликлиники.
@@ -82,6 +86,7 @@ def get_laboratory_by_id(db: Session, lab_id: int):
 
 
 # Обновление данных лаборатории
+@instrumented()
 def update_laboratory(
     db: Session,
     lab_id: int,
@@ -116,6 +121,7 @@ def update_laboratory(
 
 
 # Удаление лаборатории
+@instrumented()
 def delete_laboratory(db: Session, lab_id: int):
     """
     Удаление лаборатории.
@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
 from database.models import Patient_activity, Patient, Activity_type
+from services.instrumentation import instrumented
 
 
 # Создание новой записи о виде деятельности пациента
+@instrumented()
 def create_patient_activity(
     db: Session,
     patient_fio: str,  # Вместо patientid
@@ -33,6 +35,7 @@ def create_patient_activity(
 
 
 # Получение всех записей о видах деятельности пациентов с деталями
+@instrumented()
 def get_all_patient_activities_with_details(db: Session, skip: int = 0, limit: int = 100):
     """
     Получение всех записей о видах деятельности пациентов с заменой ID на читаемые значения.
@@ -60,6 +63,7 @@ def get_all_patient_activities_with_details(db: Session, skip: int = 0, limit: i
 
 
 # Получение записей о видах деятельности конкретного пациента
+@instrumented()
 def get_patient_activities_by_fio(db: Session, patient_fio: str):
     """
     Получение записей о видах деятельности конкретного пациента по его ФИО.
@@ -89,6 +93,7 @@ def get_patient_activities_by_fio(db: Session, patient_fio: str):
 
 
 # Обновление данных о виде деятельности пациента
+@instrumented()
 def update_patient_activity(
     db: Session,
     patientactivityid: int,
@@ -123,6 +128,7 @@ def update_patient_activity(
 
 
 # Удаление записи о виде деятельности пациента
+@instrumented()
 def delete_patient_activity(db: Session, patientactivityid: int):
     """
     Удаление записи о виде деятельности пациента.
@@ -2,9 +2,11 @@ from datetime import date
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from database.models import Patient, Polyclinic, Treatment_recommendation, Diagnosis, Chronic_condition, Patient_activity, Activity_type
+from services.instrumentation import instrumented
 
 
 # Создание нового пациента
+@instrumented()
 def create_patient(
     db: Session,
     fio: str,
@@ -39,56 +41,51 @@ def create_patient(
     return new_patient
 
 
-# Получение всех пациентов с деталями
-def get_patients_with_details(db: Session, skip: int = 0):
+# Запрос пациентов только с отображаемыми столбцами
+def _patients_details_query(db: Session):
     """
-    Получение всех пациентов с заменой polyclinicid на название поликлиники.
+    Один запрос с явным соединением вместо загрузки поликлиники для каждого пациента.
     """
-    patients = (
-        db.query(Patient)
+    return (
+        db.query(
+            Patient.patientid,
+            Patient.patient_fio,
+            Patient.patient_birthdate,
+            Patient.patient_address,
+            Patient.patient_phone,
+            Polyclinic.polyclinic_name,
+        )
         .join(Polyclinic, Patient.polyclinicid == Polyclinic.polyclinicid)
-        .offset(skip)
-        .all()
     )
 
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "patientid": patient.patientid,
-            "patient_fio": patient.patient_fio,
-            "patient_birthdate": patient.patient_birthdate,
-            "patient_address": patient.patient_address,
-            "patient_phone": patient.patient_phone,
-            "polyclinic_name": patient.polyclinic.polyclinic_name,
-        }
-        for patient in patients
-    ]
-    return result
+
+# Получение всех пациентов с деталями
+@instrumented()
+def get_patients_with_details(db: Session, skip: int = 0):
+    """
+    Получение всех пациентов с заменой polyclinicid на название поликлиники.
+    """
+    rows = _patients_details_query(db).order_by(Patient.patientid).offset(skip).all()
+    return [row._mapping for row in rows]
 
 
 # Поиск пациентов по ФИО
+@instrumented()
 def search_patients_by_fio(db: Session, fio: str):
     """
     Поиск пациентов по частичному совпадению ФИО.
     """
-    patients = db.query(Patient).filter(Patient.patient_fio.ilike(f"%{fio}%")).all()
-
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "patientid": patient.patientid,
-            "patient_fio": patient.patient_fio,
-            "patient_birthdate": patient.patient_birthdate,
-            "patient_address": patient.patient_address,
-            "patient_phone": patient.patient_phone,
-            "polyclinic_name": patient.polyclinic.polyclinic_name,
-        }
-        for patient in patients
-    ]
-    return result
+    rows = (
+        _patients_details_query(db)
+        .filter(Patient.patient_fio.ilike(f"%{fio}%"))
+        .order_by(Patient.patientid)
+        .all()
+    )
+    return [row._mapping for row in rows]
 
 
 # Обновление данных пациента
+@instrumented()
 def update_patient(
     db: Session,
     patient_id: int,
@@ -129,6 +126,7 @@ def update_patient(
 
 
 # Удаление пациента
+@instrumented()
 def delete_patient(db: Session, patient_id: int):
     """
     Удаление пациента.
@@ -145,6 +143,7 @@ def delete_patient(db: Session, patient_id: int):
 # ==================== Дополнительные функции ====================
 
 
+@instrumented()
 def get_patient_activities_with_details(db: Session, patient_id: int):
     """
     Получить список активностей для конкретного пациента с заменой activitytypeid на название вида деятельности.
@@ -167,6 +166,7 @@ def get_patient_activities_with_details(db: Session, patient_id: int):
     return result
 
 
+@instrumented()
 def get_patient_chronic_conditions_with_details(db: Session, patient_id: int):
     """
     Получить список хронических заболеваний для конкретного пациента.
@@ -189,6 +189,7 @@ def get_patient_chronic_conditions_with_details(db: Session, patient_id: int):
     return result
 
 
+@instrumented()
 def get_patient_treatment_recommendations_with_details(db: Session, patient_id: int):
     """
     Получить список рекомендаций по лечению для конкретного пациента.
@@ -211,6 +212,7 @@ def get_patient_treatment_recommendations_with_details(db: Session, patient_id:
     return result
 
 
+@instrumented()
 def get_patient_full_details(db: Session, patient_id: int):
     """
     Получить полную информацию о пациенте, включая активности, хронические заболевания и рекомендации по лечению.
@@ -1,9 +1,11 @@
 from sqlalchemy import text
-from sqlalchemy.orm import Session, joinedload
-from database.models import PG_data, Sessions
+from sqlalchemy.orm import Session
+from database.models import PG_data, Sessions, Patient, Doctor
+from services.instrumentation import instrumented
 
 
 # Создание новой записи PG_data
+@instrumented()
 def create_pg_data(db: Session, session_id: int, d1: int, d2: int, amplitude: float = None):
     """
     Создание новой записи PG_data.
@@ -26,67 +28,88 @@ def create_pg_data(db: Session, session_id: int, d1: int, d2: int, amplitude: fl
     return new_pg_data
 
 
+# Запрос записей PG_data только с отображаемыми столбцами
+def _pg_data_details_query(db: Session):
+    """
+    Один запрос с явными соединениями вместо загрузки связанных объектов.
+    """
+    return (
+        db.query(
+            PG_data.pgdataid,
+            Sessions.session_date,
+            Sessions.session_starttime,
+            Sessions.session_endtime,
+            Patient.patient_fio,
+            Doctor.doctor_fio,
+            PG_data.d1,
+            PG_data.d2,
+            PG_data.amplitude,
+        )
+        .outerjoin(Sessions, PG_data.sessionid == Sessions.sessionid)
+        .outerjoin(Patient, Sessions.patientid == Patient.patientid)
+        .outerjoin(Doctor, Sessions.doctorid == Doctor.doctorid)
+    )
+
+
 # Получение всех записей PG_data с заменой внешних ключей на читаемые значения
+@instrumented()
 def get_pg_data_with_details(db: Session, skip: int = 0):
     """
     Получение всех записей PG_data с заменой sessionid на детали сессии.
     """
-    pg_data_list = (
-        db.query(PG_data)
-        .options(joinedload(PG_data.session))
-        .offset(skip)
-        .all()
+    rows = _pg_data_details_query(db).order_by(PG_data.pgdataid).offset(skip).all()
+    return [row._mapping for row in rows]
+
+
+# Потоковое получение всех записей PG_data
+def iter_pg_data_with_details(db: Session, chunk_size: int = 10000):
+    """
+    Генератор пакетов записей PG_data с деталями сессии (по chunk_size строк).
+    Использует серверный курсор (yield_per), поэтому в памяти
+    находится только текущий пакет, а не вся таблица.
+    """
+    stmt = (
+        _pg_data_details_query(db)
+        .order_by(PG_data.pgdataid)
+        .statement.execution_options(yield_per=chunk_size)
     )
+    for partition in db.execute(stmt).mappings().partitions():
+        yield partition
 
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "pgdataid": pg_data.pgdataid,
-            "session_date": pg_data.session.session_date if pg_data.session else None,
-            "session_starttime": pg_data.session.session_starttime if pg_data.session else None,
-            "session_endtime": pg_data.session.session_endtime if pg_data.session else None,
-            "patient_fio": pg_data.session.patient.patient_fio if pg_data.session and pg_data.session.patient else None,
-            "doctor_fio": pg_data.session.doctor.doctor_fio if pg_data.session and pg_data.session.doctor else None,
-            "d1": pg_data.d1,
-            "d2": pg_data.d2,
-            "amplitude": pg_data.amplitude,
-        }
-        for pg_data in pg_data_list
-    ]
-    return result
+
+# Постраничное получение записей PG_data
+@instrumented()
+def get_pg_data_page(db: Session, after_id: int = None, limit: int = 500, patient_fio: str = None):
+    """
+    Получение очередной страницы записей PG_data по ключу (pgdataid > after_id).
+    Фильтрация по ФИО пациента выполняется на стороне сервера.
+    """
+    query = _pg_data_details_query(db)
+    if after_id is not None:
+        query = query.filter(PG_data.pgdataid > after_id)
+    if patient_fio:
+        query = query.filter(Patient.patient_fio == patient_fio)
+    rows = query.order_by(PG_data.pgdataid).limit(limit).all()
+    return [row._mapping for row in rows]
 
 
 # Получение данных PG_data по ID сессии
+@instrumented()
 def get_pg_data_by_session_id(db: Session, session_id: int):
     """
     Получение данных PG_data по ID сессии с заменой sessionid на детали сессии.
     """
-    pg_data_list = (
-        db.query(PG_data)
-        .options(joinedload(PG_data.session))
+    rows = (
+        _pg_data_details_query(db)
         .filter(PG_data.sessionid == session_id)
+        .order_by(PG_data.pgdataid)
         .all()
     )
-
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "pgdataid": pg_data.pgdataid,
-            "session_date": pg_data.session.session_date if pg_data.session else None,
-            "session_starttime": pg_data.session.session_starttime if pg_data.session else None,
-            "session_endtime": pg_data.session.session_endtime if pg_data.session else None,
-            "patient_fio": pg_data.session.patient.patient_fio if pg_data.session and pg_data.session.patient else None,
-            "doctor_fio": pg_data.session.doctor.doctor_fio if pg_data.session and pg_data.session.doctor else None,
-            "d1": pg_data.d1,
-            "d2": pg_data.d2,
-            "amplitude": pg_data.amplitude,
-        }
-        for pg_data in pg_data_list
-    ]
-    return result
+    return [row._mapping for row in rows]
 
 
 # Обновление данных PG_data
+@instrumented()
 def update_pg_data(db: Session, pgdataid: int, d1: int = None, d2: int = None, amplitude: float = None):
     """
     Обновление данных PG_data.
@@ -109,6 +132,7 @@ def update_pg_data(db: Session, pgdataid: int, d1: int = None, d2: int = None, a
 
 
 # Удаление данных PG_data
+@instrumented()
 def delete_pg_data(db: Session, pgdataid: int):
     """
     Удаление данных PG_data.
@@ -122,15 +146,20 @@ def delete_pg_data(db: Session, pgdataid: int):
     return {"message": f"Запись PG_data с ID {pgdataid} успешно удалена"}
 
 
+@instrumented()
 def delete_pg_data_by_session_id(db: Session, session_id: int):
     """
-    Удаление всех данных PG_data для указанного сеанса.
+    Удаление всех данных PG_data для указанного сеанса одной командой DELETE
+    (записи не загружаются в сессию).
     """
-    pg_data = db.query(PG_data).filter(PG_data.sessionid == session_id).all()
-    if not pg_data:
+    deleted = (
+        db.query(PG_data)
+        .filter(PG_data.sessionid == session_id)
+        .delete(synchronize_session=False)
+    )
+    if not deleted:
+        db.rollback()
         raise ValueError(f"Нет данных PG_data для сеанса с ID {session_id}")
 
-    for data in pg_data:
-        db.delete(data)
     db.commit()
-    return {"message": f"Все данные PG_data для сеанса с ID {session_id} успешно удалены"}
\ No newline at end of file
+    return {"message": f"Все данные PG_data для сеанса с ID {session_id} успешно удалены", "deleted": deleted}
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from database.models import Polyclinic, Laboratory, Doctor
+from services.instrumentation import instrumented
 
 
 # Создание новой поликлиники
+@instrumented()
 def create_polyclinic(
     db: Session,
     polyclinic_name: str,
@@ -27,6 +29,7 @@ def create_polyclinic(
         raise ValueError(f"Ошибка при создании поликлиники: {str(e)}")
     return new_polyclinic
 
+@instrumented()
 def get_polyclinic_by_name(db: Session, name: str):
     """
     Получение поликлиники по её названию.
@@ -34,6 +37,7 @@ def get_polyclinic_by_name(db: Session, name: str):
     polyclinic = db.query(Polyclinic).filter(Polyclinic.polyclinic_name.ilike(name)).first()
     return polyclinic
 
+@instrumented()
 def get_all_polyclinics_with_details(db: Session, skip: int = 0, limit: int = 100):
     """
     Получение всех поликлиник с заменой polyclinicid на название поликлиники.
@@ -75,6 +79,7 @@ def get_all_polyclinics_with_details(db: Session, skip: int = 0, limit: int = 10
 
 
 # Поиск поликлиник по названию
+@instrumented()
 def search_polyclinics_by_name(db: Session, name: str):
     """
     Поиск поликлиник по частичному совпадению названия.
@@ -97,6 +102,7 @@ def search_polyclinics_by_name(db: Session, name: str):
 
 
 # Обновление данных поликлиники
+@instrumented()
 def update_polyclinic(
     db: Session,
     polyclinic_id: int,
@@ -125,6 +131,7 @@ def update_polyclinic(
 
 
 # Удаление поликлиники
+@instrumented()
 def delete_polyclinic(db: Session, polyclinic_id: int):
     """
     Удаление поликлиники.
@@ -145,6 +152,7 @@ def delete_polyclinic(db: Session, polyclinic_id: int):
 # ==================== Дополнительные функции ====================
 
 
+@instrumented()
 def get_laboratories_in_polyclinic(db: Session, polyclinic_id: int):
     """
     Получить список лабораторий для конкретной поликлиники.
@@ -167,6 +175,7 @@ def get_laboratories_in_polyclinic(db: Session, polyclinic_id: int):
     return result
 
 
+@instrumented()
 def get_doctors_in_polyclinic(db: Session, polyclinic_id: int):
     """
     Получить список врачей для конкретной поликлиники.
@@ -3,9 +3,11 @@ from datetime import date, time
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from database.models import Registration, Patient, Polyclinic
+from services.instrumentation import instrumented
 
 
 # Создание новой записи в регистратуре
+@instrumented()
 def create_registration(
     db: Session,
     patient_fio: str,  # Вместо patientid
@@ -44,6 +46,7 @@ def create_registration(
 
 
 # Получение всех записей в регистратуре с деталями
+@instrumented()
 def get_all_registrations_with_details(db: Session, skip: int = 0, limit: int = 100):
     """
     Получение всех записей в регистратуре с заменой ID на читаемые значения.
@@ -72,6 +75,7 @@ def get_all_registrations_with_details(db: Session, skip: int = 0, limit: int =
 
 
 # Поиск записей в регистратуре по ФИО пациента
+@instrumented()
 def search_registrations_by_patient_fio(db: Session, patient_fio: str):
     """
     Поиск записей в регистратуре по частичному совпадению ФИО пациента.
@@ -98,6 +102,7 @@ def search_registrations_by_patient_fio(db: Session, patient_fio: str):
 
 
 # Обновление данных записи в регистратуре
+@instrumented()
 def update_registration(
     db: Session,
     registration_id: int,
@@ -140,6 +145,7 @@ def update_registration(
 
 
 # Удаление записи в регистратуре
+@instrumented()
 def delete_registration(db: Session, registration_id: int):
     """
     Удаление записи в регистратуре.
@@ -0,0 +1,177 @@
+"""
+Поиск пациентов и врачей по ФИО для поиска по мере ввода.
+
+В PostgreSQL запрос использует триграммные GIN-индексы (pg_trgm):
+находятся и подстроки (ilike), и ФИО с опечатками (оператор %>),
+результаты упорядочиваются по сходству (word_similarity) и ограничиваются
+limit. В других СУБД выполняется поиск подстроки, совпадения с начала
+ФИО выводятся первыми.
+
+Результаты последних запросов хранятся в LRU-кэше; кэш сбрасывается
+при любой записи пациентов или врачей через ORM, а записи других клиентов
+учитываются не позже чем через SEARCH_CACHE_TTL секунд.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import case, event, func
+from sqlalchemy.orm import Session
+
+from database.models import Doctor, Patient, Polyclinic
+from services.instrumentation import instrumented
+
+
+# Количество результатов поиска по умолчанию
+SEARCH_LIMIT = 20
+
+# Количество запросов в кэше
+SEARCH_CACHE_SIZE = 128
+
+# Время жизни результата в кэше, с (изменения, сделанные другими клиентами)
+SEARCH_CACHE_TTL = 30.0
+
+# Минимальная длина запроса для триграммного поиска: более короткие строки не содержат триграмм
+MIN_TRIGRAM_QUERY = 3
+
+
+_search_cache = OrderedDict()  # (вид, база, запрос, limit) → (время, строки)
+_search_cache_lock = threading.Lock()
+
+
+def _normalize_query(query):
+    """Запрос без лишних пробелов."""
+    return " ".join(query.split())
+
+
+def _escape_like(query):
+    """Экранирование символов шаблона LIKE, введенных пользователем."""
+    return query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_query(dialect_name, query, fio_column, id_column):
+    """
+    Условие поиска и порядок результатов для столбца ФИО в СУБД dialect_name.
+    Возвращает (условие, выражения сортировки).
+    """
+    substring = fio_column.ilike(f"%{_escape_like(query)}%", escape="\\")
+    if dialect_name == "postgresql" and len(query) >= MIN_TRIGRAM_QUERY:
+        # Оба условия обслуживаются GIN-индексом gin_trgm_ops
+        condition = substring | fio_column.bool_op("%>")(query)
+        order = [func.word_similarity(query, fio_column).desc(), id_column]
+    else:
+        condition = substring
+        prefix = fio_column.ilike(f"{_escape_like(query)}%", escape="\\")
+        order = [case((prefix, 0), else_=1), id_column]
+    return condition, order
+
+
+def _cached_search(kind, db: Session, query, limit, run):
+    """Результат поиска из кэша или выполнение run(запрос) с сохранением в кэш."""
+    query = _normalize_query(query)
+    # Поиск не зависит от регистра; пароль в str(url) скрыт
+    key = (kind, str(db.get_bind().url), query.casefold(), limit)
+
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < SEARCH_CACHE_TTL:
+            _search_cache.move_to_end(key)
+            return list(entry[1])  # Копия: вызывающий код может сортировать список
+
+    rows = run(query)
+    with _search_cache_lock:
+        _search_cache[key] = (time.monotonic(), tuple(rows))
+        _search_cache.move_to_end(key)
+        if len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+    return rows
+
+
+def clear_search_cache(kind=None):
+    """Очистка кэша поиска: всего или только запросов вида kind ("patient" или "doctor")."""
+    with _search_cache_lock:
+        if kind is None:
+            _search_cache.clear()
+            return
+        for key in [key for key in _search_cache if key[0] == kind]:
+            del _search_cache[key]
+
+
+# Поиск пациентов по ФИО
+@instrumented()
+def search_patients(db: Session, query: str, limit: int = SEARCH_LIMIT):
+    """
+    Поиск пациентов по части ФИО (в PostgreSQL — и с опечатками).
+    Возвращает не более limit пациентов (None — без ограничения) с названием поликлиники,
+    самые похожие — первыми.
+    """
+    if not query or not query.strip():
+        return []
+
+    def run(query):
+        condition, order = _search_query(db.get_bind().dialect.name, query, Patient.patient_fio, Patient.patientid)
+        rows = (
+            db.query(
+                Patient.patientid,
+                Patient.patient_fio,
+                Patient.patient_birthdate,
+                Patient.patient_address,
+                Patient.patient_phone,
+                Polyclinic.polyclinic_name,
+            )
+            .join(Polyclinic, Patient.polyclinicid == Polyclinic.polyclinicid)
+            .filter(condition)
+            .order_by(*order)
+            .limit(limit)
+            .all()
+        )
+        return [row._mapping for row in rows]
+
+    return _cached_search("patient", db, query, limit, run)
+
+
+# Поиск врачей по ФИО
+@instrumented()
+def search_doctors(db: Session, query: str, limit: int = SEARCH_LIMIT):
+    """
+    Поиск врачей по части ФИО (в PostgreSQL — и с опечатками).
+    Возвращает не более limit врачей (None — без ограничения) с названием поликлиники,
+    самые похожие — первыми.
+    """
+    if not query or not query.strip():
+        return []
+
+    def run(query):
+        condition, order = _search_query(db.get_bind().dialect.name, query, Doctor.doctor_fio, Doctor.doctorid)
+        rows = (
+            db.query(
+                Doctor.doctorid,
+                Doctor.doctor_fio,
+                Doctor.doctor_birthdate,
+                Doctor.doctor_specialization,
+                Doctor.doctor_phone,
+                Polyclinic.polyclinic_name,
+            )
+            .join(Polyclinic, Doctor.polyclinicid == Polyclinic.polyclinicid)
+            .filter(condition)
+            .order_by(*order)
+            .limit(limit)
+            .all()
+        )
+        return [row._mapping for row in rows]
+
+    return _cached_search("doctor", db, query, limit, run)
+
+
+def _invalidate_on_write(model, kind):
+    def invalidate(mapper, connection, target):
+        clear_search_cache(kind)
+
+    for event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, event_name, invalidate)
+
+
+# Изменение пациентов и врачей (включая поликлинику) сбрасывает соответствующие запросы
+_invalidate_on_write(Patient, "patient")
+_invalidate_on_write(Doctor, "doctor")
+_invalidate_on_write(Polyclinic, None)
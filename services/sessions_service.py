@@ -1,10 +1,13 @@
 from datetime import date
+from sqlalchemy import func, or_, select, true
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from database.models import Sessions, Patient, Doctor, Laboratory
+from database.models import Sessions, Patient, Doctor, Laboratory, ECS_data, PG_data
+from services.instrumentation import instrumented
 
 
 # Создание нового сеанса
+@instrumented()
 def create_session(
     db: Session,
     session_date: date,
@@ -51,96 +54,164 @@ def create_session(
     return new_session
 
 
-# Получение всех сеансов с деталями
-def get_sessions_with_details(db: Session):
+# Запрос сеансов только с отображаемыми столбцами
+def _sessions_details_query(db: Session):
     """
-    Получение всех сеансов с заменой ID на читаемые значения.
+    Один запрос с явными соединениями вместо загрузки связанных объектов.
     """
-    sessions = (
-        db.query(Sessions)
+    return (
+        db.query(
+            Sessions.sessionid,
+            Sessions.session_date,
+            Sessions.session_starttime,
+            Sessions.session_endtime,
+            Patient.patient_fio,
+            Doctor.doctor_fio,
+            Laboratory.lab_name,
+        )
         .join(Patient, Sessions.patientid == Patient.patientid)
         .join(Doctor, Sessions.doctorid == Doctor.doctorid)
         .join(Laboratory, Sessions.labid == Laboratory.labid)
-        .all()
     )
 
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "sessionid": session.sessionid,
-            "session_date": session.session_date,
-            "session_starttime": session.session_starttime,
-            "session_endtime": session.session_endtime,
-            "patient_fio": session.patient.patient_fio,
-            "doctor_fio": session.doctor.doctor_fio,
-            "lab_name": session.laboratory.lab_name,
-        }
-        for session in sessions
-    ]
-    return result
+
+# Получение всех сеансов с деталями
+@instrumented()
+def get_sessions_with_details(db: Session):
+    """
+    Получение всех сеансов с заменой ID на читаемые значения.
+    """
+    rows = _sessions_details_query(db).order_by(Sessions.sessionid).all()
+    return [row._mapping for row in rows]
+
+
+# Получение деталей одного сеанса
+@instrumented()
+def get_session_details(db: Session, session_id: int):
+    """
+    Получение деталей сеанса одним запросом с заменой ID на читаемые значения.
+    """
+    session = _sessions_details_query(db).filter(Sessions.sessionid == session_id).first()
+    if not session:
+        raise ValueError(f"Сеанс с ID {session_id} не найден")
+    return session._asdict()
 
 
 # Поиск сеансов по дате
+@instrumented()
 def search_sessions_by_date(db: Session, session_date: date):
     """
     Поиск сеансов по дате с заменой ID на читаемые значения.
     """
-    sessions = (
-        db.query(Sessions)
-        .join(Patient, Sessions.patientid == Patient.patientid)
-        .join(Doctor, Sessions.doctorid == Doctor.doctorid)
-        .join(Laboratory, Sessions.labid == Laboratory.labid)
+    rows = (
+        _sessions_details_query(db)
         .filter(Sessions.session_date == session_date)
+        .order_by(Sessions.sessionid)
         .all()
     )
-
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "sessionid": session.sessionid,
-            "session_date": session.session_date,
-            "session_starttime": session.session_starttime,
-            "session_endtime": session.session_endtime,
-            "patient_fio": session.patient.patient_fio,
-            "doctor_fio": session.doctor.doctor_fio,
-            "lab_name": session.laboratory.lab_name,
-        }
-        for session in sessions
-    ]
-    return result
+    return [row._mapping for row in rows]
 
 
 # Поиск сеансов по ФИО пациента
+@instrumented()
 def get_sessions_by_patient_fio(db: Session, fio: str):
     """
     Поиск сеансов по частичному совпадению ФИО пациента с заменой ID на читаемые значения.
     """
-    sessions = (
-        db.query(Sessions)
+    rows = (
+        _sessions_details_query(db)
+        .filter(Patient.patient_fio.ilike(f"%{fio}%"))
+        .order_by(Sessions.sessionid)
+        .all()
+    )
+    return [row._mapping for row in rows]
+
+
+# Отбор сеансов для пакетной обработки
+@instrumented()
+def get_session_ids_for_processing(
+    db: Session,
+    date_from: date = None,
+    date_to: date = None,
+    patient_fio: str = None,
+    lab_name: str = None,
+):
+    """
+    Получение ID сеансов по диапазону дат, ФИО пациента и названию лаборатории.
+    Все условия необязательны и объединяются через И.
+    """
+    query = (
+        db.query(Sessions.sessionid)
         .join(Patient, Sessions.patientid == Patient.patientid)
-        .join(Doctor, Sessions.doctorid == Doctor.doctorid)
         .join(Laboratory, Sessions.labid == Laboratory.labid)
-        .filter(Patient.patient_fio.ilike(f"%{fio}%"))
+    )
+    if date_from is not None:
+        query = query.filter(Sessions.session_date >= date_from)
+    if date_to is not None:
+        query = query.filter(Sessions.session_date <= date_to)
+    if patient_fio:
+        query = query.filter(Patient.patient_fio.ilike(f"%{patient_fio}%"))
+    if lab_name:
+        query = query.filter(Laboratory.lab_name.ilike(lab_name))
+
+    return [row.sessionid for row in query.order_by(Sessions.sessionid).all()]
+
+
+# Сеансы с сигналами для выбора записи
+@instrumented()
+def get_sessions_with_signals(db: Session):
+    """
+    Получение сеансов, для которых есть данные ЭКС или ПГ.
+    Наличие сигналов проверяется через EXISTS по индексам (sessionid, id),
+    поэтому время запроса не зависит от количества отсчетов в архиве.
+    Сводка по сигналам выбранного сеанса загружается отдельно (get_session_signal_summary).
+    """
+    ecs_exists = select(ECS_data.ecsdataid).where(ECS_data.sessionid == Sessions.sessionid).exists()
+    pg_exists = select(PG_data.pgdataid).where(PG_data.sessionid == Sessions.sessionid).exists()
+    rows = (
+        _sessions_details_query(db)
+        .filter(or_(ecs_exists, pg_exists))
+        .order_by(Sessions.session_date, Sessions.session_starttime, Sessions.sessionid)
         .all()
     )
+    return [row._mapping for row in rows]
 
-    # Формируем результат с заменой внешних ключей
-    result = [
-        {
-            "sessionid": session.sessionid,
-            "session_date": session.session_date,
-            "session_starttime": session.session_starttime,
-            "session_endtime": session.session_endtime,
-            "patient_fio": session.patient.patient_fio,
-            "doctor_fio": session.doctor.doctor_fio,
-            "lab_name": session.laboratory.lab_name,
-        }
-        for session in sessions
-    ]
-    return result
+
+# Сводка по сигналам одного сеанса
+@instrumented()
+def get_session_signal_summary(db: Session, session_id: int):
+    """
+    Сводка по сигналам сеанса: количество отсчетов, длительность записи
+    (сумма RR-интервалов, с), минимум и максимум RR-интервалов и амплитуд.
+    Агрегаты считаются одним запросом только по отсчетам этого сеанса, отсчеты не загружаются.
+    """
+    ecs_summary = (
+        select(
+            func.count(ECS_data.ecsdataid).label("ecs_count"),
+            func.sum(ECS_data.rr_time).label("duration"),
+            func.min(ECS_data.rr_time).label("rr_time_min"),
+            func.max(ECS_data.rr_time).label("rr_time_max"),
+        )
+        .where(ECS_data.sessionid == session_id)
+        .subquery()
+    )
+    pg_summary = (
+        select(
+            func.count(PG_data.pgdataid).label("pg_count"),
+            func.min(PG_data.amplitude).label("amplitude_min"),
+            func.max(PG_data.amplitude).label("amplitude_max"),
+        )
+        .where(PG_data.sessionid == session_id)
+        .subquery()
+    )
+    # Оба подзапроса возвращают ровно одну строку
+    stmt = select(ecs_summary, pg_summary).select_from(ecs_summary.join(pg_summary, true()))
+    row = db.execute(stmt).one()
+    return {"sessionid": session_id, **row._asdict()}
 
 
 # Удаление сеанса
+@instrumented()
 def delete_session(db: Session, session_id: int):
     """
     Удаление сеанса.
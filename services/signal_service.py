@@ -0,0 +1,95 @@
+import numpy as np
+from sqlalchemy import Integer, select
+from sqlalchemy.orm import Session
+from database.models import ECS_data, PG_data
+from services.instrumentation import instrumented
+
+
+# Загрузка одного столбца сигнала в массив NumPy
+def _load_signal_column(db: Session, column, session_column, order_column, session_id: int):
+    """
+    Выполняет упорядоченный SELECT одного столбца и заполняет массив float64.
+    Пропущенные значения (NULL) заменяются на NaN.
+    """
+    stmt = select(column).where(session_column == session_id).order_by(order_column)
+    values = db.execute(stmt).scalars().all()
+    return np.array(values, dtype=np.float64)
+
+
+# Получение сигналов сеанса в виде массивов NumPy
+@instrumented()
+def load_session_signals(db: Session, session_id: int):
+    """
+    Загрузка сигналов сеанса без создания ORM-объектов.
+    Возвращает кортеж (rr_time, amplitude) из двух массивов float64,
+    упорядоченных по идентификатору записи.
+    """
+    rr_time = _load_signal_column(
+        db, ECS_data.rr_time, ECS_data.sessionid, ECS_data.ecsdataid, session_id
+    )
+    amplitude = _load_signal_column(
+        db, PG_data.amplitude, PG_data.sessionid, PG_data.pgdataid, session_id
+    )
+    return rr_time, amplitude
+
+
+# Проверка наличия сигналов у сеанса
+@instrumented()
+def session_has_signals(db: Session, session_id: int) -> bool:
+    """
+    Проверка наличия данных ЭКС или ПГ для сеанса без загрузки отсчетов (EXISTS).
+    """
+    ecs_exists = select(ECS_data.ecsdataid).where(ECS_data.sessionid == session_id).exists()
+    pg_exists = select(PG_data.pgdataid).where(PG_data.sessionid == session_id).exists()
+    return bool(db.execute(select(ecs_exists | pg_exists)).scalar())
+
+
+# Тип массива NumPy для столбца таблицы
+def _column_dtype(column):
+    """
+    int64 для целочисленных столбцов NOT NULL, иначе float64:
+    NULL в столбцах с плавающей точкой и в целочисленных столбцах,
+    допускающих NULL, заменяется на NaN.
+    """
+    if isinstance(column.type, Integer) and not column.nullable:
+        return np.int64
+    return np.float64
+
+
+# Потоковое чтение столбцов таблицы пакетами массивов NumPy
+def _iter_column_chunks(db: Session, columns, order_column, chunk_size: int):
+    """
+    Генератор словарей {имя столбца: массив NumPy} по chunk_size строк.
+    Строки читаются через серверный курсор (yield_per); тип массива
+    определяется по описанию столбца (_column_dtype).
+    """
+    stmt = select(*columns).order_by(order_column).execution_options(yield_per=chunk_size)
+    names = [column.key for column in columns]
+    dtypes = [_column_dtype(column) for column in columns]
+    for partition in db.execute(stmt).partitions():
+        chunk = {}
+        for name, dtype, column_values in zip(names, dtypes, zip(*partition)):
+            if dtype is np.int64 and None in column_values:
+                raise ValueError(f"Столбец {name} содержит NULL, хотя объявлен NOT NULL")
+            chunk[name] = np.array(column_values, dtype=dtype)
+        yield chunk
+
+
+# Потоковое чтение всех данных ЭКС
+def iter_ecs_chunks(db: Session, chunk_size: int = 100000):
+    """
+    Генератор пакетов всех записей ECS_data в виде массивов NumPy:
+    ecsdataid, sessionid, rr_length, rr_time.
+    """
+    columns = (ECS_data.ecsdataid, ECS_data.sessionid, ECS_data.rr_length, ECS_data.rr_time)
+    yield from _iter_column_chunks(db, columns, ECS_data.ecsdataid, chunk_size)
+
+
+# Потоковое чтение всех данных ПГ
+def iter_pg_chunks(db: Session, chunk_size: int = 100000):
+    """
+    Генератор пакетов всех записей PG_data в виде массивов NumPy:
+    pgdataid, sessionid, d1, d2, amplitude.
+    """
+    columns = (PG_data.pgdataid, PG_data.sessionid, PG_data.d1, PG_data.d2, PG_data.amplitude)
+    yield from _iter_column_chunks(db, columns, PG_data.pgdataid, chunk_size)
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from database.models import Treatment_recommendation, Diagnosis
+from services.instrumentation import instrumented
 
 
 # Создание новой рекомендации по лечению
+@instrumented()
 def create_treatment_recommendation(
     db: Session,
     diagnosisname: str,  # Вместо diagnosisid
@@ -35,6 +37,7 @@ def create_treatment_recommendation(
 
 
 # Получение всех рекомендаций по лечению с деталями
+@instrumented()
 def get_all_treatment_recommendations_with_details(db: Session, skip: int = 0, limit: int = 100):
     """
     Получение всех рекомендаций по лечению с заменой diagnosisid на название диагноза.
@@ -61,6 +64,7 @@ def get_all_treatment_recommendations_with_details(db: Session, skip: int = 0, l
 
 
 # Получение рекомендации по лечению по ID
+@instrumented()
 def get_treatment_recommendation_by_id(db: Session, recommendationid: int):
     """
     Получение рекомендации по лечению по её ID с заменой diagnosisid на название диагноза.
@@ -83,6 +87,7 @@ def get_treatment_recommendation_by_id(db: Session, recommendationid: int):
 
 
 # Обновление рекомендации по лечению
+@instrumented()
 def update_treatment_recommendation(
     db: Session,
     recommendationid: int,
@@ -117,6 +122,7 @@ def update_treatment_recommendation(
 
 
 # Удаление рекомендации по лечению
+@instrumented()
 def delete_treatment_recommendation(db: Session, recommendationid: int):
     """
     Удаление рекомендации по лечению.
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from database.models import Analysis_result, Analysis_series
+from services.analysis_service import (
+    get_analysis_series_page,
+    load_analysis_series,
+    migrate_legacy_analysis_results,
+    save_analysis_series,
+)
+from tests.conftest import populate
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_series_round_trip(db, dtype):
+    populate(db, sessions=1, samples=0)
+    ecs = np.linspace(0.6, 0.9, 1000)
+    pg = np.sin(np.linspace(0, 10, 1000))
+
+    result = save_analysis_series(db, 1, ecs, pg, sample_rate=10.0, params={"interpolate": True}, dtype=dtype)
+    series = load_analysis_series(db, 1)
+
+    assert result == {"deleted": 0, "inserted": 1000}
+    assert series["dtype"] == dtype
+    assert series["sample_rate"] == 10.0
+    assert series["processing_params"] == {"interpolate": True}
+    assert not series["legacy"]
+    np.testing.assert_allclose(series["processed_ecs_data"], np.round(ecs, 4).astype(dtype))
+    np.testing.assert_allclose(series["processed_pg_data"], np.round(pg, 4).astype(dtype))
+    # np.frombuffer не копирует данные, массив только для чтения
+    assert not series["processed_ecs_data"].flags.writeable
+
+
+def test_save_replaces_previous_series_and_legacy_rows(db):
+    populate(db, sessions=1, samples=5)
+
+    result = save_analysis_series(db, 1, [1.0, 2.0], [3.0, 4.0])
+    result = save_analysis_series(db, 1, [1.0, 2.0, 3.0], [3.0, 4.0, 5.0])
+
+    assert result == {"deleted": 1, "inserted": 3}
+    assert db.query(Analysis_series).count() == 1
+    assert db.query(Analysis_result).count() == 0
+
+
+def test_save_rounds_to_four_decimals(db):
+    populate(db, sessions=1, samples=0)
+    save_analysis_series(db, 1, [0.123456, 1.00004], [2.7182818, -0.33333])
+
+    series = load_analysis_series(db, 1)
+    assert series["processed_ecs_data"].tolist() == [0.1235, 1.0]
+    assert series["processed_pg_data"].tolist() == [2.7183, -0.3333]
+
+
+def test_save_rejects_mismatched_lengths(db):
+    populate(db, sessions=1, samples=0)
+    with pytest.raises(ValueError):
+        save_analysis_series(db, 1, [1.0, 2.0], [1.0])
+
+
+def test_legacy_rows_are_read_and_migrated(db):
+    populate(db, sessions=2, samples=4)
+
+    legacy = load_analysis_series(db, 1)
+    assert legacy["legacy"]
+    np.testing.assert_allclose(legacy["processed_ecs_data"], [0.8] * 4)
+
+    save_analysis_series(db, 2, [1.0], [2.0])
+    # До переноса сеанс со строками старого формата тоже виден в списке
+    page = get_analysis_series_page(db)
+    assert [(row["sessionid"], row["sample_count"], row["legacy"]) for row in page] == [(1, 4, True), (2, 1, False)]
+    assert [row["sessionid"] for row in get_analysis_series_page(db, after_id=1)] == [2]
+
+    summary = migrate_legacy_analysis_results(db)
+
+    assert summary == {"migrated": 1, "skipped": 0, "rows": 4}
+    migrated = load_analysis_series(db, 1)
+    assert not migrated["legacy"]
+    np.testing.assert_allclose(migrated["processed_pg_data"], [0.6] * 4)
+    page = get_analysis_series_page(db)
+    assert [(row["sessionid"], row["sample_count"], row["legacy"]) for row in page] == [(1, 4, False), (2, 1, False)]
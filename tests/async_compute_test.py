@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from services.async_compute import LatestTaskRunner
+
+
+def wait_for(app, runner, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    app.processEvents()
+    while runner.is_busy() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+
+
+def test_rapid_requests_are_coalesced(qt_app):
+    calls, results = [], []
+    runner = LatestTaskRunner(lambda value: calls.append(value) or value * 2, delay_ms=50)
+    runner.result_ready.connect(results.append)
+
+    for value in range(5):
+        runner.request(value)
+    wait_for(qt_app, runner)
+
+    assert calls == [4]
+    assert results == [8]
+
+
+def test_result_of_superseded_computation_is_dropped(qt_app):
+    release = threading.Event()
+    calls, results = [], []
+
+    def compute(value):
+        calls.append(value)
+        if value == "old":
+            release.wait(5)
+        return value
+
+    runner = LatestTaskRunner(compute, delay_ms=0)
+    runner.result_ready.connect(results.append)
+
+    runner.request("old", immediate=True)
+    runner.request("new", immediate=True)  # Запустится после завершения "old"
+    release.set()
+    wait_for(qt_app, runner)
+
+    assert calls == ["old", "new"]
+    assert results == ["new"]
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.models import Base
+from services.async_db import AsyncDb
+from services.sessions_service import get_session_details
+from tests.conftest import populate
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    # Файловая база: соединения фоновых потоков видят одни и те же данные
+    engine = create_engine(f"sqlite:///{tmp_path / 'signals.db'}")
+    Base.metadata.create_all(engine)
+    with Session(bind=engine) as db:
+        populate(db, sessions=2, samples=3)
+    yield engine
+    engine.dispose()
+
+
+def wait_for(app, async_db, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while async_db.is_busy() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+
+
+def test_result_is_delivered_from_background_session(qt_app, file_engine):
+    async_db = AsyncDb(file_engine)
+    results = []
+
+    async_db.submit(get_session_details, 2, on_result=results.append)
+    wait_for(qt_app, async_db)
+
+    assert [result["patient_fio"] for result in results] == ["Пациент 2"]
+
+
+def test_errors_are_reported_and_superseded_results_dropped(qt_app, file_engine):
+    async_db = AsyncDb(file_engine)
+    results, errors = [], []
+
+    async_db.submit(get_session_details, 1, on_result=results.append, key="details")
+    async_db.submit(get_session_details, 2, on_result=results.append, key="details")
+    async_db.submit(get_session_details, 99, on_error=errors.append)
+    wait_for(qt_app, async_db)
+
+    assert [result["sessionid"] for result in results] == [2]
+    assert len(errors) == 1
@@ -0,0 +1,91 @@
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+
+import services.batch
+from services.analysis_service import load_analysis_series
+from services.batch import _process_in_worker, process_session, summarize
+from services.dsp import EpochConfig, FilterConfig, SignalPipeline
+from services.sessions_service import get_session_ids_for_processing
+from services.signal_service import load_session_signals
+from tests.conftest import populate
+
+
+def make_pipeline():
+    return SignalPipeline(
+        filters=FilterConfig(lowpass=0.5, center=True),
+        epoch=EpochConfig(cycle_count=30),
+        interpolate=True,
+        interpolation_step=0.25,
+    )
+
+
+def test_process_session_saves_analysis_series(db):
+    populate(db, sessions=2, samples=120)
+    pipeline = make_pipeline()
+
+    result = process_session(db, 1, pipeline)
+    saved = load_analysis_series(db, 1)
+
+    expected = pipeline.run(*load_session_signals(db, 1))
+    assert result == {"sessionid": 1, "samples": 240, "saved": expected.series_rr.size}
+    assert saved["legacy"] is False
+    assert saved["sample_rate"] == pytest.approx(4.0)
+    assert saved["processing_params"] == pipeline.to_dict()
+    np.testing.assert_allclose(saved["processed_ecs_data"], np.round(expected.series_rr, 4))
+    np.testing.assert_allclose(saved["processed_pg_data"], np.round(expected.series_pg, 4))
+    assert load_analysis_series(db, 2)["legacy"] is True  # Второй сеанс не обрабатывался
+
+
+def test_process_session_requires_signals(db):
+    populate(db, sessions=1, samples=0)
+
+    with pytest.raises(ValueError, match="Нет данных ЭКС или ПГ"):
+        process_session(db, 1, make_pipeline())
+
+
+def test_worker_reports_errors_and_rolls_back(db, monkeypatch):
+    populate(db, sessions=1, samples=0)
+    monkeypatch.setattr(services.batch, "get_worker_session", lambda: db)
+
+    result = _process_in_worker(1, make_pipeline().to_dict())
+
+    assert result["sessionid"] == 1
+    assert "Нет данных" in result["error"]
+    assert db.is_active
+
+
+def test_pipeline_config_survives_json_round_trip():
+    pipeline = make_pipeline()
+    config = json.loads(json.dumps(pipeline.to_dict()))
+
+    assert SignalPipeline.from_dict(config) == pipeline
+
+
+def test_sessions_are_selected_by_date_patient_and_lab(db):
+    populate(db, sessions=3, samples=0)
+
+    assert get_session_ids_for_processing(db) == [1, 2, 3]
+    assert get_session_ids_for_processing(db, date_from=date(2025, 5, 6)) == []
+    assert get_session_ids_for_processing(db, date_from=date(2025, 5, 5), date_to=date(2025, 5, 5)) == [1, 2, 3]
+    assert get_session_ids_for_processing(db, patient_fio="ент 2") == [2]
+    assert get_session_ids_for_processing(db, lab_name="Лаборатория №1", patient_fio="Пациент 3") == [3]
+    assert get_session_ids_for_processing(db, lab_name="Другая лаборатория") == []
+
+
+def test_summary_reports_throughput():
+    results = [
+        {"sessionid": 1, "samples": 300, "saved": 50},
+        {"sessionid": 2, "samples": 100, "saved": 20},
+        {"sessionid": 3, "error": "ошибка"},
+    ]
+
+    summary = summarize(results, elapsed=2.0)
+
+    assert (summary["processed"], summary["failed"]) == (2, 1)
+    assert summary["sessions_per_second"] == pytest.approx(1.0)
+    assert summary["samples_per_second"] == pytest.approx(200.0)
+    assert summarize([], elapsed=0.0)["samples_per_second"] == 0.0
+
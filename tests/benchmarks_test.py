@@ -0,0 +1,30 @@
+from benchmarks.run import compare, load_baseline, run_suite, save_baseline
+from benchmarks.suite import BENCHMARKS
+from benchmarks.synthetic import synthetic_signals
+
+
+def test_synthetic_data_is_deterministic():
+    first, second = synthetic_signals(100), synthetic_signals(100)
+    assert all((a == b).all() for a, b in zip(first, second))
+
+
+def test_every_benchmark_runs_on_small_data():
+    results = run_suite(sizes=[300], repeat=1, min_time=0)
+
+    assert set(results) == set(BENCHMARKS)
+    assert all(result["300"]["min"] > 0 for result in results.values())
+
+
+def test_compare_flags_regressions_against_baseline(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_baseline(path, {"dsp.filters": {"1000": {"min": 1.0}}, "dsp.welch": {"1000": {"min": 1.0}}})
+    save_baseline(path, {"dsp.welch": {"1000": {"min": 2.0}}})  # Дополняет прежний файл
+
+    results = {
+        "dsp.filters": {"1000": {"min": 2.0}},
+        "dsp.welch": {"1000": {"min": 1.0}},
+        "dsp.spectrum": {"1000": {"min": 1.0}},
+    }
+    statuses = {row[0]: row[5] for row in compare(results, load_baseline(path)["results"], threshold=1.5)}
+
+    assert statuses == {"dsp.filters": "regression", "dsp.welch": "faster", "dsp.spectrum": "new"}
@@ -0,0 +1,65 @@
+import pytest
+
+from services.bulk_import import collect_files, import_file, load_mapping, resolve_sessions, summarize
+from tests.conftest import populate
+
+
+def test_files_are_collected_from_directories_and_globs(tmp_path):
+    for name in ("session_2.txt", "session_1.txt", "notes.md"):
+        (tmp_path / name).write_text("1\n2\n160\n")
+
+    assert collect_files([str(tmp_path), str(tmp_path / "session_1.*")]) == [
+        str(tmp_path / "session_1.txt"),
+        str(tmp_path / "session_2.txt"),
+    ]
+
+
+def test_sessions_are_resolved_by_pattern():
+    jobs, rejected = resolve_sessions(
+        ["/data/s_10.txt", "/data/s_11.txt", "/data/copy_s_10.txt", "/data/readme.txt"],
+        pattern=r"^s_(?P<session>\d+)",
+    )
+
+    assert jobs == [("/data/s_10.txt", 10), ("/data/s_11.txt", 11)]
+    assert [path for path, _ in rejected] == ["/data/copy_s_10.txt", "/data/readme.txt"]
+
+
+def test_sessions_are_resolved_by_mapping_file(tmp_path):
+    mapping_path = tmp_path / "mapping.csv"
+    mapping_path.write_text("# файл,сеанс\nmorning.txt,5\nevening.txt,5\n")
+
+    jobs, rejected = resolve_sessions(["/data/morning.txt", "/data/evening.txt"], mapping=load_mapping(mapping_path))
+
+    assert jobs == [("/data/morning.txt", 5)]
+    assert "уже импортируется" in rejected[0][1]
+
+
+def test_pattern_requires_session_group():
+    with pytest.raises(ValueError):
+        resolve_sessions(["/data/1.txt"], pattern=r"\d+")
+
+
+def test_import_file_reports_rows_and_refuses_existing_data(db, tmp_path):
+    populate(db, sessions=1, samples=0)
+    path = tmp_path / "session_1.txt"
+    path.write_text("1\n0\n160\n0\n5\n170\n1\n")
+
+    result = import_file(db, str(path), 1)
+    summary = summarize([result, {"path": "x", "sessionid": 2, "error": "ошибка"}], elapsed=1.0)
+
+    assert (result["rows"], result["skipped_lines"], result["rejected_lines"]) == (2, 1, 1)
+    assert (summary["loaded"], summary["failed"], summary["rows"], summary["rejected_lines"]) == (1, 1, 2, 1)
+    with pytest.raises(ValueError, match="уже есть данные"):
+        import_file(db, str(path), 1)
+
+
+def test_invalid_lines_are_rejected_unless_strict(db, tmp_path):
+    populate(db, sessions=2, samples=0)
+    path = tmp_path / "session_1.txt"
+    path.write_text("1\n0\n160\n0\nx\n170\n2\n3\n180\n")
+
+    result = import_file(db, str(path), 1)
+
+    assert (result["rows"], result["rejected_lines"]) == (2, 3)
+    with pytest.raises(ValueError, match="Строка 5"):
+        import_file(db, str(path), 2, skip_invalid=False)
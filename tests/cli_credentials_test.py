@@ -0,0 +1,55 @@
+import argparse
+
+import pytest
+
+import database.session
+from database.session import (
+    PASSWORD_ENV,
+    add_credentials_arguments,
+    get_cli_password,
+    get_worker_session,
+    init_worker_session,
+)
+
+
+def parse(argv):
+    parser = argparse.ArgumentParser()
+    add_credentials_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_password_argument_takes_precedence(monkeypatch):
+    monkeypatch.setenv(PASSWORD_ENV, "from-env")
+    assert get_cli_password(parse(["--user", "researcher", "--password", "secret"])) == "secret"
+    assert get_cli_password(parse(["--user", "researcher"])) == "from-env"
+
+
+def test_password_is_prompted_without_argument_or_env(monkeypatch):
+    monkeypatch.delenv(PASSWORD_ENV, raising=False)
+    monkeypatch.setattr("getpass.getpass", lambda prompt: "typed")
+    assert get_cli_password(parse(["--user", "researcher"])) == "typed"
+
+
+def test_user_is_required():
+    with pytest.raises(SystemExit):
+        parse([])
+
+
+def test_worker_session_is_created_by_initializer(monkeypatch):
+    db = object()
+    monkeypatch.setattr(database.session, "_worker_session", None)
+    monkeypatch.setattr(database.session, "authenticate_user", lambda username, password: db)
+
+    init_worker_session("researcher", "secret")
+
+    assert get_worker_session() is db
+
+
+def test_worker_session_requires_connection(monkeypatch):
+    monkeypatch.setattr(database.session, "_worker_session", None)
+    monkeypatch.setattr(database.session, "authenticate_user", lambda username, password: None)
+
+    with pytest.raises(RuntimeError):
+        get_worker_session()
+    with pytest.raises(RuntimeError, match="researcher"):
+        init_worker_session("researcher", "wrong")
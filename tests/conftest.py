@@ -0,0 +1,83 @@
+import os
+from datetime import date, time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.models import (
+    Analysis_result,
+    Base,
+    Doctor,
+    ECS_data,
+    Laboratory,
+    Patient,
+    PG_data,
+    Polyclinic,
+    Sessions,
+)
+
+
+class StatementCounter:
+    """Подсчет SQL-запросов, отправленных через движок."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+
+def populate(db, sessions=1, samples=10):
+    """Заполнение базы справочниками, сеансами и сигналами для тестов."""
+    db.add(Polyclinic(polyclinicid=1, polyclinic_name="Поликлиника №1", polyclinic_address="ул. Ленина, 1"))
+    db.add(Laboratory(labid=1, lab_name="Лаборатория №1", lab_address="ул. Ленина, 1", polyclinicid=1))
+    for i in range(1, sessions + 1):
+        db.add(Patient(
+            patientid=i, patient_fio=f"Пациент {i}", patient_birthdate=date(1990, 1, 1), polyclinicid=1
+        ))
+        db.add(Doctor(
+            doctorid=i, doctor_fio=f"Врач {i}", doctor_birthdate=date(1980, 1, 1),
+            doctor_specialization="Кардиолог", polyclinicid=1,
+        ))
+        db.add(Sessions(
+            sessionid=i, session_date=date(2025, 5, 5), session_starttime=time(9, 0),
+            session_endtime=time(10, 0), patientid=i, doctorid=i, labid=1,
+        ))
+        for j in range(samples):
+            db.add(ECS_data(sessionid=i, rr_length=160 + j % 7, rr_time=(160 + j % 7) * 0.005))
+            db.add(PG_data(sessionid=i, d1=1, d2=j % 256, amplitude=((256 + j % 256) * 2.45 / 1024)))
+            db.add(Analysis_result(sessionid=i, processed_ecs_data=0.8, processed_pg_data=0.6))
+    db.commit()
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    return StatementCounter(engine)
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """Одно приложение Qt на все тесты (пулы потоков живут до его удаления)."""
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Виджеты без дисплея
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
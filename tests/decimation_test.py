@@ -0,0 +1,54 @@
+import numpy as np
+
+from services.dsp import MinMaxPyramid, get_pyramid
+
+
+def make_signal(n=100_000, seed=0):
+    # Синус с редкими одиночными выбросами, которые не должны теряться при прореживании
+    rng = np.random.default_rng(seed)
+    y = np.sin(np.arange(n) / 500.0) + 0.01 * rng.standard_normal(n)
+    y[rng.choice(n, 5, replace=False)] = [7.0, -6.0, 5.0, -4.0, 9.0]
+    return y
+
+
+def test_view_preserves_envelope_within_point_budget():
+    y = make_signal()
+    pyramid = MinMaxPyramid(y)
+
+    xs, ys = pyramid.view(0, y.size - 1, max_points=1000)
+
+    assert ys.size <= 1000
+    assert ys.max() == y.max() and ys.min() == y.min()
+    assert np.all(np.diff(xs) > 0)
+    assert xs[0] == 0 and xs[-1] == y.size - 1
+
+
+def test_zoomed_view_returns_raw_samples_beyond_edges():
+    y = make_signal()
+    pyramid = MinMaxPyramid(y)
+
+    xs, ys = pyramid.view(1000.5, 1200.5, max_points=1000)
+
+    # Все отсчеты участка и по одному за границами
+    np.testing.assert_array_equal(xs, np.arange(1000, 1202))
+    np.testing.assert_array_equal(ys, y[1000:1202])
+
+
+def test_view_with_x_coordinates():
+    y = make_signal(n=10_000)
+    x = np.linspace(0.0, 50.0, y.size)
+    pyramid = MinMaxPyramid(y, x)
+
+    xs, ys = pyramid.view(10.0, 20.0, max_points=200)
+    inside = (x >= 10.0) & (x <= 20.0)
+
+    assert ys.size <= 200
+    assert xs[0] <= 10.0 and xs[-1] >= 20.0
+    assert ys.max() >= y[inside].max() and ys.min() <= y[inside].min()
+
+
+def test_pyramid_is_cached_by_array_identity():
+    y = make_signal(n=1000)
+
+    assert get_pyramid(y) is get_pyramid(y)
+    assert get_pyramid(y.copy()) is not get_pyramid(y)
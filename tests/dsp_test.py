@@ -0,0 +1,120 @@
+import subprocess
+import sys
+
+import numpy as np
+
+from services.dsp import (
+    EpochConfig,
+    FilterConfig,
+    SignalPipeline,
+    apply_filters,
+    design_filter,
+    find_flattest_epoch,
+    interpolate_series,
+    rank_epochs,
+    rolling_window_stats,
+)
+
+
+def make_signals(n=600, seed=0):
+    # Синтетические RR-интервалы (~0.8 с) и амплитуды дыхания
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    rr_times = 0.8 + 0.05 * np.sin(2 * np.pi * t / 20) + 0.01 * rng.standard_normal(n)
+    amplitudes = 1.5 + 0.3 * np.sin(2 * np.pi * t / 20 + 0.3) + 0.02 * rng.standard_normal(n)
+    return rr_times, amplitudes
+
+
+def test_dsp_is_headless():
+    # Пакет импортируется в отдельном процессе без Qt и matplotlib
+    code = (
+        "import sys, services.dsp; "
+        "assert not any(m.split('.')[0] in ('PyQt6', 'matplotlib', 'sqlalchemy') for m in sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_pipeline_runs_all_stages():
+    rr_times, amplitudes = make_signals()
+    pipeline = SignalPipeline(
+        filters=FilterConfig(lowpass=0.5, highpass=True, center=True),
+        crop=(10, 590),
+        epoch=EpochConfig(cycle_count=60),
+        interpolate=True,
+    )
+    result = pipeline.run(rr_times, amplitudes)
+
+    assert result.rr_times.shape == (580,)
+    assert result.statistics is not None
+    start, end = result.epoch
+    assert end - start + 1 == 60
+    assert result.series_rr.shape == result.time_grid.shape == result.series_pg.shape
+
+
+def test_pipeline_config_round_trip():
+    pipeline = SignalPipeline(
+        filters=FilterConfig(chebyshev_params={"cutoff": 0.4, "order": 2, "ripple": 0.5}, notch=True),
+        crop=(0, 100),
+        epoch=EpochConfig(start=5, end=50),
+    )
+    assert SignalPipeline.from_dict(pipeline.to_dict()) == pipeline
+
+
+def test_filter_design_is_cached():
+    design_filter.cache_clear()
+    config = FilterConfig(lowpass=0.5, highpass=True, notch=True)
+    rr_times, amplitudes = make_signals()
+
+    apply_filters(rr_times, amplitudes, config)
+    apply_filters(rr_times, amplitudes, config)
+
+    info = design_filter.cache_info()
+    assert (info.misses, info.hits) == (3, 3)
+    assert not design_filter("highpass", 4, 0.05, 200).flags.writeable
+
+
+def test_stacked_filtering_matches_single_channel():
+    rr_times, amplitudes = make_signals()
+    config = FilterConfig(chebyshev_params={"cutoff": 0.4, "order": 2, "ripple": 0.5}, highpass=True)
+
+    stacked_rr, stacked_amp = apply_filters(rr_times, amplitudes, config)
+    # Сигналы разной длины фильтруются по отдельности
+    single_rr, short_amp = apply_filters(rr_times, amplitudes[:500], config)
+
+    np.testing.assert_allclose(stacked_rr, single_rr, atol=1e-12)
+    assert short_amp.shape == (500,)
+
+
+def test_flattest_epoch_skips_noisy_region():
+    rr_times, _ = make_signals(n=300)
+    rr_times[200:260] = 0.8  # Ровный участок
+    start, end = find_flattest_epoch(rr_times, 40)
+    assert 200 <= start and end < 260
+
+
+def test_rolling_stats_match_direct_computation():
+    rr_times, _ = make_signals(n=200)
+    rr_times[50] += 1.0  # Выброс
+    means, stds, has_outlier = rolling_window_stats(rr_times, 30)
+    for i in (0, 40, 50, 170):
+        segment = rr_times[i:i + 30]
+        assert np.isclose(means[i], segment.mean())
+        assert np.isclose(stds[i], segment.std())
+        assert has_outlier[i] == bool(np.any(np.abs(segment - segment.mean()) > 3 * segment.std()))
+
+
+def test_rank_epochs_returns_non_overlapping_candidates():
+    rr_times, _ = make_signals(n=1000)
+    epochs = rank_epochs(rr_times, 50, top_k=4)
+    assert len(epochs) == 4
+    assert [std for _, _, std in epochs] == sorted(std for _, _, std in epochs)
+    starts = sorted(start for start, _, _ in epochs)
+    assert all(b - a >= 50 for a, b in zip(starts, starts[1:]))
+    assert epochs[0][:2] == find_flattest_epoch(rr_times, 50)
+
+
+def test_interpolation_grid_step():
+    rr_times, amplitudes = make_signals(n=100)
+    grid, series_rr, series_pg = interpolate_series(rr_times, amplitudes, step=0.1)
+    assert np.allclose(np.diff(grid), 0.1)
+    assert series_rr.shape == series_pg.shape == grid.shape
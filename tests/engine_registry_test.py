@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+import database.session
+from database.session import (
+    MAX_OVERFLOW,
+    POOL_RECYCLE,
+    POOL_SIZE,
+    POOL_TIMEOUT,
+    authenticate_user,
+    dispose_all_engines,
+    dispose_user_engines,
+    get_user_engine,
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Пустой реестр движков; вместо PostgreSQL — SQLite с теми же параметрами пула."""
+    created = []
+
+    def sqlite_engine(url, **kwargs):
+        created.append(url)
+        return create_engine("sqlite://", **kwargs)
+
+    monkeypatch.setattr(database.session, "create_engine", sqlite_engine)
+    monkeypatch.setattr(database.session, "_engines", {})
+    monkeypatch.setattr(database.session, "_session_factories", {})
+    yield created
+    dispose_all_engines()
+
+
+def test_same_credentials_share_one_engine(registry):
+    first = authenticate_user("researcher", "secret")
+    second = authenticate_user("researcher", "secret")
+
+    assert first is not second
+    assert first.get_bind() is second.get_bind()
+    assert len(registry) == 1
+    assert registry[0].username == "researcher"
+    first.close()
+    second.close()
+
+
+def test_different_password_gets_its_own_engine(registry):
+    engine = get_user_engine("researcher", "secret")
+    other = get_user_engine("researcher", "changed")
+
+    assert engine is not other
+    assert len(database.session._engines) == 2
+    # Пароль в ключе реестра не хранится
+    assert all("secret" not in key and "changed" not in key for key in database.session._engines)
+
+
+def test_dispose_user_engines_keeps_other_users(registry):
+    get_user_engine("researcher", "secret")
+    get_user_engine("researcher", "changed")
+    doctor = get_user_engine("doctor", "secret")
+
+    dispose_user_engines("researcher")
+
+    assert list(database.session._engines.values()) == [doctor]
+    assert len(database.session._session_factories) == 1
+
+
+def test_dispose_all_engines_empties_registry(registry):
+    get_user_engine("researcher", "secret")
+    get_user_engine("doctor", "secret")
+
+    dispose_all_engines()
+
+    assert database.session._engines == {}
+    assert database.session._session_factories == {}
+    # После сброса движок создается заново
+    get_user_engine("researcher", "secret")
+    assert len(registry) == 3
+
+
+def test_queue_pool_settings_are_applied(registry):
+    pool = get_user_engine("researcher", "secret").pool
+
+    assert isinstance(pool, QueuePool)
+    assert pool.size() == POOL_SIZE
+    assert pool._max_overflow == MAX_OVERFLOW
+    assert pool._timeout == POOL_TIMEOUT
+    assert pool._recycle == POOL_RECYCLE
+    assert pool._pre_ping is True
+
+
+def test_failed_connection_is_not_registered(registry, monkeypatch):
+    def unreachable(url, **kwargs):
+        return create_engine("sqlite:////nonexistent/directory/db.sqlite", **kwargs)
+
+    monkeypatch.setattr(database.session, "create_engine", unreachable)
+
+    assert authenticate_user("researcher", "secret") is None
+    assert database.session._engines == {}
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+pytest.importorskip("matplotlib")
+
+from matplotlib.backend_bases import MouseEvent
+
+from ui.widgets.plots.epoch_selection_widget import EpochSelectionWidget
+
+
+@pytest.fixture
+def widget(qt_app):
+    rng = np.random.default_rng(0)
+    widget = EpochSelectionWidget(None, 0.8 + 0.01 * rng.standard_normal(1000), rng.standard_normal(1000), 1)
+    widget.resize(800, 500)
+    widget.canvas.draw()
+    yield widget
+    widget.close()
+
+
+def mouse(widget, name, xdata):
+    x, y = widget.ax.transData.transform((xdata, 0.0))
+    MouseEvent(name, widget.canvas, x, y, button=1)._process()
+
+
+def test_highlight_reuses_artists(widget):
+    artists = list(widget.ax.get_children())
+    widget.start_index_input.setText("100")
+    widget.end_index_input.setText("200")
+
+    widget.apply_selection()
+    widget.apply_selection()
+
+    assert widget.ax.get_children() == artists
+    assert widget.epoch_span.get_visible()
+    assert (widget.epoch_span.get_x(), widget.epoch_span.get_width()) == (100, 100)
+
+
+def test_epoch_is_dragged_with_mouse_and_clamped(widget):
+    widget.start_index_input.setText("100")
+    widget.end_index_input.setText("200")
+    widget.apply_selection()
+
+    mouse(widget, "button_press_event", 150)
+    mouse(widget, "motion_notify_event", 450)
+    mouse(widget, "button_release_event", 450)
+    assert (widget.selected_epoch_start, widget.selected_epoch_end) == (400, 500)
+    assert (widget.start_index_input.text(), widget.end_index_input.text()) == ("400", "500")
+
+    # Эпоха не выходит за конец сигнала
+    mouse(widget, "button_press_event", 450)
+    mouse(widget, "motion_notify_event", 990)
+    mouse(widget, "button_release_event", 990)
+    assert (widget.selected_epoch_start, widget.selected_epoch_end) == (899, 999)
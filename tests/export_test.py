@@ -0,0 +1,124 @@
+import csv
+
+import numpy as np
+import pytest
+from sqlalchemy import Column, Float, Integer, MetaData, Table, insert
+
+from database.models import PG_data
+from services.analysis_service import save_analysis_series
+from services.ecs_service import iter_ecs_data_with_details
+from services.export import _write_parquet, export_source
+from services.signal_service import _iter_column_chunks, iter_pg_chunks
+from tests.conftest import populate
+
+
+def test_details_are_streamed_in_chunks(db):
+    populate(db, sessions=3, samples=5)
+
+    batches = list(iter_ecs_data_with_details(db, chunk_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 4, 3]
+    assert batches[0][0]["patient_fio"] == "Пациент 1"
+
+
+def test_signal_chunks_are_numpy_arrays(db):
+    populate(db, sessions=2, samples=5)
+
+    chunks = list(iter_pg_chunks(db, chunk_size=6))
+
+    assert [chunk["amplitude"].size for chunk in chunks] == [6, 4]
+    assert chunks[0]["sessionid"].dtype == np.int64
+    assert chunks[0]["amplitude"].dtype == np.float64
+
+
+def test_nullable_integer_columns_become_float_with_nan(engine, db):
+    table = Table(
+        "readings", MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("count", Integer, nullable=True),
+        Column("value", Float),
+    )
+    table.create(engine)
+    db.execute(insert(table), [{"id": 1, "count": 5, "value": 0.5}, {"id": 2, "count": None, "value": None}])
+
+    chunks = list(_iter_column_chunks(db, (table.c.id, table.c.count, table.c.value), table.c.id, chunk_size=10))
+
+    assert chunks[0]["id"].dtype == np.int64
+    assert chunks[0]["count"].dtype == np.float64
+    np.testing.assert_array_equal(chunks[0]["count"], [5.0, np.nan])
+    np.testing.assert_array_equal(chunks[0]["value"], [0.5, np.nan])
+
+
+def test_export_pg_with_null_amplitude(db, tmp_path):
+    populate(db, sessions=1, samples=3)
+    db.query(PG_data).filter(PG_data.pgdataid == 2).update({"amplitude": None})
+    db.commit()
+    path = tmp_path / "pg.csv"
+
+    rows = export_source(db, "pg", path, fmt="csv", chunk_size=2)
+
+    with open(path, encoding="utf-8") as exported:
+        lines = list(csv.reader(exported))
+    assert rows == 3
+    assert lines[2][lines[0].index("amplitude")] == "nan"
+
+
+def test_export_ecs_to_csv(db, tmp_path):
+    populate(db, sessions=2, samples=5)
+    path = tmp_path / "ecs.csv"
+
+    rows = export_source(db, "ecs", path, fmt="csv", chunk_size=3)
+
+    with open(path, encoding="utf-8") as exported:
+        lines = list(csv.reader(exported))
+    assert rows == 10
+    assert lines[0] == ["ecsdataid", "sessionid", "rr_length", "rr_time"]
+    assert len(lines) == 11
+
+
+def test_export_analysis_series_in_long_format(db, tmp_path):
+    populate(db, sessions=2, samples=0)
+    save_analysis_series(db, 1, [1.0, 2.0, 3.0], [4.0, 5.0, 6.0])
+    save_analysis_series(db, 2, [7.0], [8.0])
+    path = tmp_path / "analysis_series.csv"
+
+    rows = export_source(db, "analysis_series", path, fmt="csv")
+
+    with open(path, encoding="utf-8") as exported:
+        lines = list(csv.reader(exported))
+    assert rows == 4
+    assert lines[-1] == ["2", "0", "7.0", "8.0"]
+
+
+def test_export_to_parquet(db, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    populate(db, sessions=2, samples=5)
+    path = tmp_path / "pg_details.parquet"
+
+    rows = export_source(db, "pg_details", path, fmt="parquet", chunk_size=3)
+
+    assert rows == pq.read_table(path).num_rows == 10
+
+
+def test_parquet_schema_promotes_columns_empty_in_first_chunk(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "details.parquet"
+
+    rows = _write_parquet(iter([{"a": [1, 2], "b": [None, None]}, {"a": [3], "b": ["x"]}]), path)
+
+    assert rows == 3
+    assert pq.read_table(path).to_pydict() == {"a": [1, 2, 3], "b": [None, None, "x"]}
+
+
+def test_parquet_export_keeps_float64_for_mixed_series(db, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    populate(db, sessions=2, samples=0)
+    save_analysis_series(db, 1, [0.5], [0.25], dtype="float32")
+    save_analysis_series(db, 2, [1 / 3], [2 / 3], dtype="float64")
+    path = tmp_path / "analysis_series.parquet"
+
+    export_source(db, "analysis_series", path, fmt="parquet")
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("processed_ecs_data").type) == "double"
+    assert table.column("processed_ecs_data").to_pylist() == [0.5, 0.3333]
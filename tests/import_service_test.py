@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from database.models import ECS_data, PG_data
+from services.ecs_service import delete_ecs_data_by_session_id
+from services.import_service import compute_amplitude, import_signal_file, iter_signal_file, replace_session_signals
+from services.signal_service import load_session_signals
+from tests.conftest import populate
+
+
+def write_signal_file(path, triples, newline="\n"):
+    path.write_text(newline.join(str(value) for triple in triples for value in triple) + newline)
+    return str(path)
+
+
+def test_amplitude_matches_server_rounding():
+    # 256 * 2.45 / 1024 = 0.6125: ROUND(NUMERIC, 3) дает 0.613, np.round — 0.612
+    assert compute_amplitude([0, 0, 1], [1, 0, 0]).tolist() == [0.002, 0.0, 0.613]
+    assert compute_amplitude(0, 240).item() == 0.574
+
+
+@pytest.mark.parametrize("chunk_bytes", [5, 64, 1 << 20])
+def test_file_is_parsed_in_chunks(tmp_path, chunk_bytes):
+    triples = [(i % 4, (i * 7) % 256, 150 + i % 50) for i in range(301)]
+    path = write_signal_file(tmp_path / "signals.txt", triples + [(1, 2)], newline="\r\n")
+
+    batches = list(iter_signal_file(path, chunk_bytes=chunk_bytes))
+
+    parsed = np.column_stack([np.concatenate(column) for column in zip(*batches)])
+    assert parsed.tolist() == [list(triple) for triple in triples]
+
+
+def test_invalid_line_is_reported(tmp_path):
+    path = tmp_path / "signals.txt"
+    path.write_text("1\n2\n160\n1\nx\n170\n")
+
+    with pytest.raises(ValueError, match="Строка 5"):
+        list(iter_signal_file(str(path)))
+
+
+@pytest.mark.parametrize("chunk_bytes", [4, 1 << 20])
+def test_invalid_lines_reject_their_triples(tmp_path, chunk_bytes):
+    path = tmp_path / "signals.txt"
+    # Вторая тройка содержит нечисловую строку, третья — пустую, последняя неполная
+    path.write_text("1\n2\n160\n1\nx\n170\n3\n\n180\n4\n5\n190\n6\n")
+    stats = {}
+
+    batches = list(iter_signal_file(str(path), chunk_bytes=chunk_bytes, stats=stats, skip_invalid=True))
+
+    parsed = np.column_stack([np.concatenate(column) for column in zip(*batches)])
+    assert parsed.tolist() == [[1, 2, 160], [4, 5, 190]]
+    assert stats == {"lines": 13, "skipped_lines": 1, "rejected_lines": 7}
+
+
+def test_import_computes_derived_columns(db, tmp_path):
+    populate(db, sessions=1, samples=0)
+    path = write_signal_file(tmp_path / "signals.txt", [(1, 0, 160), (0, 255, 200)])
+
+    result = import_signal_file(db, 1, path)
+    rr_time, amplitude = load_session_signals(db, 1)
+
+    assert result["rows"] == 2
+    np.testing.assert_allclose(rr_time, [0.8, 1.0])
+    np.testing.assert_allclose(amplitude, [0.613, 0.61])
+
+
+def test_failed_import_leaves_no_rows(db, tmp_path):
+    populate(db, sessions=1, samples=0)
+    path = write_signal_file(tmp_path / "signals.txt", [(1, 0, 160), (0, 300, 200)])
+
+    with pytest.raises(ValueError, match="D2"):
+        import_signal_file(db, 1, path, chunk_bytes=4)
+
+    assert db.query(ECS_data).count() == db.query(PG_data).count() == 0
+
+
+def test_import_skips_out_of_range_triples_on_request(db, tmp_path):
+    populate(db, sessions=1, samples=0)
+    path = write_signal_file(tmp_path / "signals.txt", [(1, 0, 160), (0, 300, 200), (0, 5, 0), (2, 3, 170)])
+
+    result = import_signal_file(db, 1, path, skip_invalid=True)
+    rr_time, amplitude = load_session_signals(db, 1)
+
+    assert (result["rows"], result["rejected_lines"], result["skipped_lines"]) == (2, 6, 0)
+    np.testing.assert_allclose(rr_time, [0.8, 0.85])
+
+
+def test_replace_swaps_signals_in_one_transaction(db, tmp_path, statements):
+    populate(db, sessions=2, samples=50)
+    path = write_signal_file(tmp_path / "signals.txt", [(1, 0, 160), (0, 255, 200)])
+
+    statements.reset()
+    result = replace_session_signals(db, 1, path)
+
+    # Проверка сеанса, два DELETE и по одной вставке в каждую таблицу
+    assert statements.count == 5
+    assert (result["rows"], result["deleted_ecs"], result["deleted_pg"]) == (2, 50, 50)
+    assert db.query(ECS_data).filter(ECS_data.sessionid == 1).count() == 2
+    assert db.query(ECS_data).filter(ECS_data.sessionid == 2).count() == 50
+
+
+def test_failed_replace_keeps_previous_signals(db, tmp_path):
+    populate(db, sessions=1, samples=5)
+    invalid = write_signal_file(tmp_path / "invalid.txt", [(1, 0, 160), (0, 300, 200)])
+    empty = tmp_path / "empty.txt"
+    empty.write_text("")
+
+    with pytest.raises(ValueError, match="D2"):
+        replace_session_signals(db, 1, invalid)
+    with pytest.raises(ValueError, match="не содержит отсчетов"):
+        replace_session_signals(db, 1, str(empty))
+
+    assert db.query(ECS_data).count() == db.query(PG_data).count() == 5
+
+
+def test_delete_by_session_is_set_based(db):
+    populate(db, sessions=1, samples=3)
+
+    assert delete_ecs_data_by_session_id(db, 1)["deleted"] == 3
+    with pytest.raises(ValueError):
+        delete_ecs_data_by_session_id(db, 1)
@@ -0,0 +1,36 @@
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from database.models import ECS_data, Patient, PG_data
+
+
+def query_plan(engine, stmt):
+    compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        return " ".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"))
+
+
+def test_session_signal_reads_use_composite_index(engine):
+    for model, order_column, index in (
+        (ECS_data, ECS_data.ecsdataid, "ix_ecs_data_sessionid_ecsdataid"),
+        (PG_data, PG_data.pgdataid, "ix_pg_data_sessionid_pgdataid"),
+    ):
+        stmt = select(model).where(model.sessionid == 1).order_by(order_column)
+        plan = query_plan(engine, stmt)
+        assert index in plan
+        assert "TEMP B-TREE" not in plan  # Сортировка обеспечивается индексом
+
+
+def test_session_foreign_keys_indexed(engine):
+    indexed = {tuple(index["column_names"]) for index in inspect(engine).get_indexes("session")}
+    assert {("patientid",), ("doctorid",), ("labid",)} <= indexed
+
+
+def test_trigram_indexes_only_in_postgresql(engine):
+    names = {index["name"] for index in inspect(engine).get_indexes("patient")}
+    assert "ix_patient_patient_fio_trgm" not in names
+
+    index = next(index for index in Patient.__table__.indexes if index.name == "ix_patient_patient_fio_trgm")
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert "USING gin (patient_fio gin_trgm_ops)" in ddl
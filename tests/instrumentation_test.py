@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+import pytest
+
+from services import instrumentation
+from services.dsp import design_filter, rolling_window_stats
+from services.import_service import compute_amplitude
+from services.signal_service import load_session_signals
+from tests.conftest import populate
+
+
+@pytest.fixture
+def installed():
+    instrumentation.reset()
+    instrumentation.install()
+    yield
+    instrumentation.uninstall()
+    instrumentation.reset()
+
+
+def test_service_calls_record_time_rows_and_statements(installed, db):
+    populate(db, sessions=1, samples=5)
+    from services import signal_service
+
+    rr_times, amplitudes = signal_service.load_session_signals(db, 1)
+
+    stats = instrumentation.snapshot()["services.signal_service.load_session_signals"]
+    assert stats["calls"] == 1
+    assert stats["rows"] == rr_times.size == 5
+    assert stats["statements"] == 2
+    assert stats["max_ms"] > 0
+
+
+def test_reexported_dsp_stages_and_pipeline_are_measured(installed):
+    import services.dsp as dsp
+
+    rr_times, amplitudes = np.full(100, 0.8), np.linspace(0, 1, 100)
+    dsp.SignalPipeline(filters=dsp.FilterConfig(lowpass=0.5)).run(rr_times, amplitudes)
+
+    metrics = instrumentation.snapshot()
+    assert metrics["services.dsp.pipeline.SignalPipeline.run"]["calls"] == 1
+    assert metrics["services.dsp.filters.apply_filters"]["calls"] == 1
+    assert dsp.apply_filters.instrumented
+
+
+def test_errors_are_counted_and_uninstall_stops_recording(installed, db):
+    from services import sessions_service
+
+    with pytest.raises(ValueError):
+        sessions_service.get_session_details(db, 99)
+    assert instrumentation.snapshot()["services.sessions_service.get_session_details"]["errors"] == 1
+
+    instrumentation.uninstall()
+    with pytest.raises(ValueError):
+        sessions_service.get_session_details(db, 99)
+    assert instrumentation.snapshot()["services.sessions_service.get_session_details"]["calls"] == 1
+
+
+def test_names_imported_before_install_are_measured(installed, db):
+    # load_session_signals импортирован этим модулем до install()
+    populate(db, sessions=1, samples=3)
+
+    load_session_signals(db, 1)
+
+    assert instrumentation.snapshot()["services.signal_service.load_session_signals"]["calls"] == 1
+
+
+def test_helpers_and_cli_entry_points_are_not_wrapped():
+    import services.batch
+    import services.bulk_import
+
+    for func in (compute_amplitude, design_filter, rolling_window_stats, services.batch.main, services.bulk_import.main):
+        assert not getattr(func, "instrumented", False)
+    assert services.batch.process_session.instrumented
+
+
+def test_measure_block_and_json_dump(tmp_path):
+    instrumentation.reset()
+    for rows in (10, 20):
+        with instrumentation.measure("import") as measurement:
+            measurement.rows = rows
+
+    path = tmp_path / "metrics.json"
+    instrumentation.dump_json(path)
+    stats = json.loads(path.read_text(encoding="utf-8"))["metrics"]["import"]
+    instrumentation.reset()
+
+    assert stats["calls"] == 2
+    assert stats["rows"] == 30
+    assert sum(stats["histogram"].values()) == 2
+
+
+def test_count_rows():
+    assert instrumentation.count_rows([1, 2, 3]) == 3
+    assert instrumentation.count_rows((np.zeros(4), np.zeros(4))) == 4
+    assert instrumentation.count_rows({"deleted": 0, "message": "ok"}) == 0
+    assert instrumentation.count_rows(np.float64(1.0)) is None
+    assert instrumentation.count_rows((1, 2)) is None
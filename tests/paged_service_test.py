@@ -0,0 +1,33 @@
+from services.ecs_service import get_ecs_data_page
+from services.pg_service import get_pg_data_page
+from tests.conftest import populate
+
+
+def collect_pages(fetch_page, key, limit):
+    rows, last_id = [], None
+    while True:
+        page = fetch_page(last_id, limit)
+        rows.extend(page)
+        if len(page) < limit:
+            return rows
+        last_id = page[-1][key]
+
+
+def test_ecs_pages_cover_all_rows_once(db):
+    populate(db, sessions=3, samples=7)
+    rows = collect_pages(lambda after, limit: get_ecs_data_page(db, after, limit), "ecsdataid", limit=4)
+
+    ids = [row["ecsdataid"] for row in rows]
+    assert len(ids) == 21
+    assert ids == sorted(set(ids))
+
+
+def test_pg_pages_filter_by_patient_on_server(db):
+    populate(db, sessions=3, samples=7)
+    rows = collect_pages(
+        lambda after, limit: get_pg_data_page(db, after, limit, patient_fio="Пациент 2"), "pgdataid", limit=3
+    )
+
+    assert len(rows) == 7
+    assert {row["patient_fio"] for row in rows} == {"Пациент 2"}
+
@@ -0,0 +1,126 @@
+from datetime import date, time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, Sessions
+from services.analysis_service import (
+    get_analysis_results_by_patient_fio,
+    get_analysis_results_by_session_datetime,
+    get_analysis_results_with_details,
+)
+from services.ecs_service import get_ecs_data_by_session_id, get_ecs_data_with_details
+from services.patient_service import get_patients_with_details, search_patients_by_fio
+from services.pg_service import get_pg_data_by_session_id, get_pg_data_with_details
+from services.sessions_service import (
+    get_session_signal_summary,
+    get_sessions_by_patient_fio,
+    get_sessions_with_signals,
+    get_sessions_with_details,
+    search_sessions_by_date,
+)
+from tests.conftest import StatementCounter, populate
+
+
+DETAIL_QUERIES = [
+    lambda db: get_ecs_data_with_details(db),
+    lambda db: get_ecs_data_by_session_id(db, 1),
+    lambda db: get_pg_data_with_details(db),
+    lambda db: get_pg_data_by_session_id(db, 1),
+    lambda db: get_sessions_with_details(db),
+    lambda db: search_sessions_by_date(db, date(2025, 5, 5)),
+    lambda db: get_sessions_by_patient_fio(db, "Пациент"),
+    lambda db: get_sessions_with_signals(db),
+    lambda db: get_analysis_results_with_details(db),
+    lambda db: get_analysis_results_by_session_datetime(db, date(2025, 5, 5), time(9, 0)),
+    lambda db: get_analysis_results_by_patient_fio(db, "Пациент"),
+    lambda db: get_patients_with_details(db),
+    lambda db: search_patients_by_fio(db, "Пациент"),
+]
+
+
+def count_statements(query, sessions, samples):
+    # Каждый замер выполняется на новой базе, чтобы кэш сессии не влиял на результат
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    populate(db, sessions=sessions, samples=samples)
+    db.expunge_all()
+
+    counter = StatementCounter(engine)
+    rows = query(db)
+    db.close()
+    engine.dispose()
+    return counter.count, len(rows)
+
+
+@pytest.mark.parametrize("query", DETAIL_QUERIES)
+def test_statement_count_does_not_depend_on_row_count(query):
+    small_count, small_rows = count_statements(query, sessions=1, samples=1)
+    large_count, large_rows = count_statements(query, sessions=5, samples=40)
+
+    assert large_rows > small_rows
+    assert small_count == large_count == 1
+
+
+def test_details_rows_keep_dictionary_access(db):
+    populate(db, sessions=2, samples=3)
+    row = get_ecs_data_by_session_id(db, 2)[0]
+    assert row["patient_fio"] == "Пациент 2"
+    assert row["doctor_fio"] == "Врач 2"
+    assert row["rr_time"] == pytest.approx(0.8)
+
+
+def test_sessions_with_signals_skip_sessions_without_signals(db):
+    populate(db, sessions=2, samples=4)
+    db.add(Sessions(
+        sessionid=3, session_date=date(2025, 5, 6), session_starttime=time(9, 0),
+        session_endtime=time(10, 0), patientid=1, doctorid=1, labid=1,
+    ))
+    db.commit()
+
+    sessions = get_sessions_with_signals(db)
+
+    assert [row["sessionid"] for row in sessions] == [1, 2]
+    assert sessions[0]["patient_fio"] == "Пациент 1"
+
+
+def test_sessions_with_signals_do_not_aggregate_samples(engine, db):
+    populate(db, sessions=2, samples=4)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+
+    get_sessions_with_signals(db)
+
+    sql = statements[0].upper()
+    assert "EXISTS" in sql
+    assert "GROUP BY" not in sql and "COUNT(" not in sql
+
+
+def test_session_signal_summary_uses_one_statement(engine, db):
+    populate(db, sessions=2, samples=4)
+    counter = StatementCounter(engine)
+
+    summary = get_session_signal_summary(db, 1)
+
+    assert counter.count == 1
+    assert summary["sessionid"] == 1
+    assert summary["ecs_count"] == summary["pg_count"] == 4
+    assert summary["duration"] == pytest.approx(0.8 + 0.805 + 0.81 + 0.815)
+    assert summary["rr_time_min"] == pytest.approx(0.8)
+    assert summary["rr_time_max"] == pytest.approx(0.815)
+
+
+def test_session_signal_summary_of_session_without_signals(db):
+    populate(db, sessions=1, samples=2)
+    db.add(Sessions(
+        sessionid=2, session_date=date(2025, 5, 6), session_starttime=time(9, 0),
+        session_endtime=time(10, 0), patientid=1, doctorid=1, labid=1,
+    ))
+    db.commit()
+
+    summary = get_session_signal_summary(db, 2)
+
+    assert summary["ecs_count"] == summary["pg_count"] == 0
+    assert summary["duration"] is None
@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from database.models import Patient
+from services.patient_service import create_patient, update_patient
+from services.search_service import _search_query, clear_search_cache, search_doctors, search_patients
+from tests.conftest import populate
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_search_cache()
+    yield
+    clear_search_cache()
+
+
+def add_patients(db, *names):
+    for name in names:
+        db.add(Patient(patient_fio=name, patient_birthdate=date(1990, 1, 1), polyclinicid=1))
+    db.commit()
+
+
+def test_prefix_matches_first_and_limit(db):
+    populate(db, sessions=1, samples=0)
+    add_patients(db, "Петров Иван", "Иванова Анна", "Сидоров Иван", "Иванов Петр")
+
+    fios = [patient["patient_fio"] for patient in search_patients(db, "  Иван ")]
+    assert fios == ["Иванова Анна", "Иванов Петр", "Петров Иван", "Сидоров Иван"]
+    assert len(search_patients(db, "Иван", limit=2)) == 2
+    assert search_patients(db, "   ") == []
+    assert search_patients(db, "Пациент")[0]["polyclinic_name"] == "Поликлиника №1"
+
+
+def test_like_wildcards_are_literal(db):
+    populate(db, sessions=1, samples=0)
+    add_patients(db, "Иванов_Петр")
+
+    assert [patient["patient_fio"] for patient in search_patients(db, "_")] == ["Иванов_Петр"]
+    assert search_patients(db, "%") == []
+
+
+def test_repeated_query_served_from_cache(db, statements):
+    populate(db, sessions=3, samples=0)
+
+    first = search_doctors(db, "Врач")
+    statements.reset()
+    first.clear()  # Изменение возвращенного списка не затрагивает кэш
+    assert len(search_doctors(db, "врач ")) == 3  # Регистр и пробелы не влияют на ключ кэша
+    assert statements.count == 0
+
+
+def test_cache_invalidated_on_patient_write(db):
+    populate(db, sessions=1, samples=0)
+    assert search_patients(db, "Смирнов") == []
+
+    patient = create_patient(db, "Смирнов Олег", date(1985, 3, 1), "", "", "Поликлиника №1")
+    assert [row["patient_fio"] for row in search_patients(db, "Смирнов")] == ["Смирнов Олег"]
+
+    update_patient(db, patient.patientid, fio="Смирнова Ольга")
+    assert [row["patient_fio"] for row in search_patients(db, "Смирнов")] == ["Смирнова Ольга"]
+
+
+def test_postgresql_query_uses_trigram_index_operators():
+    condition, order = _search_query("postgresql", "иванов", Patient.patient_fio, Patient.patientid)
+    sql = str(select(Patient.patientid).where(condition).order_by(*order).compile(dialect=postgresql.dialect()))
+    assert "patient.patient_fio ILIKE" in sql
+    assert "patient.patient_fio %%> " in sql
+    assert "ORDER BY word_similarity(" in sql
+
+    # Строки короче триграммы ищутся только как подстрока
+    condition, _ = _search_query("postgresql", "ив", Patient.patient_fio, Patient.patientid)
+    assert "%>" not in str(condition.compile(dialect=postgresql.dialect()))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from scipy.fft import next_fast_len
+from scipy.integrate import trapezoid
+
+from services.dsp import compute_spectrum, hrv_band_powers, multitaper_psd, welch_psd
+
+
+def sine(freq, fs=200.0, n=10_007, noise=0.1, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / fs
+    return np.sin(2 * np.pi * freq * t) + noise * rng.standard_normal(n)
+
+
+def modulated_rr(freq, beats=600):
+    # RR-интервалы (с) с синусоидальной модуляцией частоты freq (Гц)
+    rr = np.full(beats, 0.8)
+    for _ in range(3):  # Модуляция задается во времени, которое зависит от самих интервалов
+        rr = 0.8 + 0.05 * np.sin(2 * np.pi * freq * np.cumsum(rr))
+    return rr
+
+
+def test_spectrum_uses_fast_length_and_real_frequencies():
+    data = sine(12.5)
+
+    freqs, spectrum = compute_spectrum(data, fs=200.0)
+
+    nfft = next_fast_len(data.size, real=True)
+    assert freqs.size == nfft // 2 + 1
+    assert freqs[1] == pytest.approx(200.0 / nfft)
+    assert freqs[np.argmax(spectrum)] == pytest.approx(12.5, abs=0.05)
+
+
+@pytest.mark.parametrize("estimator", [welch_psd, multitaper_psd])
+def test_psd_integrates_to_signal_variance(estimator):
+    data = sine(12.5)
+
+    freqs, psd = estimator(data, fs=200.0)
+
+    assert freqs[np.argmax(psd)] == pytest.approx(12.5, abs=1.0)
+    assert trapezoid(psd, freqs) == pytest.approx(data.var(), rel=0.05)
+
+
+def test_spectra_are_cached_by_content_and_parameters():
+    data = sine(5.0)
+
+    freqs, spectrum = compute_spectrum(data, fs=200.0)
+
+    assert compute_spectrum(data.copy(), fs=200.0)[1] is spectrum
+    assert compute_spectrum(data, fs=100.0)[1] is not spectrum
+    assert compute_spectrum(data + 1.0, fs=200.0)[1] is not spectrum
+    assert not spectrum.flags.writeable
+
+
+@pytest.mark.parametrize("method", ["welch", "multitaper"])
+def test_hrv_band_powers_locate_modulation(method):
+    lf_modulated = hrv_band_powers(modulated_rr(0.1), method=method)
+    hf_modulated = hrv_band_powers(modulated_rr(0.25), method=method)
+
+    assert lf_modulated.lf > 10 * lf_modulated.hf
+    assert hf_modulated.hf > 10 * hf_modulated.lf
+    assert hf_modulated.lf_hf < 1 < lf_modulated.lf_hf
+
+
+def test_hrv_requires_two_intervals():
+    with pytest.raises(ValueError):
+        hrv_band_powers([0.8])
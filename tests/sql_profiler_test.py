@@ -0,0 +1,58 @@
+import pytest
+
+from database.models import Sessions
+from database.session import SqlProfiler, fingerprint_statement
+from tests.conftest import populate
+
+
+@pytest.fixture
+def profiler():
+    profiler = SqlProfiler(slow_query_ms=float("inf"), explain=False, n_plus_one_threshold=5)
+    profiler.enable()
+    yield profiler
+    profiler.disable()
+
+
+def test_fingerprint_ignores_values():
+    first = fingerprint_statement("SELECT * FROM patient WHERE patientid = 1 AND patient_fio = 'Иванов'")
+    second = fingerprint_statement("SELECT *\n  FROM patient WHERE patientid = 22 AND patient_fio = 'Петров'")
+    in_list = fingerprint_statement("SELECT * FROM patient WHERE patientid IN (%(id_1)s, %(id_2)s, %(id_3)s)")
+
+    assert first == second == "SELECT * FROM patient WHERE patientid = ? AND patient_fio = ?"
+    assert in_list == "SELECT * FROM patient WHERE patientid IN (?...)"
+
+
+def test_lazy_loads_in_one_action_are_reported_as_n_plus_one(profiler, db):
+    populate(db, sessions=8, samples=0)
+    db.expunge_all()
+
+    with profiler.action("Загрузка сеансов"):
+        sessions = db.query(Sessions).all()
+        with profiler.action("вложенное действие"):  # Учитывается как часть внешнего
+            names = [session.patient.patient_fio for session in sessions]
+
+    assert len(names) == 8
+    stats = profiler.actions["Загрузка сеансов"]
+    assert (stats.runs, stats.statements) == (1, 9)
+    assert "вложенное действие" not in profiler.actions
+
+    [suspect] = profiler.n_plus_one_suspects()
+    assert suspect["action"] == "Загрузка сеансов"
+    assert suspect["max_repeats"] == 8
+    assert "FROM patient" in suspect["fingerprint"]
+    assert "Признаки N+1" in profiler.report()
+
+
+def test_slow_queries_are_logged_with_plan(profiler, db):
+    populate(db, sessions=2, samples=0)
+    profiler.slow_query_ms = 0
+    profiler.explain = True
+
+    rows = db.query(Sessions).filter(Sessions.patientid == 2).all()
+    db.query(Sessions).filter(Sessions.patientid == 1).all()
+
+    # Результат основного запроса не теряется, план записывается один раз на отпечаток
+    assert [session.sessionid for session in rows] == [2]
+    plans = [query["plan"] for query in profiler.slow_queries if "FROM session" in query["fingerprint"]]
+    assert len(plans) == 2
+    assert "session" in plans[0] and plans[1] is None
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+pytest.importorskip("matplotlib")
+
+from ui.widgets.plots.creating_time_series_widget import CreatingTimeSeriesWidget
+
+
+def test_hrv_error_is_shown_in_info_label(qt_app, capsys):
+    # Одного RR-интервала недостаточно для расчета показателей ВСР
+    widget = CreatingTimeSeriesWidget(None, np.array([0.8]), np.array([1.0]), 1)
+    widget.show_info()
+
+    assert "Показатели ВСР не рассчитаны" in widget.info_label.text()
+    assert capsys.readouterr().out == ""
+    widget.close()
+
+
+def test_hrv_powers_are_shown_in_info_label(qt_app, capsys):
+    t = np.arange(600)
+    widget = CreatingTimeSeriesWidget(None, 0.8 + 0.05 * np.sin(2 * np.pi * 0.1 * t * 0.8), np.ones(600), 1)
+    widget.update_data(widget.rr_times, widget.amplitudes, 2)
+    widget.show_info()
+
+    assert "LF/HF" in widget.info_label.text()
+    assert capsys.readouterr().out == ""
+    widget.close()
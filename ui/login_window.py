@@ -66,6 +66,7 @@ class LoginWindow(QMainWindow):
         # Проверяем учетные данные
         db_session = authenticate_user(username, password)
         if db_session:
+            db_session.close()  # Соединение возвращается в общий пул пользователя
             self.error_label.setText("")  # Очистка ошибок
             self.open_main_window(username, password)
         else:
@@ -1,10 +1,11 @@
 from PyQt6.QtWidgets import QMainWindow, QLabel, QVBoxLayout, QWidget, QPushButton, QMessageBox, QTabWidget
 
-from database.session import authenticate_user, get_user_accessible_tables
+from database.session import authenticate_user, dispose_user_engines, get_user_accessible_tables
 from services.theme_switcher import ThemeSwitcher
 from ui.widgets.activitytype_widget import ActivityTypeWidget
 from ui.widgets.analysisresults_widget import AnalysisResultWidget
 from ui.widgets.chroniccondition_widget import ChronicConditionWidget
+from ui.widgets.diagnostics_widget import DiagnosticsWidget
 from ui.widgets.diagnosis_widget import DiagnosisWidget
 from ui.widgets.doctorschedule_widget import DoctorScheduleWidget
 from ui.widgets.ecs_widget import ECSDataWidget
@@ -21,7 +22,7 @@ class MainWindow(QMainWindow):
         # Словарь для перевода названий таблиц на русский
         self.table_names_translation = {
             "activity_type": "Виды деятельностей",
-            "analysis_result": "Результаты анализа",
+            "analysis_series": "Результаты анализа",
             "chronic_condition": "Хронические заболевания",
             "diagnosis": "Диагнозы",
             "doctor": "Врач",
@@ -73,7 +74,9 @@ class MainWindow(QMainWindow):
 
         # Создаем сессию для получения доступных таблиц
         try:
-            self.db_session = authenticate_user(username, password)  # Инициализируем self.db_session
+            # Сессия создается один раз и переиспользуется при возврате к вкладкам
+            if getattr(self, "db_session", None) is None:
+                self.db_session = authenticate_user(username, password)
             if not self.db_session:
                 raise Exception("Не удалось создать сессию базы данных.")
 
@@ -88,8 +91,11 @@ class MainWindow(QMainWindow):
             for table_name in accessible_tables:
                 if table_name == 'activity_type':
                     tab_content = ActivityTypeWidget(self.db_session)
-                elif table_name == 'analysis_result':
+                elif table_name == 'analysis_series':
+                    # Вкладка показывает и сеансы со строками старого формата analysis_result
                     tab_content = AnalysisResultWidget(self.db_session)
+                elif table_name == 'analysis_result':
+                    continue
                 elif table_name == 'chronic_condition':
                     tab_content = ChronicConditionWidget(self.db_session)
                 elif table_name == 'diagnosis':
@@ -113,6 +119,9 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {e}")
 
+        # Замеры времени сервисных функций и этапов обработки
+        self.tab_widget.addTab(DiagnosticsWidget(), "Диагностика")
+
         # Кнопка "В главное меню"
         self.main_menu_button = QPushButton("В главное меню")
         self.main_menu_button.clicked.connect(self.show_main_menu)
@@ -168,6 +177,12 @@ class MainWindow(QMainWindow):
 
     def logout(self):
         """Выход из системы."""
+        # Закрываем сессию и пул соединений пользователя
+        if getattr(self, "db_session", None) is not None:
+            self.db_session.close()
+            self.db_session = None
+        dispose_user_engines(self.username)
+
         self.close()
         from ui.login_window import LoginWindow
         self.login_window = LoginWindow()
@@ -1,6 +1,13 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, \
+from functools import partial
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTableView, \
     QMessageBox
 
+from services.analysis_service import get_analysis_series_page
+from services.async_db import AsyncDb
+from ui.widgets.paged_table_model import PagedTableModel
+
+
 class AnalysisResultWidget(QWidget):
     def __init__(self, db_session):
         super().__init__()
@@ -23,11 +30,20 @@ class AnalysisResultWidget(QWidget):
         layout.addLayout(search_layout)
 
         # Таблица данных
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)  # ID, Дата сессии, Начало, ФИО пациента, ФИО врача, ЭКС данные, ПГ данные
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Дата сессии", "Начало", "ФИО пациента", "ФИО врача", "ЭКС данные", "ПГ данные"
-        ])
+        self.table = QTableView()
+        self.async_db = AsyncDb.for_session(self.db_session, parent=self)
+        self.model = PagedTableModel(self.async_db, get_analysis_series_page, columns=[
+            ("sessionid", "ID"),
+            ("session_date", "Дата сессии"),
+            ("session_starttime", "Начало"),
+            ("patient_fio", "ФИО пациента"),
+            ("doctor_fio", "ФИО врача"),
+            ("sample_count", "Отсчетов"),
+            ("sample_rate", "Частота, Гц"),
+            ("dtype", "Тип данных"),
+        ], key="sessionid")
+        self.model.failed.connect(self.on_load_failed)
+        self.table.setModel(self.model)
         self.table.setColumnHidden(0, True)  # Скрываем столбец ID
         layout.addWidget(self.table)
 
@@ -37,34 +53,22 @@ class AnalysisResultWidget(QWidget):
         self.load_data()
 
     def load_data(self, patient_fio=None):
-        """Загрузка данных analysis_result с возможностью фильтрации по пациенту."""
+        """Загрузка обработанных рядов (в том числе старого формата) с возможностью фильтрации по пациенту."""
         try:
-            from services.analysis_service import get_analysis_results_by_patient_fio
-
-            # Если ФИО не указано, загружаем все данные
-            if not patient_fio:
-                analysis_results = get_analysis_results_by_patient_fio(self.db_session, "%")  # Используем % для частичного совпадения
-            else:
-                analysis_results = get_analysis_results_by_patient_fio(self.db_session, f"%{patient_fio}%")
-
-            # Очищаем таблицу
-            self.table.clearContents()
-            self.table.setRowCount(len(analysis_results))
-
-            # Заполняем таблицу данными
-            for row, data in enumerate(analysis_results):
-                self.table.setItem(row, 0, QTableWidgetItem(str(data["analysisresultid"])))
-                self.table.setItem(row, 1, QTableWidgetItem(str(data["session_date"])))
-                self.table.setItem(row, 2, QTableWidgetItem(str(data["session_starttime"])))
-                self.table.setItem(row, 3, QTableWidgetItem(data["patient_fio"]))
-                self.table.setItem(row, 4, QTableWidgetItem(data["doctor_fio"]))
-                self.table.setItem(row, 5, QTableWidgetItem(str(data["processed_ecs_data"])))
-                self.table.setItem(row, 6, QTableWidgetItem(str(data["processed_pg_data"])))
+            # Строки подгружаются страницами в фоне при прокрутке таблицы
+            self.model.reset(partial(get_analysis_series_page, patient_fio=patient_fio))
+            if self.model.canFetchMore():
+                self.model.fetchMore()
 
         except Exception as e:
             print(f"Ошибка при загрузке данных: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {e}")
 
+    def on_load_failed(self, message):
+        """Ошибка фоновой загрузки страницы."""
+        print(f"Ошибка при загрузке данных: {message}")
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {message}")
+
     def filter_by_patient(self):
         """Фильтрация данных по ФИО пациента."""
         query = self.search_input.text().strip()
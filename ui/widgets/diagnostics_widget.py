@@ -0,0 +1,123 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget, QTableWidgetItem, \
+    QMessageBox, QFileDialog, QHeaderView
+
+from database.session import sql_profiler
+from services import instrumentation
+
+
+# Период обновления таблицы замеров, мс
+REFRESH_INTERVAL_MS = 2000
+
+
+class DiagnosticsWidget(QWidget):
+    """Таблица замеров сервисных функций и этапов обработки (самые затратные — сверху)."""
+
+    COLUMNS = [
+        ("Функция", None),
+        ("Вызовы", "calls"),
+        ("Всего, мс", "total_ms"),
+        ("Среднее, мс", "mean_ms"),
+        ("p50, мс", "p50_ms"),
+        ("p95, мс", "p95_ms"),
+        ("Макс., мс", "max_ms"),
+        ("Строк", "rows"),
+        ("SQL на вызов", "statements_per_call"),
+        ("Ошибки", "errors"),
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.init_ui()
+
+        # Таблица обновляется, только пока вкладка видна
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("Обновить")
+        refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_button)
+
+        reset_button = QPushButton("Сбросить")
+        reset_button.clicked.connect(self.reset_metrics)
+        button_layout.addWidget(reset_button)
+
+        save_button = QPushButton("Сохранить JSON")
+        save_button.clicked.connect(self.save_json)
+        button_layout.addWidget(save_button)
+
+        # Отчет профилировщика SQL (доступен при запуске с BIOSIGNALS_SQL_PROFILE=1)
+        self.sql_report_button = QPushButton("Отчет SQL")
+        self.sql_report_button.clicked.connect(self.show_sql_report)
+        self.sql_report_button.setEnabled(sql_profiler.enabled)
+        button_layout.addWidget(self.sql_report_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """Заполнение таблицы текущими замерами."""
+        metrics = sorted(instrumentation.snapshot().items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        if instrumentation.is_installed():
+            self.status_label.setText(f"Функций с замерами: {len(metrics)}")
+        else:
+            self.status_label.setText("Замеры отключены (BIOSIGNALS_INSTRUMENTATION=0)")
+
+        self.table.setRowCount(len(metrics))
+        for row, (name, stats) in enumerate(metrics):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for column, (_, key) in enumerate(self.COLUMNS[1:], start=1):
+                value = stats[key]
+                text = f"{value:.2f}" if isinstance(value, float) else str(value)
+                self.table.setItem(row, column, QTableWidgetItem(text))
+
+    def reset_metrics(self):
+        instrumentation.reset()
+        sql_profiler.reset()
+        self.refresh()
+
+    def show_sql_report(self):
+        """Отчет профилировщика SQL: частые и медленные запросы, признаки N+1."""
+        suspects = sql_profiler.n_plus_one_suspects()
+        message = QMessageBox(self)
+        message.setWindowTitle("Отчет SQL")
+        message.setText(
+            f"Медленных запросов: {len(sql_profiler.slow_queries)}\n"
+            f"Признаков N+1: {len(suspects)}"
+        )
+        message.setDetailedText(sql_profiler.report())
+        message.exec()
+
+    def save_json(self):
+        """Сохранение замеров в JSON-файл."""
+        path, _ = QFileDialog.getSaveFileName(self, "Сохранить замеры", "metrics.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            instrumentation.dump_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить замеры: {e}")
@@ -1,7 +1,12 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, QTableWidget, QTableWidgetItem, \
+from functools import partial
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, QTableView, \
     QMessageBox, QDialog
 
+from services.async_db import AsyncDb
+from services.ecs_service import get_ecs_data_page
 from ui.widgets.import_data_widget import ImportDataWidget
+from ui.widgets.paged_table_model import PagedTableModel
 
 
 class ECSDataWidget(QWidget):
@@ -26,8 +31,21 @@ class ECSDataWidget(QWidget):
         layout.addLayout(search_layout)
 
         # Таблица данных
-        self.table = QTableWidget()
-        self.load_data()  # Загружаем все данные по умолчанию
+        self.table = QTableView()
+        self.async_db = AsyncDb.for_session(self.db_session, parent=self)
+        self.model = PagedTableModel(self.async_db, get_ecs_data_page, columns=[
+            ("ecsdataid", "ID"),
+            ("session_date", "Дата сессии"),
+            ("session_starttime", "Начало"),
+            ("patient_fio", "ФИО пациента"),
+            ("doctor_fio", "ФИО врача"),
+            ("rr_length", "Длина RR"),
+            ("rr_time", "Время RR"),
+        ], key="ecsdataid")
+        self.model.failed.connect(self.on_load_failed)
+        self.table.setModel(self.model)
+        self.table.setColumnHidden(0, True)  # Скрываем столбец ID
+        self.load_data()  # Загружаем первую страницу данных
         layout.addWidget(self.table)
 
         # Кнопка "Добавить"
@@ -63,41 +81,20 @@ class ECSDataWidget(QWidget):
     def load_data(self, patient_fio=None):
         """Загрузка данных ECS_data с возможностью фильтрации по пациенту."""
         try:
-            from services.ecs_service import get_ecs_data_with_details
-
-            # Получаем данные ECS_data
-            if patient_fio:
-                ecs_data = [
-                    data for data in get_ecs_data_with_details(self.db_session)
-                    if data["patient_fio"] == patient_fio
-                ]
-            else:
-                ecs_data = get_ecs_data_with_details(self.db_session)
-
-            # Очищаем таблицу
-            self.table.clearContents()
-            self.table.setRowCount(len(ecs_data))
-            self.table.setColumnCount(7)
-            self.table.setHorizontalHeaderLabels([
-                "ID", "Дата сессии", "Начало", "ФИО пациента", "ФИО врача", "Длина RR", "Время RR"
-            ])
-
-            # Заполняем таблицу данными
-            for row, data in enumerate(ecs_data):
-                self.table.setItem(row, 0, QTableWidgetItem(str(data["ecsdataid"])))
-                self.table.setItem(row, 1, QTableWidgetItem(str(data["session_date"])))
-                self.table.setItem(row, 2, QTableWidgetItem(str(data["session_starttime"])))
-                self.table.setItem(row, 3, QTableWidgetItem(data["patient_fio"]))
-                self.table.setItem(row, 4, QTableWidgetItem(data["doctor_fio"]))
-                self.table.setItem(row, 5, QTableWidgetItem(str(data["rr_length"])))
-                self.table.setItem(row, 6, QTableWidgetItem(str(data["rr_time"])))
-
-            self.table.setColumnHidden(0, True)  # Скрываем столбец ID
+            # Строки подгружаются страницами в фоне при прокрутке таблицы
+            self.model.reset(partial(get_ecs_data_page, patient_fio=patient_fio))
+            if self.model.canFetchMore():
+                self.model.fetchMore()
 
         except Exception as e:
             print(f"Ошибка при загрузке данных: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {e}")
 
+    def on_load_failed(self, message):
+        """Ошибка фоновой загрузки страницы."""
+        print(f"Ошибка при загрузке данных: {message}")
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {message}")
+
     def filter_by_patient(self):
         """Фильтрация данных по выбранному пациенту."""
         selected_patient = self.patient_combo.currentText()
@@ -1,14 +1,50 @@
 import os
 
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QPushButton, QMessageBox, QDialog, QFileDialog
-from PyQt6.QtCore import Qt  # Для доступа к флагам
-from sqlalchemy import text
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QPushButton, \
+    QMessageBox, QDialog, QFileDialog, QProgressBar
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal  # Для доступа к флагам
+from sqlalchemy.orm import Session
+
+from services.import_service import import_signal_file, replace_session_signals
+
+
+class ImportWorker(QObject):
+    """Импорт файла в отдельном потоке с собственной сессией базы данных."""
+    progress = pyqtSignal(int)  # Процент обработанного файла
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, bind, session_id, file_path, replace=False):
+        super().__init__()
+        self.bind = bind
+        self.session_id = session_id
+        self.file_path = file_path
+        self.replace = replace
+
+    def run(self):
+        # Сессия SQLAlchemy не потокобезопасна, поэтому поток открывает свою
+        db = Session(bind=self.bind, autoflush=False)
+        try:
+            # При перезаписи старые сигналы удаляются в транзакции импорта
+            load = replace_session_signals if self.replace else import_signal_file
+            result = load(db, self.session_id, self.file_path, progress=self.report_progress)
+            self.finished.emit(result)
+        except Exception as e:
+            print(f"Ошибка при импорте данных: {e}")
+            self.failed.emit(str(e))
+        finally:
+            db.close()
+
+    def report_progress(self, done, total):
+        self.progress.emit(int(done * 100 / total) if total else 100)
 
 
 class ImportDataWidget(QDialog):
     def __init__(self, db_session, parent=None):
         super().__init__(parent)
         self.db_session = db_session
+        self.import_thread = None
+        self.import_worker = None
         self.init_ui()
 
     def init_ui(self):
@@ -35,14 +71,20 @@ class ImportDataWidget(QDialog):
         session_layout.addWidget(self.session_combo)
         layout.addLayout(session_layout)
 
+        # Ход импорта
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
         # Кнопки "Добавить" и "Отмена"
         button_layout = QHBoxLayout()
-        add_button = QPushButton("Добавить")
-        add_button.clicked.connect(self.import_data)
-        cancel_button = QPushButton("Отмена")
-        cancel_button.clicked.connect(self.reject)  # Закрывает диалог с результатом Rejected
-        button_layout.addWidget(add_button)
-        button_layout.addWidget(cancel_button)
+        self.add_button = QPushButton("Добавить")
+        self.add_button.clicked.connect(self.import_data)
+        self.cancel_button = QPushButton("Отмена")
+        self.cancel_button.clicked.connect(self.reject)  # Закрывает диалог с результатом Rejected
+        button_layout.addWidget(self.add_button)
+        button_layout.addWidget(self.cancel_button)
         layout.addLayout(button_layout)
 
         self.setLayout(layout)
@@ -116,15 +158,12 @@ class ImportDataWidget(QDialog):
             QMessageBox.warning(self, "Ошибка", "Файл не найден.")
             return
 
+        replace = False
         try:
             # Проверяем, есть ли уже данные для указанного сеанса
-            from services.ecs_service import get_ecs_data_by_session_id, delete_ecs_data_by_session_id
-            from services.pg_service import get_pg_data_by_session_id, delete_pg_data_by_session_id
-
-            existing_ecs_data = get_ecs_data_by_session_id(self.db_session, session_id)
-            existing_pg_data = get_pg_data_by_session_id(self.db_session, session_id)
+            from services.signal_service import session_has_signals
 
-            if existing_ecs_data or existing_pg_data:
+            if session_has_signals(self.db_session, session_id):
                 # Если данные уже существуют, спрашиваем пользователя, хочет ли он их перезаписать
                 reply = QMessageBox.question(
                     self,
@@ -138,23 +177,54 @@ class ImportDataWidget(QDialog):
                     # Если пользователь отказался, выходим из метода
                     return
 
-                # Если пользователь согласился, удаляем старые данные
-                delete_ecs_data_by_session_id(self.db_session, session_id)
-                delete_pg_data_by_session_id(self.db_session, session_id)
-
-            # Добавляем новые данные
-            sql_query = text("""
-            SELECT import_data_from_file(:file_path, :session_id);
-            """)
-            self.db_session.execute(sql_query, {"file_path": file_path, "session_id": session_id})
-            self.db_session.commit()
-
-            QMessageBox.information(self, "Успех", "Данные успешно импортированы!")
-
-            # Закрываем диалоговое окно после успешного импорта
-            self.accept()
+                # Старые данные удаляются вместе с загрузкой новых, одной транзакцией
+                replace = True
 
         except Exception as e:
             self.db_session.rollback()  # Откатываем транзакцию в случае ошибки
             print(f"Ошибка при импорте данных: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось импортировать данные: {e}")
+            return
+
+        # Разбор файла и запись данных выполняются в отдельном потоке
+        self.start_import(session_id, file_path, replace)
+
+    def start_import(self, session_id, file_path, replace=False):
+        """Запуск импорта в фоновом потоке с отображением хода выполнения."""
+        self.add_button.setEnabled(False)
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+
+        self.import_thread = QThread(self)
+        self.import_worker = ImportWorker(self.db_session.get_bind(), session_id, file_path, replace)
+        self.import_worker.moveToThread(self.import_thread)
+        self.import_thread.started.connect(self.import_worker.run)
+        self.import_worker.progress.connect(self.progress_bar.setValue)
+        self.import_worker.finished.connect(self.on_import_finished)
+        self.import_worker.failed.connect(self.on_import_failed)
+        self.import_worker.finished.connect(self.import_thread.quit)
+        self.import_worker.failed.connect(self.import_thread.quit)
+        self.import_thread.start()
+
+    def on_import_finished(self, result):
+        """Завершение импорта: сообщение пользователю и закрытие диалога."""
+        self.progress_bar.setValue(100)
+        print(f"Импортировано {result['rows']} отсчетов за {result['elapsed']:.2f} с")
+        QMessageBox.information(self, "Успех", f"Данные успешно импортированы! Отсчетов: {result['rows']}")
+
+        # Закрываем диалоговое окно после успешного импорта
+        self.accept()
+
+    def on_import_failed(self, message):
+        """Ошибка импорта: изменения уже откачены, диалог остается открытым."""
+        self.add_button.setEnabled(True)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        QMessageBox.critical(self, "Ошибка", f"Не удалось импортировать данные: {message}")
+
+    def reject(self):
+        """Диалог нельзя закрыть, пока идет импорт."""
+        if self.import_thread is not None and self.import_thread.isRunning():
+            return
+        super().reject()
@@ -0,0 +1,96 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Ленивая модель таблицы: строки подгружаются страницами по ключу
+    при прокрутке представления (canFetchMore/fetchMore).
+    Страницы запрашиваются в фоне через AsyncDb, интерфейс не блокируется.
+    """
+    failed = pyqtSignal(str)  # Ошибка загрузки страницы
+
+    def __init__(self, async_db, fetch_page, columns, key, page_size=500, parent=None):
+        """
+        async_db - фасад фоновых запросов (services.async_db.AsyncDb);
+        fetch_page(db, after_id, limit) - функция сервиса, возвращающая страницу строк;
+        columns - список пар (ключ столбца, заголовок);
+        key - столбец, по которому выполняется постраничная выборка.
+        """
+        super().__init__(parent)
+        self.async_db = async_db
+        self.fetch_page = fetch_page
+        self.columns = columns
+        self.key = key
+        self.page_size = page_size
+        self.rows = []
+        self.last_id = None
+        self.exhausted = False
+        self.loading = False
+
+    def reset(self, fetch_page=None):
+        """Сброс загруженных строк (например, при смене фильтра); запрос старой страницы отменяется."""
+        self.async_db.cancel(self)
+        self.beginResetModel()
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+        self.rows = []
+        self.last_id = None
+        self.exhausted = False
+        self.loading = False
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        value = self.rows[index.row()][self.columns[index.column()][0]]
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][1]
+        return str(section + 1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self.exhausted and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted or self.loading:
+            return
+        self.loading = True
+        self.async_db.submit(
+            self.fetch_page, self.last_id, self.page_size,
+            on_result=self.append_page, on_error=self.on_fetch_failed, key=self,
+        )
+
+    def on_fetch_failed(self, message):
+        # Повторные запросы прекращаются до следующего reset()
+        self.loading = False
+        self.exhausted = True
+        self.failed.emit(message)
+
+    def append_page(self, page):
+        """Добавление загруженной страницы (вызывается в потоке интерфейса)."""
+        self.loading = False
+        if len(page) < self.page_size:
+            self.exhausted = True
+        if not page:
+            return
+
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+        self.rows.extend(page)
+        self.last_id = page[-1][self.key]
+        self.endInsertRows()
@@ -1,5 +1,6 @@
+from PyQt6.QtCore import QStringListModel
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QLineEdit, \
-    QHBoxLayout, QInputDialog, QComboBox
+    QHBoxLayout, QInputDialog, QComboBox, QCompleter
 
 from ui.widgets.date_widget import DateInputDialog
 
@@ -22,6 +23,12 @@ class PatientWidget(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Введите ФИО для поиска")
         self.search_input.returnPressed.connect(self.search_patients)  # Обработка Enter
+        # Подсказки ФИО по мере ввода
+        self.completer_model = QStringListModel(self)
+        completer = QCompleter(self.completer_model, self)
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.search_input.setCompleter(completer)
+        self.search_input.textEdited.connect(self.update_suggestions)
         search_button = QPushButton("Поиск")
         search_button.clicked.connect(self.search_patients)
         search_layout.addWidget(self.search_input)
@@ -227,10 +234,20 @@ class PatientWidget(QWidget):
             print(f"Ошибка при удалении пациента: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось удалить пациента: {e}")
 
+    def update_suggestions(self, text):
+        """Подсказки ФИО для введенной части (результаты кэшируются сервисом поиска)."""
+        try:
+            from services.search_service import search_patients
+
+            patients = search_patients(self.db_session, text)
+            self.completer_model.setStringList([patient["patient_fio"] for patient in patients])
+        except Exception as e:
+            print(f"Ошибка при подборе подсказок: {e}")
+
     def search_patients(self):
         """Ищет пациентов по ФИО."""
         try:
-            from services.patient_service import search_patients_by_fio, get_patients_with_details
+            from services.search_service import search_patients
 
             fio = self.search_input.text().strip()
             if not fio:
@@ -238,7 +255,7 @@ class PatientWidget(QWidget):
                 self.load_data()
                 return
 
-            patients = search_patients_by_fio(self.db_session, fio)
+            patients = search_patients(self.db_session, fio, limit=None)  # В таблицу выводятся все совпадения
             if not patients:
                 QMessageBox.information(self, "Результат", "Пациенты не найдены.")
                 return
@@ -0,0 +1,40 @@
+class BlitManager:
+    """
+    Перерисовка подвижных элементов графика без полной отрисовки фигуры.
+    После каждой полной отрисовки сохраняется статический фон (оси, сигналы);
+    подвижные элементы (animated=True) рисуются поверх него и выводятся через blit.
+    """
+
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        for artist in artists:
+            self.add_artist(artist)
+
+        # Обработчик хранится по слабой ссылке: менеджер живет, пока на него ссылается виджет
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def add_artist(self, artist):
+        """Подвижный элемент: не входит в фон и перерисовывается методом update."""
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def on_draw(self, event):
+        """Полная отрисовка: сохранение нового фона и вывод подвижных элементов."""
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+
+    def update(self):
+        """Перерисовка подвижных элементов поверх сохраненного фона."""
+        if self.background is None:
+            # Фигура еще не отрисована: фон будет сохранен при полной отрисовке
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
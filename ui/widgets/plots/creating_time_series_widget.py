@@ -2,9 +2,9 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLab
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.interpolate import interp1d
 
-from database.models import Analysis_result
+from services.dsp import DEFAULT_INTERPOLATION_STEP, beat_times, hrv_band_powers, interpolate_series
+from ui.widgets.plots.decimated_line import plot_decimated
 
 
 class CreatingTimeSeriesWidget(QWidget):
@@ -52,7 +52,7 @@ class CreatingTimeSeriesWidget(QWidget):
         """Инициализация графика без интерполяции."""
         try:
             # Шаг 1: Формирование временного ряда R-зубцов
-            time_series = np.cumsum([0] + self.rr_times)  # Моменты времени R-зубцов
+            time_series = beat_times(self.rr_times)  # Моменты времени R-зубцов
 
             # Без интерполяции
             self.time_series_rr = self.rr_times
@@ -62,9 +62,7 @@ class CreatingTimeSeriesWidget(QWidget):
             self.plot_data(time_series)
 
             # Обновление информации
-            rr_intervals = np.diff(self.time_series_rr)
-            delta_u = np.diff(self.time_series_pg)
-            self.info_label.setText(f"RR-интервалы: {len(rr_intervals)} значений\nDelta U: {len(delta_u)} значений")
+            self.show_info()
 
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось инициализировать график: {e}")
@@ -76,41 +74,46 @@ class CreatingTimeSeriesWidget(QWidget):
                 # Если интерполяция не выбрана, возвращаем исходные данные
                 self.time_series_rr = self.rr_times
                 self.time_series_pg = self.amplitudes
-                time_series = np.cumsum([0] + self.rr_times)  # Исходная временная сетка
+                time_series = beat_times(self.rr_times)  # Исходная временная сетка
             else:
-                # Если интерполяция выбрана, применяем её
-                time_series_raw = np.cumsum([0] + self.rr_times)  # Исходная временная сетка
-                step = 0.1  # Шаг интерполяции
-                new_time_rr = np.arange(time_series_raw[0], time_series_raw[-1], step)
-
-                # Интерполяция RR-интервалов
-                interp_func_rr = interp1d(time_series_raw, self.rr_times, kind='linear', fill_value="extrapolate")
-                self.time_series_rr = interp_func_rr(new_time_rr)
-
-                # Интерполяция амплитуд дыхания
-                interp_func_pg = interp1d(time_series_raw, self.amplitudes, kind='linear', fill_value="extrapolate")
-                self.time_series_pg = interp_func_pg(new_time_rr)
-
-                time_series = new_time_rr  # Новая временная сетка
+                # Если интерполяция выбрана, применяем её (шаг 0.1 с)
+                time_series, self.time_series_rr, self.time_series_pg = interpolate_series(
+                    self.rr_times, self.amplitudes
+                )
 
             # Обновление графика
             self.plot_data(time_series)
 
             # Обновление информации
-            rr_intervals = np.diff(self.time_series_rr)
-            delta_u = np.diff(self.time_series_pg)
-            self.info_label.setText(f"RR-интервалы: {len(rr_intervals)} значений\nDelta U: {len(delta_u)} значений")
+            self.show_info()
 
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось применить интерполяцию: {e}")
 
+    def show_info(self):
+        """Размеры рядов и спектральные показатели ВСР эпохи."""
+        rr_intervals = np.diff(self.time_series_rr)
+        delta_u = np.diff(self.time_series_pg)
+        text = f"RR-интервалы: {len(rr_intervals)} значений\nDelta U: {len(delta_u)} значений"
+
+        try:
+            # Показатели ВСР рассчитываются по исходным RR-интервалам эпохи (с), мс²
+            hrv = hrv_band_powers(self.rr_times)
+            text += (
+                f"\nВСР: VLF {hrv.vlf * 1e6:.1f} мс², LF {hrv.lf * 1e6:.1f} мс², "
+                f"HF {hrv.hf * 1e6:.1f} мс², LF/HF {hrv.lf_hf:.2f}"
+            )
+        except ValueError as e:
+            text += f"\nПоказатели ВСР не рассчитаны: {e}"
+        self.info_label.setText(text)
+
     def plot_data(self, time_series):
         """Отображение временных рядов на графике."""
         self.ax.clear()
 
         # Отображение данных с учетом временной сетки
-        self.ax.plot(time_series, self.time_series_rr, label="RR-интервалы (ЭКС)", color="red")
-        self.ax.plot(time_series, self.time_series_pg, label="Амплитуды дыхания", color="blue")
+        plot_decimated(self.ax, self.time_series_rr, time_series, label="RR-интервалы (ЭКС)", color="red")
+        plot_decimated(self.ax, self.time_series_pg, time_series, label="Амплитуды дыхания", color="blue")
 
         # Настройка графика
         self.ax.set_title("Временные ряды")
@@ -126,39 +129,24 @@ class CreatingTimeSeriesWidget(QWidget):
             if self.time_series_rr is None or self.time_series_pg is None:
                 raise ValueError("Данные не обработаны.")
 
-            # Округление данных до 4 знаков после запятой
-            processed_ecs_data = [round(value, 4) for value in self.time_series_rr]
-            processed_pg_data = [round(value, 4) for value in self.time_series_pg]
-
-            from services.analysis_service import (
-                create_analysis_result,
-                delete_analysis_results_by_sessionid,
-            )
-
-            # Проверяем, существуют ли уже данные для этого сеанса
-            existing_records_count = (
-                self.db_session.query(Analysis_result)
-                .filter(Analysis_result.sessionid == self.session_id)
-                .count()
+            from services.analysis_service import save_analysis_series
+
+            # Удаление старых и запись новых данных выполняются одной транзакцией
+            interpolate = self.interpolation_checkbox.isChecked()
+            result = save_analysis_series(
+                self.db_session,
+                self.session_id,
+                self.time_series_rr,
+                self.time_series_pg,
+                sample_rate=1 / DEFAULT_INTERPOLATION_STEP if interpolate else None,
+                params={"interpolate": interpolate, "interpolation_step": DEFAULT_INTERPOLATION_STEP},
             )
 
-            if existing_records_count > 0:
-                # Если данные существуют, удаляем их
-                delete_analysis_results_by_sessionid(self.db_session, self.session_id)
-                print(f"Удалено {existing_records_count} записей для session_id={self.session_id}")
-
-            # Добавляем новые записи
-            for ecs_value, pg_value in zip(processed_ecs_data, processed_pg_data):
-                create_analysis_result(
-                    db=self.db_session,
-                    sessionid=self.session_id,
-                    processed_ecs_data=ecs_value,
-                    processed_pg_data=pg_value,
-                )
-
             # Сообщаем пользователю о результате
-            if existing_records_count > 0:
-                QMessageBox.information(self, "Успех", "Данные успешно перезаписаны!")
+            if result["deleted"] > 0:
+                QMessageBox.information(
+                    self, "Успех", f"Данные успешно перезаписаны (удалено прежних записей: {result['deleted']})!"
+                )
             else:
                 QMessageBox.information(self, "Успех", "Данные успешно сохранены!")
 
@@ -170,7 +158,6 @@ class CreatingTimeSeriesWidget(QWidget):
         """
         Обновление данных и восстановление состояния виджета.
         """
-        print("Обновление данных в CreatingTimeSeriesWidget")
         # Обновляем исходные данные
         self.rr_times = rr_times
         self.amplitudes = amplitudes
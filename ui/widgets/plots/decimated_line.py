@@ -0,0 +1,48 @@
+from services.dsp import get_pyramid
+
+
+# Точек линии на пиксель ширины осей (минимум и максимум на каждый пиксель)
+POINTS_PER_PIXEL = 2
+
+# Минимальное количество точек (оси еще не размещены на экране)
+MIN_POINTS = 2000
+
+
+class DecimatedLine:
+    """
+    Линия matplotlib с прореживанием по минимуму и максимуму.
+    На график выводится около 2 точек на пиксель видимого участка;
+    при масштабировании, сдвиге и изменении размера участок прореживается
+    заново по закэшированной пирамиде сигнала.
+    """
+
+    def __init__(self, ax, y, x=None, **kwargs):
+        self.ax = ax
+        self.pyramid = get_pyramid(y, x)
+        xs, ys = self.pyramid.view(*self.pyramid.data_range(), self.max_points())
+        (self.line,) = ax.plot(xs, ys, **kwargs)
+        self.line.decimated_line = self  # Объект живет, пока линия находится на графике
+
+        # Обработчики хранятся по слабым ссылкам и отключаются вместе с объектом
+        ax.callbacks.connect("xlim_changed", self.update)
+        ax.figure.canvas.mpl_connect("resize_event", self.update)
+
+    def max_points(self):
+        return max(int(self.ax.bbox.width) * POINTS_PER_PIXEL, MIN_POINTS)
+
+    def set_data(self, y, x=None):
+        """Замена сигнала без пересоздания линии; отображается весь новый сигнал."""
+        self.pyramid = get_pyramid(y, x)
+        self.line.set_data(*self.pyramid.view(*self.pyramid.data_range(), self.max_points()))
+
+    def update(self, *args):
+        """Прореживание видимого участка (вызывается до перерисовки)."""
+        if self.line.axes is None or self.line.figure is None:
+            return
+        x0, x1 = sorted(self.ax.get_xlim())
+        self.line.set_data(*self.pyramid.view(x0, x1, self.max_points()))
+
+
+def plot_decimated(ax, y, x=None, **kwargs):
+    """Построение прореженной линии; возвращает объект Line2D, как ax.plot."""
+    return DecimatedLine(ax, y, x, **kwargs).line
@@ -1,7 +1,12 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QRadioButton, QMessageBox
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.patches import Rectangle
 import matplotlib.pyplot as plt
-import numpy as np
+
+from services.dsp import rank_epochs, validate_epoch
+from ui.widgets.plots.blit_manager import BlitManager
+from ui.widgets.plots.decimated_line import plot_decimated
+
 
 class EpochSelectionWidget(QWidget):
     def __init__(self, db_session, rr_times, amplitudes, session_id):
@@ -12,6 +17,7 @@ class EpochSelectionWidget(QWidget):
         self.selected_epoch_start = None  # Начало выбранной эпохи
         self.selected_epoch_end = None  # Конец выбранной эпохи
         self.is_manual_selection = True  # Флаг для ручного/автоматического выбора
+        self.drag_origin = None  # Точка захвата и границы эпохи при перетаскивании мышью
         self.session_id = session_id
         self.init_ui()
 
@@ -76,7 +82,7 @@ class EpochSelectionWidget(QWidget):
         self.auto_radio.toggled.connect(self.toggle_selection_mode)
 
         # Инициализация графика
-        self.plot_data()
+        self.init_plot()
 
     def toggle_selection_mode(self):
         """Переключение между ручным и автоматическим выбором."""
@@ -95,26 +101,23 @@ class EpochSelectionWidget(QWidget):
         """Автоматический выбор наиболее ровного участка сигнала."""
         try:
             cycle_count = int(self.cycle_count_input.text())
-            if cycle_count < 30 or cycle_count > len(self.rr_times):
-                raise ValueError("Количество кардиоциклов должно быть не менее 30 и не более длины сигнала.")
-
-            min_std = float('inf')  # Минимальное СКО
-            best_start_index = 0  # Индекс начала лучшего участка
-            signal_length = len(self.rr_times)
-
-            for i in range(signal_length - cycle_count + 1):
-                segment = self.rr_times[i:i + cycle_count]
-                std = np.std(segment)
-                mean = np.mean(segment)
-                outliers = [x for x in segment if abs(x - mean) > 3 * std]
 
-                if std < min_std and len(outliers) == 0:
-                    min_std = std
-                    best_start_index = i
-
-            self.selected_epoch_start = best_start_index
-            self.selected_epoch_end = best_start_index + cycle_count - 1
-            self.epoch_info_label.setText(f"Выбранный участок: {self.selected_epoch_start} - {self.selected_epoch_end}")
+            # Несколько непересекающихся кандидатов, упорядоченных по СКО
+            candidates = rank_epochs(self.rr_times, cycle_count, top_k=3)
+            if candidates:
+                start, end = candidates[0][0], candidates[0][1]
+            else:
+                start, end = 0, cycle_count - 1  # Все окна содержат выбросы
+
+            self.selected_epoch_start = start
+            self.selected_epoch_end = end
+            candidates_text = ", ".join(
+                f"{c_start} - {c_end} (СКО {c_std:.4f})" for c_start, c_end, c_std in candidates
+            )
+            self.epoch_info_label.setText(
+                f"Выбранный участок: {self.selected_epoch_start} - {self.selected_epoch_end}\n"
+                f"Кандидаты: {candidates_text or 'нет участков без выбросов'}"
+            )
             self.highlight_selected_epoch()
         except ValueError as e:
             QMessageBox.warning(self, "Ошибка", str(e))
@@ -127,10 +130,7 @@ class EpochSelectionWidget(QWidget):
                 end = int(self.end_index_input.text())
 
                 # Проверка корректности введенных значений
-                if start < 0 or end >= len(self.rr_times):
-                    raise ValueError("Индексы выходят за границы сигнала.")
-                if end - start + 1 < 30:
-                    raise ValueError("Выбранный участок должен содержать не менее 30 кардиоциклов.")
+                validate_epoch(start, end, len(self.rr_times))
 
                 self.selected_epoch_start = start
                 self.selected_epoch_end = end
@@ -141,22 +141,80 @@ class EpochSelectionWidget(QWidget):
         else:
             self.perform_auto_selection()
 
-    def plot_data(self):
-        """Отображение исходных данных на графике."""
-        self.ax.clear()
-        self.ax.plot(self.rr_times, label="RR-интервалы (ЭКС)", color="red")  # ЭКС — красный
-        self.ax.plot(self.amplitudes, label="Амплитуды дыхания", color="blue")  # Сигнал дыхания — синий
+    def init_plot(self):
+        """Создание линий сигналов и подвижного выделения эпохи (один раз)."""
+        self.rr_line = plot_decimated(self.ax, self.rr_times, label="RR-интервалы (ЭКС)", color="red")  # ЭКС — красный
+        self.amplitude_line = plot_decimated(
+            self.ax, self.amplitudes, label="Амплитуды дыхания", color="blue"  # Сигнал дыхания — синий
+        )
         self.ax.set_title("Выбор эпохи")
         self.ax.legend()
         self.ax.grid(True)  # Добавляем сетку
-        self.canvas.draw()
+
+        # Выделение эпохи: по x — индексы отсчетов, по y — вся высота осей
+        self.epoch_span = Rectangle(
+            (0, 0), 0, 1, transform=self.ax.get_xaxis_transform(), color="yellow", alpha=0.5, visible=False
+        )
+        self.ax.add_patch(self.epoch_span)
+
+        # Выделение перерисовывается поверх сохраненного фона, сигналы не перерисовываются
+        self.blit_manager = BlitManager(self.canvas, [self.epoch_span])
+
+        # Перетаскивание выделенной эпохи мышью
+        self.canvas.mpl_connect("button_press_event", self.on_press)
+        self.canvas.mpl_connect("motion_notify_event", self.on_motion)
+        self.canvas.mpl_connect("button_release_event", self.on_release)
+
+        self.canvas.draw_idle()
+
+    def plot_data(self):
+        """Обновление сигналов на графике (линии и выделение эпохи не пересоздаются)."""
+        self.rr_line.decimated_line.set_data(self.rr_times)
+        self.amplitude_line.decimated_line.set_data(self.amplitudes)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
 
     def highlight_selected_epoch(self):
-        """Выделение выбранной эпохи на графике."""
-        self.plot_data()
-        if self.selected_epoch_start is not None and self.selected_epoch_end is not None:
-            self.ax.axvspan(self.selected_epoch_start, self.selected_epoch_end, color='yellow', alpha=0.5)
-            self.canvas.draw()
+        """Выделение выбранной эпохи на графике (перерисовывается только выделение)."""
+        if self.selected_epoch_start is None or self.selected_epoch_end is None:
+            self.epoch_span.set_visible(False)
+        else:
+            self.epoch_span.set_x(self.selected_epoch_start)
+            self.epoch_span.set_width(self.selected_epoch_end - self.selected_epoch_start)
+            self.epoch_span.set_visible(True)
+        self.blit_manager.update()
+
+    def on_press(self, event):
+        """Захват выделенной эпохи левой кнопкой мыши."""
+        if event.inaxes is not self.ax or event.button != 1 or self.selected_epoch_start is None:
+            return
+        if self.selected_epoch_start <= event.xdata <= self.selected_epoch_end:
+            self.drag_origin = (event.xdata, self.selected_epoch_start, self.selected_epoch_end)
+
+    def on_motion(self, event):
+        """Сдвиг эпохи вслед за мышью с сохранением ее длины."""
+        if self.drag_origin is None or event.inaxes is not self.ax:
+            return
+        x0, start, end = self.drag_origin
+        length = end - start
+        start = int(round(start + event.xdata - x0))
+        start = min(max(start, 0), len(self.rr_times) - 1 - length)
+        if start == self.selected_epoch_start:
+            return
+
+        self.selected_epoch_start = start
+        self.selected_epoch_end = start + length
+        self.epoch_info_label.setText(f"Выбранный участок: {start} - {start + length}")
+        self.highlight_selected_epoch()
+
+    def on_release(self, event):
+        """Завершение перетаскивания: новые границы переносятся в поля ручного ввода."""
+        if self.drag_origin is None:
+            return
+        self.drag_origin = None
+        self.start_index_input.setText(str(self.selected_epoch_start))
+        self.end_index_input.setText(str(self.selected_epoch_end))
 
     def update_data(self, rr_times, amplitudes):
         """
@@ -3,9 +3,20 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLab
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy import signal
-from scipy.signal import butter, filtfilt, cheby1
-from scipy.stats import f
+
+from services.async_compute import LatestTaskRunner
+from services.dsp import CHEBYSHEV_PARAMS, DEFAULT_FS, LOWPASS_CUTOFFS, FilterConfig, SignalPipeline, compute_spectrum
+from ui.widgets.plots.decimated_line import plot_decimated
+
+
+def run_filter_pipeline(rr_times, amplitudes, pipeline):
+    """Фильтры, статистики и спектры обработанных сигналов (выполняется в фоновом потоке)."""
+    result = pipeline.run(rr_times, amplitudes)
+    spectra = (
+        compute_spectrum(result.rr_times, fs=pipeline.fs),
+        compute_spectrum(result.amplitudes, fs=pipeline.fs),
+    )
+    return result, spectra
 
 
 class FilterSelectionWidget(QWidget):
@@ -16,19 +27,21 @@ class FilterSelectionWidget(QWidget):
         self.rr_times = ecs_data
         self.amplitudes = pg_data
         self.session_id = session_id  # Добавляем session_id
-        self.fs = 200  # Частота дискретизации
+        self.fs = DEFAULT_FS  # Частота дискретизации
 
         # Инициализация отфильтрованных данных
         self.filtered_rr_times = np.array(self.rr_times)
         self.filtered_amplitudes = np.array(self.amplitudes)
 
         # Определение диапазонов фильтров как атрибутов класса
-        self.lowpass_cutoffs = [50, 55, 60, 0.5]  # Возможные значения частоты среза для ФНЧ Баттерворта
-        self.chebyshev_params = [
-            {"cutoff": 0.4, "order": 2, "ripple": 0.5},  # Параметры для ФНЧ Чебышева
-            {"cutoff": 50, "order": 2, "ripple": 0.3},
-            {"cutoff": 0.2, "order": 2, "ripple": 0.1}
-        ]
+        self.lowpass_cutoffs = LOWPASS_CUTOFFS  # Возможные значения частоты среза для ФНЧ Баттерворта
+        self.chebyshev_params = CHEBYSHEV_PARAMS  # Параметры для ФНЧ Чебышева
+
+        # Расчет выполняется в фоне; серия переключений дает один расчет с последним состоянием
+        self.filter_runner = LatestTaskRunner(run_filter_pipeline, parent=self)
+        self.filter_runner.result_ready.connect(self.on_filters_applied)
+        self.filter_runner.failed.connect(self.on_filters_failed)
+        self.restoring_state = False  # Во время set_filter_state расчет не запускается
 
         self.init_ui()
 
@@ -103,6 +116,19 @@ class FilterSelectionWidget(QWidget):
         apply_button.clicked.connect(self.apply_filters)
         layout.addWidget(apply_button)
 
+        # Изменение выбора фильтров запускает пересчет с задержкой
+        self.lowpass_group.buttonToggled.connect(self.schedule_filters)
+        for checkbox in (self.remove_artifacts_checkbox, self.highpass_checkbox, self.notch_checkbox,
+                         self.center_checkbox):
+            checkbox.toggled.connect(self.schedule_filters)
+
+        # Состояние расчета
+        self.status_label = QLabel()
+        self.filter_runner.busy_changed.connect(
+            lambda busy: self.status_label.setText("Расчет..." if busy else "")
+        )
+        layout.addWidget(self.status_label)
+
         # График
         self.figure = plt.figure(figsize=(15, 6))
         self.canvas = FigureCanvas(self.figure)
@@ -115,140 +141,132 @@ class FilterSelectionWidget(QWidget):
         self.setLayout(layout)
 
         # Отображение исходных данных
-        self.plot_data()
+        self.init_plot()
 
-    def plot_data(self):
-        """Отображение данных на графике."""
-        self.figure.clear()
+    def init_plot(self):
+        """Создание осей и линий графиков (один раз); далее линии только обновляются."""
+        self.signal_ax = self.figure.add_subplot(121)
+        self.rr_line = plot_decimated(
+            self.signal_ax, self.filtered_rr_times, label="RR_time (обработанный)", color="red", linewidth=1
+        )
+        self.amplitude_line = plot_decimated(
+            self.signal_ax, self.filtered_amplitudes, label="Amplitude (обработанный)", color="blue", linewidth=1
+        )
+        self.signal_ax.set_title("Обработанные сигналы")
+        self.signal_ax.legend()
+        self.signal_ax.grid(True)
 
+        # Второй график (спектральный анализ)
+        self.spectrum_ax = self.figure.add_subplot(122)
+        (freqs_rr, spectrum_rr), (freqs_amp, spectrum_amp) = self.compute_spectra()
+        self.rr_spectrum_line = plot_decimated(
+            self.spectrum_ax, spectrum_rr, freqs_rr, label="RR_time (спектр)", color="red", linewidth=1
+        )
+        self.amplitude_spectrum_line = plot_decimated(
+            self.spectrum_ax, spectrum_amp, freqs_amp, label="Amplitude (спектр)", color="blue", linewidth=1
+        )
+        self.spectrum_ax.set_title("Спектральный анализ")
+        self.spectrum_ax.set_xlabel("Частота (Гц)")
+        self.spectrum_ax.set_ylabel("Амплитуда")
+        self.spectrum_ax.legend()
+        self.spectrum_ax.grid(True)
+
+        self.canvas.draw_idle()
+
+    def compute_spectra(self):
+        """Спектры текущих обработанных сигналов ЭКС и ПГ (из кэша, если данные не менялись)."""
+        return (
+            compute_spectrum(self.filtered_rr_times, fs=self.fs),
+            compute_spectrum(self.filtered_amplitudes, fs=self.fs),
+        )
+
+    def plot_data(self, spectra=None):
+        """
+        Обновление графиков без их пересоздания;
+        spectra - заранее рассчитанные спектры ЭКС и ПГ.
+        """
         # Проверяем, есть ли данные для отображения
         if self.filtered_rr_times is None or self.filtered_amplitudes is None:
             print("Ошибка: Отфильтрованные данные не инициализированы.")
             return
 
-        # Первый график
-        ax1 = self.figure.add_subplot(121)
-        ax1.plot(self.filtered_rr_times, label="RR_time (обработанный)", color="red", linewidth=1)
-        ax1.plot(self.filtered_amplitudes, label="Amplitude (обработанный)", color="blue", linewidth=1)
-        ax1.set_title("Обработанные сигналы")
-        ax1.legend()
-        ax1.grid(True)
+        if spectra is None:
+            spectra = self.compute_spectra()
+        (freqs_rr, spectrum_rr), (freqs_amp, spectrum_amp) = spectra
 
-        # Второй график (спектральный анализ)
-        ax2 = self.figure.add_subplot(122)
-        freqs_rr, spectrum_rr = self.compute_spectrum(self.filtered_rr_times)
-        freqs_amp, spectrum_amp = self.compute_spectrum(self.filtered_amplitudes)
+        self.rr_line.decimated_line.set_data(self.filtered_rr_times)
+        self.amplitude_line.decimated_line.set_data(self.filtered_amplitudes)
+        self.rr_spectrum_line.decimated_line.set_data(spectrum_rr, freqs_rr)
+        self.amplitude_spectrum_line.decimated_line.set_data(spectrum_amp, freqs_amp)
 
-        ax2.plot(freqs_rr, spectrum_rr, label="RR_time (спектр)", color="red", linewidth=1)
-        ax2.plot(freqs_amp, spectrum_amp, label="Amplitude (спектр)", color="blue", linewidth=1)
-        ax2.set_title("Спектральный анализ")
-        ax2.set_xlabel("Частота (Гц)")
-        ax2.set_ylabel("Амплитуда")
-        ax2.legend()
-        ax2.grid(True)
+        # Пределы осей по новым данным; отрисовка объединяется с другими запросами
+        for ax in (self.signal_ax, self.spectrum_ax):
+            ax.relim()
+            ax.autoscale_view()
+        self.canvas.draw_idle()
 
-        self.canvas.draw()
+    def build_pipeline(self):
+        """Конфигурация обработки по состоянию интерфейса (ValueError при некорректных индексах)."""
+        crop = None
+        if self.remove_artifacts_checkbox.isChecked():
+            # Получаем значения из QLineEdit
+            crop = (int(self.start_index_input.text()), int(self.end_index_input.text()))
+
+        return SignalPipeline(
+            filters=FilterConfig.from_state(self.get_filter_state()),
+            crop=crop,
+            fs=self.fs,
+        )
 
     def apply_filters(self):
-        """Применение выбранных фильтров."""
-        rr_times = np.array(self.rr_times)
-        amplitudes = np.array(self.amplitudes)
+        """Применение выбранных фильтров (расчет запускается сразу, в фоновом потоке)."""
+        try:
+            pipeline = self.build_pipeline()
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Некорректные значения для удаления артефактов: {e}")
+            return
 
-        # Проверяем, выбрано ли удаление артефактов
-        if self.remove_artifacts_checkbox.isChecked():
-            try:
-                # Получаем значения из QLineEdit
-                start_index = int(self.start_index_input.text())
-                end_index = int(self.end_index_input.text())
-                # Проверяем корректность введенных значений
-                if start_index < 0 or end_index < 0:
-                    raise ValueError("Индексы должны быть неотрицательными.")
-                if end_index <= start_index:
-                    raise ValueError("Конечный индекс должен быть больше начального.")
-                if start_index >= len(rr_times) or end_index > len(rr_times):
-                    raise ValueError("Индексы выходят за пределы длины сигнала.")
-                # Обрезаем сигналы
-                rr_times = rr_times[start_index:end_index]
-                amplitudes = amplitudes[start_index:end_index]
-            except ValueError as e:
-                QMessageBox.warning(self, "Ошибка", f"Некорректные значения для удаления артефактов: {e}")
-                return
-
-        # Проверяем выбор ФНЧ
-        selected_lowpass_type = None
-        selected_lowpass_param = None
-        for i, checkbox in enumerate(self.lowpass_checkboxes):
-            if checkbox.isChecked():
-                if i < len(self.lowpass_cutoffs):  # ФНЧ (Баттерворта)
-                    selected_lowpass_type = "butter"
-                    selected_lowpass_param = self.lowpass_cutoffs[i]
-                else:  # ФНЧ Чебышева
-                    selected_chebyshev_index = i - len(self.lowpass_cutoffs)
-                    if selected_chebyshev_index < 0 or selected_chebyshev_index >= len(self.chebyshev_params):
-                        QMessageBox.warning(self, "Ошибка", "Некорректный индекс для параметров ФНЧ Чебышева")
-                        return
-                    selected_lowpass_type = "chebyshev"
-                    selected_lowpass_param = self.chebyshev_params[selected_chebyshev_index]
-                break
+        self.filter_runner.request(self.rr_times, self.amplitudes, pipeline, immediate=True)
+
+    def schedule_filters(self, *args):
+        """Отложенный пересчет после изменения выбора фильтров."""
+        if self.restoring_state:
+            return
+        try:
+            pipeline = self.build_pipeline()
+        except ValueError:
+            # Индексы для удаления артефактов еще не введены — ждем нажатия "Применить"
+            return
+
+        self.filter_runner.request(self.rr_times, self.amplitudes, pipeline)
 
-        # Применяем выбранный ФНЧ, только если он выбран
-        if selected_lowpass_type == "butter":
-            rr_times = self.apply_lowpass_filter(rr_times, cutoff=selected_lowpass_param, fs=self.fs)
-            amplitudes = self.apply_lowpass_filter(amplitudes, cutoff=selected_lowpass_param, fs=self.fs)
-        elif selected_lowpass_type == "chebyshev":
-            params = selected_lowpass_param
-            try:
-                rr_times = self.chebyshev_lowpass_filter(
-                    rr_times, cutoff=params["cutoff"], fs=self.fs, order=params["order"], ripple=params["ripple"]
-                )
-                amplitudes = self.chebyshev_lowpass_filter(
-                    amplitudes, cutoff=params["cutoff"], fs=self.fs, order=params["order"], ripple=params["ripple"]
-                )
-            except Exception as e:
-                QMessageBox.warning(self, "Ошибка", f"Не удалось применить ФНЧ Чебышева: {e}")
-                return
-        # Применение других фильтров
-        if self.highpass_checkbox.isChecked():
-            rr_times = self.apply_highpass_filter(rr_times, cutoff=0.05, fs=self.fs)
-            amplitudes = self.apply_highpass_filter(amplitudes, cutoff=0.05, fs=self.fs)
-        if self.notch_checkbox.isChecked():
-            rr_times = self.apply_notch_filter(rr_times, notch_freq=50, fs=self.fs)
-            amplitudes = self.apply_notch_filter(amplitudes, notch_freq=50, fs=self.fs)
-        if self.center_checkbox.isChecked():
-            # Нормализация сигнала
-            # вычисляет стандартное отклонение элементов массива
-            # Нормализация данных перед вычислением спектра
-            # amplitudes = (amplitudes - np.mean(amplitudes)) / np.std(amplitudes)
-            rr_times = (rr_times - np.mean(rr_times)) / np.std(rr_times)
-            amplitudes = amplitudes - np.mean(amplitudes)
+    def on_filters_applied(self, computed):
+        """Результат актуального расчета: сохранение данных и перерисовка графиков."""
+        result, spectra = computed
 
         # Сохраняем отфильтрованные данные
-        self.filtered_rr_times = rr_times
-        self.filtered_amplitudes = amplitudes
+        self.filtered_rr_times = result.rr_times
+        self.filtered_amplitudes = result.amplitudes
 
         # Перерисовываем графики
-        self.plot_data()
-
-        # Вычисляем корреляцию
-        corr_raw = np.corrcoef(self.rr_times, self.amplitudes)[0, 1]
-        corr_centered = np.corrcoef(rr_times, amplitudes)[0, 1]
+        self.plot_data(spectra)
 
-        # Вычисляем корреляционное отношение
-        correlation_ratio = self.calculate_correlation_ratio(rr_times, amplitudes)
-
-        # Проверка линейности связи
-        linearity_check = self.check_linearity(rr_times, amplitudes)
+        # Обновляем метку с корреляцией
+        self.show_statistics(result.statistics)
 
-        # Критерий Фишера
-        fisher_test_result = self.fisher_test(rr_times, amplitudes)
+    def on_filters_failed(self, message):
+        """Ошибка актуального расчета."""
+        QMessageBox.warning(self, "Ошибка", f"Не удалось применить фильтры: {message}")
 
-        # Обновляем метку с корреляцией
+    def show_statistics(self, statistics):
+        """Отображение корреляции и критериев связи."""
+        linearity = "Линейная связь" if statistics.is_linear else "Нелинейная связь"
         self.correlation_label.setText(
-            f"Корреляция исходных данных: {corr_raw:.4f}\n"
-            f"Корреляция обработанных данных: {corr_centered:.4f}\n"
-            f"Корреляционное отношение: {correlation_ratio:.4f} (чем ближе к 1, тем лучше)\n"
-            f"Проверка линейности связи: {linearity_check} (должна быть линейная)\n"
-            f"Критерий Фишера: {fisher_test_result:.4f} (значимость > 0.05)"
+            f"Корреляция исходных данных: {statistics.corr_raw:.4f}\n"
+            f"Корреляция обработанных данных: {statistics.corr_processed:.4f}\n"
+            f"Корреляционное отношение: {statistics.correlation_ratio:.4f} (чем ближе к 1, тем лучше)\n"
+            f"Проверка линейности связи: {statistics.linearity_value:.4f} - {linearity} (должна быть линейная)\n"
+            f"Критерий Фишера: {statistics.fisher:.4f} (значимость > 0.05)"
         )
 
     def get_filtered_data(self):
@@ -282,7 +300,14 @@ class FilterSelectionWidget(QWidget):
         return state
 
     def set_filter_state(self, state):
-        """Устанавливает состояние фильтров."""
+        """Устанавливает состояние фильтров (без пересчета: результат для него уже получен)."""
+        self.restoring_state = True
+        try:
+            self._set_filter_state(state)
+        finally:
+            self.restoring_state = False
+
+    def _set_filter_state(self, state):
         # Сначала снимаем все выделения
         self.lowpass_group.setExclusive(False)
         for checkbox in self.lowpass_checkboxes:
@@ -306,95 +331,6 @@ class FilterSelectionWidget(QWidget):
         self.notch_checkbox.setChecked(state['notch'])
         self.center_checkbox.setChecked(state['center'])
 
-    @staticmethod
-    def compute_spectrum(data):
-        """Вычисление спектра сигнала с помощью FFT."""
-        n = len(data)  # Длина сигнала
-        spectrum = np.abs(np.fft.fft(data)) / n  # Нормализованный спектр
-        freqs = np.fft.fftfreq(n, d=1 / 1)  # Частоты
-
-        # Берем только положительные частоты
-        spectrum = spectrum[:n // 2]
-        freqs = freqs[:n // 2]
-
-        # Фильтрация малых значений
-        spectrum = np.where(spectrum < 0.001, 0, spectrum)
-
-        return freqs, spectrum
-
-    @staticmethod
-    def apply_lowpass_filter(data, cutoff, fs, order=1):
-        """
-        Применение ФНЧ Баттерворта.
-        Формула: H(s) = 1 / (s^2 + s * (w_c / Q) + w_c^2),
-        где w_c = 2 * pi * cutoff — угловая частота среза.
-        Реализация через scipy.signal.butter.
-        """
-        nyquist = 0.5 * fs
-        normal_cutoff = cutoff / nyquist
-        b, a = butter(order, normal_cutoff, btype='low', analog=False)
-        return filtfilt(b, a, data)
-
-    @staticmethod
-    def chebyshev_lowpass_filter(data, cutoff, fs, order, ripple):
-        """
-        Реализация ФНЧ Чебышева.
-        """
-        nyquist = 0.5 * fs
-        normal_cutoff = cutoff / nyquist
-
-        # Расчет коэффициентов фильтра Чебышева
-        b, a = cheby1(order, ripple, normal_cutoff, btype='low', analog=False)
-        return filtfilt(b, a, data)
-
-    @staticmethod
-    def apply_highpass_filter(data, cutoff, fs, order=4):
-        """
-        Применение ФВЧ Баттерворта.
-        Формула: H(s) = s^2 / (s^2 + s * (w_c / Q) + w_c^2),
-        где w_c = 2 * pi * cutoff — угловая частота среза.
-        Реализация через scipy.signal.butter.
-        """
-        nyquist = 0.5 * fs
-        normal_cutoff = cutoff / nyquist
-        b, a = butter(order, normal_cutoff, btype='high', analog=False)
-        return filtfilt(b, a, data)
-
-    @staticmethod
-    def apply_notch_filter(data, notch_freq, fs, quality_factor=30):
-        """
-        Применение режекторного фильтра.
-        Формула: H(s) = (s^2 + w_0^2) / (s^2 + s * (w_0 / Q) + w_0^2),
-        где w_0 = 2 * pi * notch_freq — угловая частота режекции.
-        Реализация через scipy.signal.iirnotch.
-        """
-        nyquist = 0.5 * fs
-        normal_notch_freq = notch_freq / nyquist # Нормированная частота режекции
-        b, a = signal.iirnotch(normal_notch_freq, quality_factor)
-        return filtfilt(b, a, data)
-
-    def remove_artifacts(self):
-        """Удаление артефактов из сигналов."""
-        try:
-            # Получаем значения из QLineEdit
-            start_index = int(self.start_index_input.text())
-            end_index = int(self.end_index_input.text())
-
-            # Проверяем корректность введенных значений
-            if start_index < 0 or end_index < 0:
-                raise ValueError("Индексы должны быть неотрицательными.")
-            if end_index <= start_index:
-                raise ValueError("Конечный индекс должен быть больше начального.")
-            if start_index >= len(self.filtered_rr_times) or end_index > len(self.filtered_rr_times):
-                raise ValueError("Индексы выходят за пределы длины сигнала.")
-
-            # Обрезаем сигналы
-            self.filtered_rr_times = self.filtered_rr_times[start_index:end_index]
-            self.filtered_amplitudes = self.filtered_amplitudes[start_index:end_index]
-
-        except ValueError as e:
-            QMessageBox.warning(self, "Ошибка", f"Некорректные значения для удаления артефактов: {e}")
-
     def reset_lowpass_selection(self):
         """Снимает выделение со всех чекбоксов ФНЧ."""
         # Временно отключаем эксклюзивный режим
@@ -403,57 +339,3 @@ class FilterSelectionWidget(QWidget):
             checkbox.setChecked(False)
         # Возвращаем эксклюзивный режим
         self.lowpass_group.setExclusive(True)
-
-    def calculate_DRmgr(self, rr_times):
-        """Вычисление межгрупповой дисперсии."""
-        J = len(rr_times)
-        Rcpv = np.mean(rr_times)
-        NKL, bin_edges = np.histogram(rr_times, bins=16)
-        cpR = np.histogram(rr_times, bins=16, weights=rr_times)[0] / NKL
-        DRmgr = np.sum(NKL * (cpR - Rcpv) ** 2) / J
-        return DRmgr
-
-    def calculate_DR(self, rr_times):
-        """Вычисление общей дисперсии."""
-        DR = np.var(rr_times)
-        return DR
-
-    def calculate_correlation_ratio(self, rr_times, amplitudes):
-        """Вычисление корреляционного отношения."""
-        J = len(rr_times)
-        Rcpv = np.mean(rr_times)  # Общее среднее RR-интервалов
-
-        # Разделение данных на группы (классы)
-        NKL, bin_edges = np.histogram(amplitudes, bins=16)
-        cpR = np.histogram(amplitudes, bins=16, weights=rr_times)[0] / NKL
-
-        # Вычисление межгрупповой дисперсии
-        DRmgr = np.sum(NKL * (cpR - Rcpv) ** 2) / J
-
-        # Вычисление общей дисперсии
-        DR = np.var(rr_times)
-
-        # Корреляционное отношение
-        correlation_ratio = np.sqrt(DRmgr / DR)
-        return correlation_ratio
-
-    def check_linearity(self, rr_times, amplitudes):
-        """Проверка линейности связи по критерию Блекмана."""
-        J = len(rr_times)
-        r = np.corrcoef(rr_times, amplitudes)[0, 1]
-        Vrasch = J * (r ** 2)
-
-        # Критическое значение для α = 0.05
-        critical_value = f.ppf(0.95, 1, J - 2)  # Критическое значение F-распределения
-
-        if Vrasch >= critical_value:
-            return f"{Vrasch:.4f} - Линейная связь"
-        else:
-            return f"{Vrasch:.4f} - Нелинейная связь"
-
-    def fisher_test(self, rr_times, amplitudes):
-        """Критерий Фишера для проверки значимости корреляции."""
-        J = len(rr_times)
-        r = np.corrcoef(rr_times, amplitudes)[0, 1]
-        F = (J - 2) * (r ** 2) / (1 - r ** 2)
-        return F
\ No newline at end of file
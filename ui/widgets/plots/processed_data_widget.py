@@ -1,7 +1,10 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import matplotlib.pyplot as plt
 
+from ui.widgets.plots.decimated_line import plot_decimated
+
 
 class ProcessedDataWidget(QWidget):
     def __init__(self, processed_ecs_data, processed_pg_data):
@@ -16,6 +19,7 @@ class ProcessedDataWidget(QWidget):
         # Создаем график
         self.figure, self.ax = plt.subplots(figsize=(10, 5))
         self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(NavigationToolbar(self.canvas, self))  # Масштабирование и сдвиг
         layout.addWidget(self.canvas)
 
         # Установка макета
@@ -29,8 +33,8 @@ class ProcessedDataWidget(QWidget):
         self.ax.clear()
 
         # Отображение данных
-        self.ax.plot(self.processed_ecs_data, label="Обработанные RR-интервалы", color="red")
-        self.ax.plot(self.processed_pg_data, label="Обработанные амплитуды дыхания", color="blue")
+        plot_decimated(self.ax, self.processed_ecs_data, label="Обработанные RR-интервалы", color="red")
+        plot_decimated(self.ax, self.processed_pg_data, label="Обработанные амплитуды дыхания", color="blue")
 
         # Настройка графика
         self.ax.set_title("Обработанные данные")
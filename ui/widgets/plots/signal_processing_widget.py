@@ -3,12 +3,23 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
 import numpy as np
 
+from services.async_db import AsyncDb
 from services.theme_switcher import ThemeSwitcher
 from ui.widgets.plots.creating_time_series_widget import CreatingTimeSeriesWidget
+from ui.widgets.plots.decimated_line import plot_decimated
 from ui.widgets.plots.epoch_selection_widget import EpochSelectionWidget
 from ui.widgets.plots.filter_selection_widget import FilterSelectionWidget
 
 
+def load_session_data(db, session_id):
+    """Метаданные сеанса и сигналы ЭКС и дыхания (выполняется в фоновом потоке)."""
+    from services.sessions_service import get_session_details
+    from services.signal_service import load_session_signals
+
+    rr_times, amplitudes = load_session_signals(db, session_id)
+    return get_session_details(db, session_id), rr_times, amplitudes
+
+
 class SignalProcessingWidget(QWidget):
     def __init__(self, db_session, session_id):
         super().__init__()
@@ -20,6 +31,8 @@ class SignalProcessingWidget(QWidget):
         self.rr_times = []  # Данные RR-интервалов
         self.amplitudes = []  # Данные амплитуд дыхания
         self.filter_state = {}
+        self.session_details = None  # Метаданные сеанса (пациент, врач, дата)
+        self.async_db = AsyncDb.for_session(db_session, parent=self)
         self.init_ui()
 
     def init_ui(self):
@@ -44,37 +57,56 @@ class SignalProcessingWidget(QWidget):
         self.content_layout = QVBoxLayout()
         layout.addLayout(self.content_layout)
 
+        # Сообщение на время загрузки данных
+        self.loading_label = QLabel("Загрузка данных сеанса...")
+        self.content_layout.addWidget(self.loading_label)
+
         self.setLayout(layout)
 
-        # Загружаем данные и отображаем первый этап
+        # Загружаем данные в фоне, первый этап отображается после загрузки
         self.load_data()
-        self.show_step()
 
     def load_data(self):
-        """Загрузка данных ЭКС и сигнала дыхания."""
+        """Фоновая загрузка данных ЭКС и сигнала дыхания."""
+        self.next_button.setEnabled(False)
+        self.async_db.submit(
+            load_session_data, self.session_id,
+            on_result=self.on_data_loaded, on_error=self.on_load_failed, key="session_data",
+        )
+
+    def on_load_failed(self, message):
+        """Ошибка фоновой загрузки данных."""
+        self.loading_label.setText("Данные сеанса не загружены")
+        print(f"Ошибка при загрузке данных: {message}")
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {message}")
+
+    def on_data_loaded(self, result):
+        """Данные загружены: проверка и отображение первого этапа."""
         try:
-            from services.ecs_service import get_ecs_data_by_session_id
-            from services.pg_service import get_pg_data_by_session_id
-
-            # Загружаем данные ЭКС
-            ecs_data = get_ecs_data_by_session_id(self.db_session, self.session_id)
-            if not ecs_data:
+            session_details, rr_times, amplitudes = result
+            self.session_details = session_details
+            if rr_times.size == 0:
                 raise ValueError("Данные ЭКС отсутствуют")
-
-            # Загружаем данные сигнала дыхания
-            pg_data = get_pg_data_by_session_id(self.db_session, self.session_id)
-            if not pg_data:
+            if amplitudes.size == 0:
                 raise ValueError("Данные сигнала дыхания отсутствуют")
 
-            # Извлечение значений
-            self.rr_times = [data["rr_time"] for data in ecs_data]
-            self.amplitudes = [data["amplitude"] for data in pg_data]
+            self.rr_times = rr_times
+            self.amplitudes = amplitudes
 
             print(f"Загружено {len(self.rr_times)} RR-интервалов и {len(self.amplitudes)} значений амплитуд.")
 
         except Exception as e:
-            print(f"Ошибка при загрузке данных: {e}")
-            QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {e}")
+            self.on_load_failed(str(e))
+            return
+
+        self.loading_label.hide()
+        self.next_button.setEnabled(True)
+        self.show_step()
+
+    def closeEvent(self, event):
+        """При закрытии окна незавершенные запросы отменяются."""
+        self.async_db.cancel_all()
+        super().closeEvent(event)
 
     def show_step(self):
         try:
@@ -193,8 +225,8 @@ class SignalProcessingWidget(QWidget):
 
             # График 1: Исходные данные
             ax1 = self.figure.add_subplot(111)
-            ax1.plot(self.rr_times, label="RR_time (ЭКС)", color="red")
-            ax1.plot(self.amplitudes, label="Amplitude (ПГ)", color="blue")
+            plot_decimated(ax1, self.rr_times, label="RR_time (ЭКС)", color="red")
+            plot_decimated(ax1, self.amplitudes, label="Amplitude (ПГ)", color="blue")
             ax1.set_title("Исходные данные")
             ax1.set_xlabel("Индекс")
             ax1.set_ylabel("Значение")
@@ -206,7 +238,15 @@ class SignalProcessingWidget(QWidget):
             self.content_layout.addWidget(self.canvas)
 
             # Корреляционные значения
+            session_info = ""
+            if self.session_details:
+                session_info = (
+                    f"Пациент: {self.session_details['patient_fio']}, "
+                    f"сеанс: {self.session_details['session_date']} "
+                    f"{self.session_details['session_starttime']}\n"
+                )
             self.correlation_label = QLabel(
+                f"{session_info}"
                 f"Корреляция исходных данных: {corr_raw:.4f}\n"
             )
             self.content_layout.addWidget(self.correlation_label)
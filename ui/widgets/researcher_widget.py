@@ -1,9 +1,9 @@
 from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QInputDialog, QMessageBox
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QInputDialog, QMessageBox, QLabel
 
-from services.analysis_service import get_analysis_result_by_sessionid, get_analysis_results_by_sessionid
-from services.ecs_service import get_ecs_data_by_session_id
-from services.pg_service import get_pg_data_by_session_id
+from services.analysis_service import load_analysis_series
+from services.async_db import AsyncDb
+from services.signal_service import load_session_signals
 from ui.widgets.plots.processed_data_widget import ProcessedDataWidget
 from ui.widgets.plots.row_data_plot_widget import RawDataPlotWidget
 from ui.widgets.plots.signal_processing_widget import SignalProcessingWidget
@@ -16,6 +16,7 @@ class ResearcherWidget(QWidget):
             raise ValueError("Сессия базы данных не передана или недействительна.")
         self.db_session = db_session
         self.parent_widget = parent_widget  # Ссылка на родительский виджет
+        self.async_db = AsyncDb.for_session(db_session, parent=self)  # Запросы выполняются в фоне
         self.init_ui()
         self.raw_data_plot_widget = None
         self.signal_processing_widget = None
@@ -55,27 +56,35 @@ class ResearcherWidget(QWidget):
         layout.addWidget(self.process_signals_button)
         layout.addWidget(self.processed_data_button)
 
+        # Сводка по сигналам выбранного сеанса
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
         # Устанавливаем макет
         self.setLayout(layout)
 
     def view_raw_data(self):
         """Открывает диалоговое окно для выбора пациента и просмотра сырых данных."""
-        try:
-            # Выбираем сеанс
-            session_id = self.select_session()
-            if session_id is None:
-                return
+        self.select_session(self.load_raw_data)
 
-            # Загружаем данные ЭКС и ПГ
-            ecs_data = get_ecs_data_by_session_id(self.db_session, session_id)
-            pg_data = get_pg_data_by_session_id(self.db_session, session_id)
+    def load_raw_data(self, session_id):
+        """Фоновая загрузка сигналов ЭКС и ПГ выбранного сеанса в массивы NumPy."""
+        self.async_db.submit(
+            load_session_signals, session_id,
+            on_result=self.show_raw_data, on_error=self.on_load_failed, key="view",
+        )
 
-            if not ecs_data or not pg_data:
+    def show_raw_data(self, signals):
+        """Отображение сырых данных после загрузки."""
+        try:
+            rr_times, amplitudes = signals
+            if rr_times.size == 0 or amplitudes.size == 0:
                 QMessageBox.warning(self, "Ошибка", "Данные для выбранного пациента недоступны.")
                 return
 
             # Создаем виджет с графиками
-            self.raw_data_plot_widget = RawDataPlotWidget(ecs_data, pg_data)  # Сохраняем ссылку
+            self.raw_data_plot_widget = RawDataPlotWidget(rr_times, amplitudes)  # Сохраняем ссылку
             self.raw_data_plot_widget.setWindowTitle("Сырые данные: ЭКС и сигнал дыхания")
             self.raw_data_plot_widget.show()  # Показываем виджет
 
@@ -85,13 +94,11 @@ class ResearcherWidget(QWidget):
 
     def process_signals(self):
         """Открывает диалоговое окно для выбора пациента и обработки сигналов."""
-        try:
-            # Выбираем сеанс
-            session_id = self.select_session()
-            if session_id is None:
-                return
+        self.select_session(self.open_signal_processing)
 
-            # Открываем виджет обработки сигналов
+    def open_signal_processing(self, session_id):
+        """Открывает виджет обработки сигналов выбранного сеанса."""
+        try:
             self.signal_processing_widget = SignalProcessingWidget(self.db_session, session_id)  # Сохраняем ссылку
             self.signal_processing_widget.setWindowTitle("Обработка сигналов")
             self.signal_processing_widget.show()
@@ -102,21 +109,25 @@ class ResearcherWidget(QWidget):
 
     def view_processed_data(self):
         """Открывает диалоговое окно для выбора пациента и просмотра обработанных данных."""
-        try:
-            # Выбираем сеанс
-            session_id = self.select_session()
-            if session_id is None:
-                return
+        self.select_session(self.load_processed_data)
+
+    def load_processed_data(self, session_id):
+        """Фоновая загрузка обработанных рядов выбранного сеанса."""
+        self.async_db.submit(
+            load_analysis_series, session_id,
+            on_result=self.show_processed_data, on_error=self.on_load_failed, key="view",
+        )
 
-            # Получаем обработанные данные из таблицы "Результаты анализа"
-            analysis_results = get_analysis_results_by_sessionid(self.db_session, session_id)
-            if not analysis_results:
+    def show_processed_data(self, analysis_series):
+        """Отображение обработанных данных после загрузки."""
+        try:
+            if analysis_series is None:
                 QMessageBox.warning(self, "Ошибка", "Нет обработанных данных для выбранного сеанса.")
                 return
 
             # Извлекаем данные для графика
-            processed_ecs_data = [result.processed_ecs_data for result in analysis_results]
-            processed_pg_data = [result.processed_pg_data for result in analysis_results]
+            processed_ecs_data = analysis_series["processed_ecs_data"]
+            processed_pg_data = analysis_series["processed_pg_data"]
 
             # Создаем виджет обработанных данных
             self.processed_data_widget = ProcessedDataWidget(processed_ecs_data, processed_pg_data)
@@ -127,53 +138,64 @@ class ResearcherWidget(QWidget):
             print(f"Ошибка при просмотре обработанных данных: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {e}")
 
-    def get_filtered_patient_list(self):
-        """Возвращает отфильтрованный список пациентов с дополнительной информацией."""
-        try:
-            from services.sessions_service import get_sessions_with_details
-            from services.ecs_service import get_ecs_data_by_session_id
-            from services.pg_service import get_pg_data_by_session_id
-
-            # Получаем список всех сеансов
-            all_sessions = get_sessions_with_details(self.db_session)
-            if not all_sessions:
-                QMessageBox.information(self, "Информация", "Нет доступных сеансов.")
-                return []
-
-            # Фильтруем сеансы: только те, которые содержат данные ЭКС или ПГ
-            filtered_sessions = [
-                session for session in all_sessions
-                if get_ecs_data_by_session_id(self.db_session, session["sessionid"]) or
-                   get_pg_data_by_session_id(self.db_session, session["sessionid"])
-            ]
-            if not filtered_sessions:
-                QMessageBox.information(self, "Информация", "Нет сеансов с данными ЭКС или ПГ.")
-                return []
-
-            # Формируем список пациентов с дополнительной информацией
-            patient_info_list = [
-                f"{session['patient_fio']} ({session['session_date']}, {session['session_starttime']})"
-                for session in filtered_sessions
-            ]
-
-            return filtered_sessions, patient_info_list
-
-        except Exception as e:
-            print(f"Ошибка при получении списка пациентов: {e}")
-            QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {e}")
-            return [], []
-
-
-    def select_session(self):
+    def on_load_failed(self, message):
+        """Ошибка фоновой загрузки данных."""
+        print(f"Ошибка при загрузке данных: {message}")
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {message}")
+
+    @staticmethod
+    def format_session(session):
+        """Подпись сеанса в списке выбора: пациент, дата, время и номер сеанса."""
+        return (
+            f"{session['patient_fio']} ({session['session_date']}, {session['session_starttime']}) — "
+            f"сеанс {session['sessionid']}"
+        )
+
+    @staticmethod
+    def format_session_summary(summary):
+        """Сводка по сигналам сеанса: количество отсчетов и длительность записи."""
+        minutes, seconds = divmod(int(round(summary["duration"] or 0)), 60)
+        return (
+            f"Сеанс {summary['sessionid']} — ЭКС: {summary['ecs_count']}, ПГ: {summary['pg_count']}, "
+            f"длительность {minutes}:{seconds:02d}"
+        )
+
+    def select_session(self, on_selected):
         """
         Общий метод для выбора сеанса записи пациента.
-        Возвращает session_id выбранного сеанса или None, если сеанс не выбран.
+        Список сеансов с сигналами запрашивается в фоне,
+        после выбора вызывается on_selected(session_id).
         """
+        from services.sessions_service import get_sessions_with_signals
+
+        self.async_db.submit(
+            get_sessions_with_signals,
+            on_result=lambda sessions: self.choose_session(sessions, on_selected),
+            on_error=self.on_load_failed,
+            key="sessions",
+        )
+
+    def load_session_summary(self, session_id):
+        """Фоновая загрузка сводки по сигналам выбранного сеанса."""
+        from services.sessions_service import get_session_signal_summary
+
+        self.summary_label.setText("Загрузка сводки по сигналам...")
+        self.async_db.submit(
+            get_session_signal_summary, session_id,
+            on_result=lambda summary: self.summary_label.setText(self.format_session_summary(summary)),
+            on_error=lambda message: self.summary_label.setText(f"Сводка недоступна: {message}"),
+            key="summary",
+        )
+
+    def choose_session(self, filtered_sessions, on_selected):
+        """Диалог выбора сеанса из загруженного списка."""
         try:
-            # Получаем отфильтрованный список пациентов
-            filtered_sessions, patient_info_list = self.get_filtered_patient_list()
             if not filtered_sessions:
-                return None
+                QMessageBox.information(self, "Информация", "Нет сеансов с данными ЭКС или ПГ.")
+                return
+
+            # Формируем список пациентов с дополнительной информацией
+            patient_info_list = [self.format_session(session) for session in filtered_sessions]
 
             # Открываем диалоговое окно для выбора пациента
             selected_patient_info, ok = QInputDialog.getItem(
@@ -184,20 +206,18 @@ class ResearcherWidget(QWidget):
                 editable=False
             )
             if not ok:
-                return None
+                return
 
-            # Находим выбранный сеанс по информации
-            selected_patient_fio = selected_patient_info.split(" (")[0]
-            selected_session = next(
-                (session for session in filtered_sessions if session["patient_fio"] == selected_patient_fio), None
-            )
-            if not selected_session:
+            # Находим выбранный сеанс по позиции в списке
+            if selected_patient_info not in patient_info_list:
                 QMessageBox.warning(self, "Ошибка", "Не удалось найти сессию для выбранного пациента.")
-                return None
-
-            return selected_session["sessionid"]
+                return
+            selected_session = filtered_sessions[patient_info_list.index(selected_patient_info)]
 
         except Exception as e:
             print(f"Ошибка при выборе сеанса: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось выбрать сеанс: {e}")
-            return None
\ No newline at end of file
+            return
+
+        self.load_session_summary(selected_session["sessionid"])
+        on_selected(selected_session["sessionid"])
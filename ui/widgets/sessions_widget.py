@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushB
     QMessageBox, QInputDialog, QComboBox, QDateEdit, QDialog
 from datetime import date
 
+from services.async_db import AsyncDb
 from ui.widgets.date_widget import DateInputDialog
 
 
@@ -11,6 +12,7 @@ class SessionWidget(QWidget):
         super().__init__()
         self.db_session = db_session
         self.sessions_data = []  # Хранение данных о сеансах
+        self.async_db = AsyncDb.for_session(db_session, parent=self)  # Запросы списка выполняются в фоне
         self.init_ui()
 
     def init_ui(self):
@@ -49,12 +51,26 @@ class SessionWidget(QWidget):
         self.setLayout(layout)
 
     def load_data(self, sessions=None):
-        """Загрузка данных в таблицу."""
-        try:
-            from services.sessions_service import get_sessions_with_details
+        """Загрузка данных в таблицу; без переданного списка сеансы запрашиваются в фоне."""
+        if sessions:
+            self.fill_table(sessions)
+            return
+
+        from services.sessions_service import get_sessions_with_details
+
+        # Новый запрос отменяет предыдущую загрузку или поиск
+        self.async_db.submit(
+            get_sessions_with_details, on_result=self.fill_table, on_error=self.on_load_failed, key="sessions"
+        )
 
-            if not sessions:
-                sessions = get_sessions_with_details(self.db_session)
+    def on_load_failed(self, message):
+        """Ошибка фонового запроса списка сеансов."""
+        print(f"Ошибка при загрузке данных: {message}")
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные: {message}")
+
+    def fill_table(self, sessions):
+        """Заполнение таблицы списком сеансов."""
+        try:
             self.sessions_data = sessions
 
             # Очищаем таблицу
@@ -259,22 +275,31 @@ class SessionWidget(QWidget):
 
             # Проверяем, является ли запрос датой
             try:
-                session_date = date.fromisoformat(query)
-                sessions = search_sessions_by_date(self.db_session, session_date)
+                search, argument = search_sessions_by_date, date.fromisoformat(query)
             except ValueError:
                 # Если не дата, ищем по ФИО пациента
-                sessions = get_sessions_by_patient_fio(self.db_session, query)
+                search, argument = get_sessions_by_patient_fio, query
 
-            if not sessions:
-                QMessageBox.information(self, "Результат", "Сеансы не найдены.")
-                return
-
-            self.load_data(sessions)
+            self.async_db.submit(
+                search, argument, on_result=self.show_search_results, on_error=self.on_search_failed, key="sessions"
+            )
 
         except Exception as e:
             print(f"Ошибка при поиске сеансов: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось выполнить поиск: {e}")
 
+    def show_search_results(self, sessions):
+        """Отображение результатов поиска."""
+        if not sessions:
+            QMessageBox.information(self, "Результат", "Сеансы не найдены.")
+            return
+        self.load_data(sessions)
+
+    def on_search_failed(self, message):
+        """Ошибка фонового поиска сеансов."""
+        print(f"Ошибка при поиске сеансов: {message}")
+        QMessageBox.critical(self, "Ошибка", f"Не удалось выполнить поиск: {message}")
+
     def get_session_id_from_row(self, row):
         """Получение ID сеанса из строки таблицы."""
         try: